@@ -0,0 +1,73 @@
+# === bench_intent.py ===
+# Routing accuracy and latency: keyword rules vs the local intent model vs both combined
+#
+#   PYTHONPATH=$(pwd) python benchmarks/bench_intent.py
+#   PYTHONPATH=$(pwd) python benchmarks/bench_intent.py --show-errors
+
+import argparse
+import statistics
+import time
+from collections import Counter
+
+from src.core import intent_model
+from src.core.intent import classify_intent_detailed, rule_intent
+
+# upstream calls a route costs (fetchers fan out to several APIs; chat is one LLM call)
+ROUTE_CALLS = {"news": 4, "youtube": 2, "reddit": 1, "chat": 1, "trending": 0}
+
+
+def route_calls(intent):
+    return ROUTE_CALLS.get(intent.split("_")[0], 1)
+
+
+def _time(fn, texts, repeat):
+    samples = []
+    for _ in range(repeat):
+        for t in texts:
+            start = time.perf_counter()
+            fn(t)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--eval", default=intent_model.EVAL_PATH, help="labeled JSONL ({text, intent} per line)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    texts, gold = intent_model.load_examples(args.eval)
+    start = time.perf_counter()
+    model = intent_model.get_model()
+    print(f"🧭 {len(texts)} labeled messages, model trained in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    routers = {
+        "rules": lambda t: rule_intent(t.strip().lower()),
+        "model": lambda t: model.predict(t)[0],
+        "model + rules": lambda t: classify_intent_detailed(t)["intent"],
+    }
+
+    print(f"\n{'router':<14} | {'accuracy':>8} | {'wasted calls':>12} | {'p50 (µs)':>9} | {'p95 (µs)':>9}")
+    print("-" * 65)
+    for name, fn in routers.items():
+        predicted = [fn(t) for t in texts]
+        correct = sum(p == g for p, g in zip(predicted, gold))
+        # a misroute pays for the wrong route's calls and then the right one's
+        wasted = sum(route_calls(p) for p, g in zip(predicted, gold) if p != g)
+        p50, p95 = _time(fn, texts, args.repeat)
+        print(f"{name:<14} | {correct / len(gold):8.1%} | {wasted:12d} | {p50:9.1f} | {p95:9.1f}")
+
+        if args.show_errors:
+            for t, p, g in zip(texts, predicted, gold):
+                if p != g:
+                    print(f"   {g:>12} → {p:<12} {t}")
+
+    sources = Counter(classify_intent_detailed(t)["source"] for t in texts)
+    print(f"\n🔀 combined router: {sources['model']} decided by the model, {sources['rules']} fell back to rules "
+          f"(threshold {intent_model.MIN_CONFIDENCE})")
+
+
+if __name__ == "__main__":
+    main()
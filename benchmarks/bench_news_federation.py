@@ -0,0 +1,88 @@
+# === bench_news_federation.py ===
+# Offline latency of the news federation vs the old "NewsAPI, then GNews if empty" path
+#
+#   PYTHONPATH=$(pwd) python benchmarks/bench_news_federation.py --runs 40
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.data_ingest import federation
+from src.data_ingest.news_providers import FakeNewsProvider
+from src.data_ingest.relevance import NEWS_POLICY, get_matcher
+
+TOPIC = "nvidia ai chips"
+
+# (label, primary kwargs, secondary kwargs)
+SCENARIOS = [
+    ("healthy", dict(latency=0.25), dict(latency=0.35)),
+    ("primary tail (20% slow)", dict(latency=0.25, slow_rate=0.2, slow_latency=4.0), dict(latency=0.35)),
+    ("primary failing (50% err)", dict(latency=0.25, error_rate=0.5), dict(latency=0.35)),
+    ("primary down (timeouts)", dict(latency=0.25, slow_rate=1.0, slow_latency=10.0), dict(latency=0.35)),
+]
+
+
+def sequential(primary, secondary, since, matcher, max_articles, timeout):
+    """The previous fetch_news shape: secondary only runs when the primary gave nothing."""
+    out = []
+    try:
+        out = primary.fetch(TOPIC, max_articles, since, matcher, timeout)
+    except Exception:
+        pass
+    if not out:
+        try:
+            out = secondary.fetch(TOPIC, max_articles, since, matcher, timeout)
+        except Exception:
+            pass
+    return out
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(label, fn, runs):
+    latencies, counts = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        items = fn()
+        latencies.append(time.perf_counter() - start)
+        counts.append(len(items))
+    print(
+        f"  {label:<22} p50 {statistics.median(latencies):6.2f}s | p95 {_pct(latencies, 0.95):6.2f}s | "
+        f"max {max(latencies):6.2f}s | items {statistics.mean(counts):5.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=40)
+    parser.add_argument("--max-articles", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=6.0, help="per-provider timeout (s)")
+    args = parser.parse_args()
+
+    since = datetime.now(timezone.utc) - timedelta(days=7)
+    matcher = get_matcher(TOPIC, NEWS_POLICY)
+    # quiet the per-call logging while timing
+    federation.print = lambda *a, **k: None
+
+    for label, primary_kw, secondary_kw in SCENARIOS:
+        print(f"\n▶ {label}")
+        federation._health.clear()
+        primary = FakeNewsProvider("primary", seed=1, **primary_kw)
+        secondary = FakeNewsProvider("secondary", seed=2, **secondary_kw)
+
+        run("sequential fallback", lambda: sequential(
+            primary, secondary, since, matcher, args.max_articles, args.timeout), args.runs)
+        run("federated", lambda: federation.federated_search(
+            TOPIC, args.max_articles, since, matcher, [primary, secondary], hedge=False), args.runs)
+        federation._health.clear()
+        run("federated + hedging", lambda: federation.federated_search(
+            TOPIC, args.max_articles, since, matcher, [primary, secondary]), args.runs)
+        print(f"  health: {federation.health_snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# === bench_response_cache.py ===
+# Near-duplicate tier of the LLM reply cache: which rephrasings share a reply, and which must not
+#
+#   PYTHONPATH=$(pwd) python benchmarks/bench_response_cache.py
+
+import sys
+
+from src.core.cache import make_backend
+from src.llm.response_cache import ResponseCache
+
+# (cached prompt, later prompt) → same answer
+SHOULD_REUSE = [
+    ("what is the capital of nigeria?", "What's the capital of Nigeria"),
+    ("tell me about black holes", "can you tell me about black hole"),
+    ("explain quantum computing", "please explain quantum computing briefly"),
+    ("who is cristiano ronaldo", "who is cristiano ronaldp"),
+]
+
+# (cached prompt, later prompt) → different entity or meaning, never the cached reply
+MUST_MISS = [
+    ("what is the capital of niger?", "what is the capital of nigeria?"),
+    ("what is the capital of nigeria?", "what is the capital of niger?"),
+    ("tell me about ronaldo", "tell me about ronaldinho"),
+    ("tell me about ronaldinho", "tell me about ronaldo"),
+    ("how old is messi", "how old is messy"),
+    ("who is trump", "who is trumpet"),
+    ("is 5 a prime number", "is 6 a prime number"),
+    ("is coffee healthy", "is coffee not healthy"),
+]
+
+
+def main():
+    failures = 0
+    for expect_hit, cases in ((True, SHOULD_REUSE), (False, MUST_MISS)):
+        for cached, later in cases:
+            cache = ResponseCache(backend=make_backend("memory", None))
+            cache.store("chat", "casual", cached, f"reply for: {cached}")
+            reply, tier = cache.lookup("chat", "casual", later)
+            ok = bool(reply) == expect_hit
+            failures += not ok
+            mark = "✅" if ok else "❌"
+            print(f"{mark} {'reuse' if expect_hit else 'miss ':<5} | {tier or '-':<7} | '{cached}' → '{later}'")
+
+    print(f"\n{'✅ all cases pass' if not failures else f'❌ {failures} case(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
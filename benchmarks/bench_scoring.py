@@ -0,0 +1,78 @@
+# === bench_scoring.py ===
+# Throughput of the batched relevance scorer vs the old per-item difflib loop
+#
+#   PYTHONPATH=$(pwd) python benchmarks/bench_scoring.py --sizes 100 1000 5000 20000
+
+import argparse
+import difflib
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.core.scoring import score_items
+
+WORDS = (
+    "ai openai nvidia chip market stock startup climate energy election policy "
+    "crypto bitcoin spacex rocket launch research model robot health vaccine "
+    "apple google microsoft tesla battery court ruling india cricket football"
+).split()
+
+
+def make_items(n, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(n):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(6, 12)))
+        desc = " ".join(rng.choices(WORDS, k=rng.randint(15, 40)))
+        item = {"title": title, "description": desc, "publishedAt": now - timedelta(hours=rng.randint(1, 2000))}
+        if i % 3 == 1:
+            item["views"] = rng.randint(0, 3_000_000)
+        elif i % 3 == 2:
+            item["upvotes"] = rng.randint(0, 50_000)
+        items.append(item)
+    return items
+
+
+def legacy_score(items, query):
+    """The previous per-item difflib scorer (text part only — the expensive bit)."""
+    q = query.lower()
+    for item in items:
+        text = " ".join(str(item.get(k, "")) for k in ("title", "description")).lower()
+        item["_score"] = difflib.SequenceMatcher(None, q, text[:400]).ratio()
+    return sorted(items, key=lambda x: x["_score"], reverse=True)
+
+
+def _time(fn, items, query, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        batch = [dict(i) for i in items]
+        start = time.perf_counter()
+        fn(batch, query)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--query", default="nvidia ai chip market")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-max", type=int, default=5000, help="skip difflib above this size")
+    args = parser.parse_args()
+
+    print(f"{'items':>8} | {'batched (s)':>11} | {'items/s':>10} | {'difflib (s)':>11} | {'speedup':>7}")
+    print("-" * 62)
+    for n in args.sizes:
+        items = make_items(n)
+        fast = _time(score_items, items, args.query, args.repeat)
+        if n <= args.legacy_max:
+            slow = _time(legacy_score, items, args.query, 1)
+            legacy_col, speedup = f"{slow:11.4f}", f"{slow / fast:6.1f}x"
+        else:
+            legacy_col, speedup = f"{'-':>11}", f"{'-':>7}"
+        print(f"{n:>8} | {fast:11.4f} | {n / fast:10.0f} | {legacy_col} | {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# === cache.py ===
+# TTL result cache with stale-while-revalidate for the source fetchers
+
+import copy
+import functools
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.core.cancellation import RequestCancelled
+
+# -------------------------
+# Config
+# -------------------------
+
+# (fresh ttl, extra stale window) in seconds per source. Inside the stale window
+# the cached value is served immediately and refreshed in the background.
+SOURCE_TTLS = {
+    "news": (int(os.getenv("AETHER_CACHE_TTL_NEWS", "600")), 1800),
+    "reddit": (int(os.getenv("AETHER_CACHE_TTL_REDDIT", "300")), 900),
+    # YouTube search costs 100 quota units per call → keep it the longest
+    "youtube": (int(os.getenv("AETHER_CACHE_TTL_YOUTUBE", "1800")), 3600),
+}
+DEFAULT_TTL = (300, 600)
+
+MEMORY_MAX_ENTRIES = int(os.getenv("AETHER_CACHE_MAX_ENTRIES", "512"))
+
+# anchored to the project root: the web dyno runs with --chdir webapp, the worker doesn't
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache")
+
+# "memory" (per worker) or "sqlite" (memory in front of a file shared by all workers)
+CACHE_BACKEND = os.getenv("AETHER_CACHE_BACKEND", "memory").lower()
+CACHE_DB_PATH = os.getenv("AETHER_CACHE_DB", os.path.join(CACHE_DIR, "fetch_cache.sqlite3"))
+SQLITE_MAX_ENTRIES = int(os.getenv("AETHER_CACHE_DB_MAX_ENTRIES", "5000"))
+
+
+# -------------------------
+# Backends
+# -------------------------
+class MemoryBackend:
+    """Thread-safe LRU map of key → (stored_at, value)."""
+
+    def __init__(self, max_entries=MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._data[key] = (stored_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteBackend:
+    """Pickled entries in a WAL-mode SQLite file, shared across gunicorn workers."""
+
+    def __init__(self, path=CACHE_DB_PATH, max_entries=SQLITE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, stored_at REAL, value BLOB)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._conn().execute(
+                "SELECT stored_at, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache read failed: {e}")
+            return None
+        if not row:
+            return None
+        try:
+            return row[0], pickle.loads(row[1])
+        except Exception:
+            return None
+
+    def set(self, key, value, stored_at):
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, stored_at, value) VALUES (?, ?, ?)",
+                (key, stored_at, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                conn.execute(
+                    "DELETE FROM cache WHERE key NOT IN "
+                    "(SELECT key FROM cache ORDER BY stored_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache write failed: {e}")
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+
+class TieredBackend:
+    """Per-worker memory LRU in front of a shared backend."""
+
+    def __init__(self, shared):
+        self.memory = MemoryBackend()
+        self.shared = shared
+
+    def get(self, key):
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.memory.set(key, entry[1], entry[0])
+        return entry
+
+    def set(self, key, value, stored_at):
+        self.memory.set(key, value, stored_at)
+        self.shared.set(key, value, stored_at)
+
+    def clear(self):
+        self.memory.clear()
+        self.shared.clear()
+
+
+def make_backend(kind=CACHE_BACKEND, path=CACHE_DB_PATH, max_entries=None):
+    if kind == "sqlite":
+        try:
+            return TieredBackend(SQLiteBackend(path, max_entries or SQLITE_MAX_ENTRIES))
+        except Exception as e:
+            print(f"⚠️ SQLite cache unavailable ({e}) — falling back to memory")
+    return MemoryBackend(max_entries or MEMORY_MAX_ENTRIES)
+
+
+# -------------------------
+# TTL cache with stale-while-revalidate
+# -------------------------
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aether-cache-refresh")
+
+
+class TTLCache:
+    def __init__(self, backend=None):
+        self.backend = backend or make_backend()
+        self._refreshing = set()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+
+    def get(self, key, ttl):
+        """Fresh cached value or None — never loads."""
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry[0] < ttl:
+            self.stats["hits"] += 1
+            return entry[1]
+        return None
+
+    def set(self, key, value):
+        self.backend.set(key, value, time.time())
+
+    def get_or_load(self, key, loader, ttl, stale_ttl=0):
+        """
+        Fresh hit → cached value. Stale hit → cached value + background refresh.
+        Miss → loader() inline; concurrent misses on one key share a single
+        load. Empty results are never cached.
+        """
+        entry = self.backend.get(key)
+        now = time.time()
+
+        if entry is not None:
+            stored_at, value = entry
+            age = now - stored_at
+            if age < ttl:
+                self.stats["hits"] += 1
+                return value
+            if age < ttl + stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._refresh_in_background(key, loader)
+                return value
+
+        self.stats["misses"] += 1
+        while True:
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = Future()
+                    leader = True
+                else:
+                    leader = False
+
+            if leader:
+                break
+            try:
+                return pending.result()
+            except RequestCancelled:
+                # the leader's request was aborted — ours wasn't, load it ourselves
+                continue
+
+        try:
+            value = loader()
+            if value:
+                self.backend.set(key, value, time.time())
+            pending.set_result(value)
+            return value
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                value = loader()
+                if value:
+                    self.backend.set(key, value, time.time())
+            except Exception as e:
+                print(f"⚠️ Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _refresh_pool.submit(_refresh)
+
+    def clear(self):
+        self.backend.clear()
+
+
+fetch_cache = TTLCache()
+
+
+# -------------------------
+# Keys + decorator
+# -------------------------
+def normalize_query(query) -> str:
+    q = str(query or "").lower().replace('"', "").replace("'", "")
+    return re.sub(r"\s+", " ", q).strip()
+
+
+def make_key(source, query, **params) -> str:
+    extras = "&".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"{source}|{normalize_query(query)}|{extras}"
+
+
+def cached_source(source):
+    """
+    Cache a fetcher `fn(query, **params)` under (source, normalized query, params).
+    Callers get shallow copies of the items, so scoring can annotate them freely.
+    """
+    ttl, stale_ttl = SOURCE_TTLS.get(source, DEFAULT_TTL)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(query, **params):
+            key = make_key(source, query, **params)
+            items = fetch_cache.get_or_load(key, functools.partial(fn, query, **params), ttl, stale_ttl)
+            return [copy.copy(i) for i in items] if isinstance(items, list) else items
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
@@ -0,0 +1,183 @@
+# === cancellation.py ===
+# Request-ID keyed cancellation — set by /abort, checked cooperatively by
+# handle_intent, the fan-out, the fetchers and every pooled HTTP call
+
+import contextlib
+import contextvars
+import os
+import tempfile
+import threading
+import time
+
+# Marker files let /abort reach a request running in another gunicorn worker
+CANCEL_DIR = os.getenv("AETHER_CANCEL_DIR", os.path.join(tempfile.gettempdir(), "aether-cancel"))
+WATCH_INTERVAL = 0.25
+MARKER_MAX_AGE = 600
+
+
+class RequestCancelled(BaseException):
+    """
+    Raised inside a cancelled request. Like asyncio.CancelledError it derives
+    from BaseException, so the fetchers' broad `except Exception` blocks let it
+    through instead of retrying the next variant.
+    """
+
+
+class CancelToken:
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    # --- state ---
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise RequestCancelled(self.request_id)
+
+    def wait(self, timeout=None) -> bool:
+        return self._event.wait(timeout)
+
+    # --- in-flight work ---
+    def on_cancel(self, callback):
+        """Run `callback` (e.g. response.close) on cancel — immediately if already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def discard(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception as e:
+                print(f"⚠️ Cancel callback failed for {self.request_id}: {e}")
+
+
+# -------------------------
+# Registry
+# -------------------------
+_tokens = {}
+_lock = threading.Lock()
+_current = contextvars.ContextVar("aether_cancel_token", default=None)
+_watcher = None
+
+
+def _marker(request_id: str) -> str:
+    safe = "".join(c for c in str(request_id) if c.isalnum() or c in "-_")[:64]
+    return os.path.join(CANCEL_DIR, safe)
+
+
+def register(request_id: str) -> CancelToken:
+    """Create (or reuse) the token for a request."""
+    with _lock:
+        token = _tokens.get(request_id)
+        if token is None:
+            token = _tokens[request_id] = CancelToken(request_id)
+    _ensure_watcher()
+    return token
+
+
+def release(request_id: str):
+    """Forget a finished request."""
+    with _lock:
+        _tokens.pop(request_id, None)
+    with contextlib.suppress(OSError):
+        os.remove(_marker(request_id))
+
+
+def cancel(request_id: str) -> bool:
+    """
+    Cancel a request. Returns True if it is running in this process; otherwise
+    a marker is left for the worker that owns it.
+    """
+    with _lock:
+        token = _tokens.get(request_id)
+    if token is not None:
+        token.cancel()
+        return True
+
+    try:
+        os.makedirs(CANCEL_DIR, exist_ok=True)
+        with open(_marker(request_id), "w"):
+            pass
+    except OSError as e:
+        print(f"⚠️ Could not write cancel marker for {request_id}: {e}")
+    return False
+
+
+def is_cancelled(request_id: str) -> bool:
+    with _lock:
+        token = _tokens.get(request_id)
+    return bool(token and token.is_cancelled())
+
+
+@contextlib.contextmanager
+def bind(request_id: str):
+    """Register `request_id` and make it the current request for this context."""
+    token = register(request_id)
+    ctx_token = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(ctx_token)
+        release(request_id)
+
+
+def current_token():
+    return _current.get()
+
+
+def raise_if_cancelled():
+    token = _current.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+# -------------------------
+# Cross-worker watcher
+# -------------------------
+def _watch():
+    last_prune = 0.0
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        with _lock:
+            active = list(_tokens.values())
+        for token in active:
+            if not token.is_cancelled() and os.path.exists(_marker(token.request_id)):
+                print(f"🛑 Cancel marker found for {token.request_id}")
+                token.cancel()
+
+        # markers for requests that never showed up
+        now = time.time()
+        if now - last_prune > 60:
+            last_prune = now
+            with contextlib.suppress(OSError):
+                for name in os.listdir(CANCEL_DIR):
+                    path = os.path.join(CANCEL_DIR, name)
+                    if now - os.path.getmtime(path) > MARKER_MAX_AGE:
+                        os.remove(path)
+
+
+def _ensure_watcher():
+    global _watcher
+    if _watcher is not None and _watcher.is_alive():
+        return
+    with _lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = threading.Thread(target=_watch, name="aether-cancel-watch", daemon=True)
+            _watcher.start()
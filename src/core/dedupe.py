@@ -0,0 +1,148 @@
+# === dedupe.py ===
+# Near-duplicate detection with MinHash + LSH banding (news, Reddit, YouTube)
+
+import os
+import re
+import zlib
+
+import numpy as np
+
+# -------------------------
+# Config
+# -------------------------
+# Jaccard similarity of shingle sets at or above which two items are duplicates
+THRESHOLD = float(os.getenv("AETHER_DEDUPE_THRESHOLD", "0.6"))
+
+# 64 permutations in 32 bands of 2 rows: pairs at J≥0.4 collide in some band
+# with >99% probability, unrelated pairs (J≈0.05) in ~8% — verified exactly after
+NUM_PERM = 64
+ROWS = 2
+BANDS = NUM_PERM // ROWS
+DESCRIPTION_TOKENS = 20  # lead of the description that joins the title
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(1337)
+_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_TITLE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an the and or of to in on for with at by from as is are was were be this that it its "
+    "how why what who new news video watch live update".split()
+)
+
+
+# -------------------------
+# Shingling + signatures
+# -------------------------
+def shingles(title, description="") -> frozenset:
+    """Content-word unigrams + bigrams of the title and the description's lead."""
+    title = _TITLE_SUFFIX.sub("", title or "")
+    tokens = _TOKEN.findall(title.lower()) + _TOKEN.findall((description or "").lower())[:DESCRIPTION_TOKENS]
+    grams = {t for t in tokens if t not in _STOPWORDS}
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return frozenset(grams)
+
+
+def signature(grams) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint64 values) of a shingle set."""
+    if not grams:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+    # a, b, h < 2^32 → a*h + b fits in uint64
+    permuted = (np.outer(hashes, _A) + _B) % _PRIME & _MAX_HASH
+    return permuted.min(axis=0)
+
+
+def jaccard(a, b) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _text(item):
+    return item.get("title") or "", item.get("description") or ""
+
+
+# -------------------------
+# Index
+# -------------------------
+class NearDuplicateIndex:
+    """
+    Incremental LSH index. `add()` is O(bands + candidates) per item, so
+    collapsing n items costs ~O(n) instead of the O(n²) pairwise check.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self._buckets = [{} for _ in range(BANDS)]
+        self._shingles = []
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def _band_keys(self, sig):
+        raw = sig.tobytes()
+        width = ROWS * 8
+        return [raw[i * width:(i + 1) * width] for i in range(BANDS)]
+
+    def find(self, item, grams=None):
+        """The first indexed item that is a near-duplicate of `item`, or None."""
+        grams = grams if grams is not None else shingles(*_text(item))
+        if not grams:
+            return None
+        return self._match(grams, self._band_keys(signature(grams)))
+
+    def _match(self, grams, keys):
+        checked = set()
+        for band, key in enumerate(keys):
+            for idx in self._buckets[band].get(key, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                if jaccard(grams, self._shingles[idx]) >= self.threshold:
+                    return self._items[idx]
+        return None
+
+    def add(self, item) -> bool:
+        """Index `item` unless it duplicates one already indexed. True if it was new."""
+        grams = shingles(*_text(item))
+        if not grams:
+            # nothing to compare on — keep it, but don't index it
+            return True
+        keys = self._band_keys(signature(grams))
+        if self._match(grams, keys) is not None:
+            return False
+
+        idx = len(self._items)
+        self._items.append(item)
+        self._shingles.append(grams)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(idx)
+        return True
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def collapse(items, threshold=THRESHOLD):
+    """Keep the first item of every near-duplicate group, preserving order."""
+    index = NearDuplicateIndex(threshold)
+    return [item for item in items if index.add(item)]
+
+
+def collapse_sources(groups, order=("news", "youtube", "reddit"), threshold=THRESHOLD):
+    """
+    Collapse near-duplicates across sources ({"news": [...], ...}). Sources
+    earlier in `order` win, so a wire story seen in news and on YouTube is
+    kept as the news item.
+    """
+    index = NearDuplicateIndex(threshold)
+    out = {}
+    for source in list(order) + [s for s in groups if s not in order]:
+        if source in groups:
+            out[source] = [item for item in groups[source] or [] if index.add(item)]
+    return out
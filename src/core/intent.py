@@ -1,16 +1,23 @@
 # === intent.py ===
 # Detects what user wants and routes to right response generator
 
-import concurrent.futures
-import difflib
+import functools
 import random
-import datetime
+import re
 
 from src.data_ingest.fetch_news import fetch_news
 from src.data_ingest.fetch_reddit import fetch_reddit_posts as fetch_reddit
 from src.data_ingest.fetch_youtube import fetch_youtube_videos as fetch_youtube
+from src.data_ingest.article_store import get_store, store_first
+from src.nlp import trend_engine
 from src.llm.response_engine import generate_llm_response, detect_tone_change, refine_search_query
-from src.summary.summarizer import summarize_results
+from src.summary.summarizer import summarize_results, generate_take, FALLBACK_TAKE
+from src.core.scoring import score_items
+from src.core.dedupe import collapse_sources
+from src.core.orchestrator import fan_out_sync, call_with_deadline
+from src.core.cancellation import raise_if_cancelled
+from src.core import keywords
+from src.core.intent_model import MIN_CONFIDENCE, predict_intent
 from src.core.session_state import (
     set_mode,
     get_mode,
@@ -25,80 +32,169 @@ from src.core.session_state import (
 # -------------------------
 
 QUESTION_WORDS = ("when", "where", "who", "what", "why", "how", "which", "whom", "whose")
+QUESTION_PHRASES = ("?", "when will", "will", "is going to", "when does", "when did")
 INTENTAL_PHRASES = ("show me", "latest", "recent", "play", "watch", "videos", "channel", "list", "find", "search", "give me")
-VIDEO_KEYWORDS = ("youtube", "video", "yt", "clip", "upload", "vlog", "interview")
-REDDIT_KEYWORDS = ("reddit", "thread", "discussion", "upvotes", "r/")
-NEWS_KEYWORDS = ("news", "headline", "article", "story", "update")
+VIDEO_KEYWORDS = ("youtube", "video", "videos", "yt", "clip", "clips", "upload", "uploads", "vlog", "vlogs",
+                  "interview", "interviews")
+REDDIT_KEYWORDS = ("reddit", "subreddit", "thread", "threads", "discussion", "discussions", "upvotes", "r/")
+NEWS_KEYWORDS = ("news", "headline", "headlines", "article", "articles", "story", "stories", "update", "updates")
+TREND_KEYWORDS = ("trending", "trends", "what's hot", "whats hot", "buzzing", "blowing up", "spiking")
+SUMMARY_TRIGGERS = (
+    "summarize that",
+    "summarize this",
+    "summarize above",
+    "summarize previous",
+    "summarize the above",
+    "summarise",
+    "summary please",
+)
+
+# narrower vocabularies for the "more ..." / "only ..." follow-ups and the keyword fallback
+_INTENT_GROUPS = {
+    "question_word": QUESTION_WORDS,
+    "question": QUESTION_PHRASES,
+    "browse": INTENTAL_PHRASES,
+    "video": VIDEO_KEYWORDS,
+    "reddit": REDDIT_KEYWORDS,
+    "news": NEWS_KEYWORDS,
+    "trend": TREND_KEYWORDS,
+    "summary": SUMMARY_TRIGGERS,
+    "more": ("more",),
+    "only": ("only", "just"),
+    "more_youtube": ("youtube", "video", "videos", "yt"),
+    "more_reddit": ("reddit",),
+    "more_news": ("news", "article", "articles"),
+    "only_news": ("news", "article", "articles", "headline", "headlines"),
+    "only_reddit": ("reddit", "thread", "threads", "discussion", "discussions"),
+    "only_youtube": ("youtube", "yt", "video", "videos", "clip", "clips"),
+    "any_reddit": ("reddit", "discussion", "discussions", "thread", "threads"),
+    "any_news": ("news", "headline", "headlines", "update", "updates", "story", "stories"),
+    "any_youtube": ("youtube", "video", "videos", "yt", "clip", "clips", "watch", "interview", "interviews"),
+    # a named non-news source suppresses the news briefing card
+    "named_source": ("reddit", "youtube", "yt", "video", "videos", "clip", "clips"),
+}
+for _name, _phrases in _INTENT_GROUPS.items():
+    keywords.register(f"intent:{_name}", _phrases)
+
+
+def _hits(msg: str):
+    """All keyword hits for the message (one cached pass, shared with tone + moderation)."""
+    return keywords.scan(msg)
 
 
 def _looks_like_question(msg: str) -> bool:
-    m = msg.strip().lower()
-    if "?" in m:
-        return True
-    if any(m.startswith(w + " ") for w in QUESTION_WORDS):
-        return True
-    if any(
-        phrase in m
-        for phrase in ["when will ", "will ", "is going to ", "when does ", "when did "]
-    ):
-        return True
-    return False
+    hits = _hits(msg)
+    return hits.at_start("intent:question_word") or "intent:question" in hits
 
 
 def _wants_to_browse_media(msg: str) -> bool:
-    m = msg.lower()
-    if _looks_like_question(m):
+    if _looks_like_question(msg):
         return False
-    if any(phrase in m for phrase in INTENTAL_PHRASES):
-        return True
-    if any(k in m for k in VIDEO_KEYWORDS):
-        return True
-    return False
+    return _hits(msg).any("intent:browse", "intent:video")
 
 
 def _wants_reddit_fetch(msg: str) -> bool:
-    m = msg.lower()
-    if _looks_like_question(m):
+    if _looks_like_question(msg):
         return False
-    if any(k in m for k in REDDIT_KEYWORDS):
-        return True
-    return False
+    return "intent:reddit" in _hits(msg)
+
+
+def _wants_trends(msg: str) -> bool:
+    return "intent:trend" in _hits(msg)
+
+
+_TREND_TOPIC = re.compile(r"\b(?:in|on|about|for|around|with)\s+(.+?)[\s?.!]*$")
+_TREND_ANYTHING = ("general", "the world", "the news", "news", "everything", "right now", "today")
+
+
+def _trend_topic(msg: str) -> str:
+    """'what's trending in climate change?' → 'climate change'; '' for everything."""
+    m = _TREND_TOPIC.search(msg.lower().strip())
+    topic = m.group(1).strip() if m else ""
+    return "" if topic in _TREND_ANYTHING else topic
+
+
+def _trending_response(user_message: str):
+    """Answer from the local trend counts only — no upstream call."""
+    topic = _trend_topic(user_message)
+    known = trend_engine.known_topics()
+    replies = []
+
+    if topic and trend_engine.topic_tag(topic) not in known:
+        # ask the ingest worker to start tracking it; meanwhile show the overall picture
+        store = get_store()
+        if store:
+            store.touch_topic(topic, "news", requested=True)
+        replies.append({
+            "source_type": "aether_reply",
+            "title": f"I'm not tracking '{topic}' yet — I'll start now. Here's what's spiking overall:",
+        })
+        topic = ""
+
+    rows = trend_engine.trending(topic or "all", k=8) if trend_engine.topic_tag(topic or "all") in known else []
+    if not rows:
+        replies.append({"source_type": "aether_reply", "title": "Nothing is spiking right now — check back in a bit."})
+        return {"status": "success", "results": replies}
+
+    bullets = [f"• {r['term']} — {r['recent']:g}/h now vs {r['baseline']:g}/h usual" for r in rows]
+    card = {
+        "source_type": "briefing",
+        "title": f"Trending{' in ' + topic.title() if topic else ''} now",
+        "description": f"**Trending{' in ' + topic.title() if topic else ''} now**\n\n" + "\n".join(bullets),
+    }
+    return {"status": "success", "results": replies + [card]}
 
 
 def _wants_news_fetch(msg: str) -> bool:
-    m = msg.lower()
-    if _looks_like_question(m):
+    if _looks_like_question(msg):
         return False
-    if any(k in m for k in NEWS_KEYWORDS):
-        return True
-    return False
+    return "intent:news" in _hits(msg)
 
 
 # -----------------------------------------------------------
 # 🧠 Intent classification
 # -----------------------------------------------------------
 def classify_intent(user_message: str) -> str:
-    msg = (user_message or "").strip().lower()
+    return classify_intent_detailed(user_message)["intent"]
+
 
+def classify_intent_detailed(user_message: str) -> dict:
+    """
+    {"intent", "confidence", "source"}: the local model decides when it is
+    confident, the keyword rules otherwise (and whenever it is unavailable).
+    """
+    msg = (user_message or "").strip().lower()
     if not msg:
-        return "chat"
+        return {"intent": "chat", "confidence": 1.0, "source": "empty"}
+
+    intent, confidence = predict_intent(msg)
+    if intent and confidence >= MIN_CONFIDENCE:
+        return {"intent": intent, "confidence": confidence, "source": "model"}
+    return {"intent": rule_intent(msg), "confidence": confidence, "source": "rules"}
 
-    if "more" in msg:
-        if any(w in msg for w in ["youtube", "video", "yt"]):
+
+def rule_intent(msg: str) -> str:
+    """The hand-written keyword routing (fallback for low-confidence model calls)."""
+    hits = _hits(msg)
+
+    if "intent:more" in hits:
+        if "intent:more_youtube" in hits:
             return "youtube_more"
-        if "reddit" in msg:
+        if "intent:more_reddit" in hits:
             return "reddit_more"
-        if any(w in msg for w in ["news", "article"]):
+        if "intent:more_news" in hits:
             return "news_more"
 
-    if "only" in msg or "just" in msg:
-        if any(w in msg for w in ["news", "article", "headline"]):
+    if "intent:only" in hits:
+        if "intent:only_news" in hits:
             return "news_only"
-        if any(w in msg for w in ["reddit", "thread", "discussion"]):
+        if "intent:only_reddit" in hits:
             return "reddit_only"
-        if any(w in msg for w in ["youtube", "yt", "video", "clip"]):
+        if "intent:only_youtube" in hits:
             return "youtube_only"
 
+    if _wants_trends(msg):
+        return "trending"
     if _wants_news_fetch(msg):
         return "news"
     if _wants_to_browse_media(msg):
@@ -106,78 +202,33 @@ def classify_intent(user_message: str) -> str:
     if _wants_reddit_fetch(msg):
         return "reddit"
 
-    if any(w in msg for w in ["reddit", "discussion", "thread"]):
+    if "intent:any_reddit" in hits:
         return "reddit"
-    if any(w in msg for w in ["news", "headline", "update", "story"]):
+    if "intent:any_news" in hits:
         return "news"
-    if any(w in msg for w in ["youtube", "video", "yt", "clip", "watch", "interview"]):
+    if "intent:any_youtube" in hits:
         return "youtube"
 
-    if any(
-        w in msg
-        for w in ["explain", "what is", "tell me about", "define", "who is", "when will", "will"]
-    ):
-        return "chat"
-
+    # explanations, definitions, "will X happen" → conversational
     return "chat"
 
 
+def is_plain_chat(intent: str, user_message: str) -> bool:
+    """True when handle_intent would go straight to the chat LLM (streamable)."""
+    lower_msg = (user_message or "").lower().strip()
+    if not lower_msg or intent != "chat":
+        return False
+    if "intent:summary" in _hits(lower_msg):
+        return False
+    return detect_tone_change(user_message) is None
+
+
 # -----------------------------------------------------------
 # 🧮 Smart Relevance Scoring
 # -----------------------------------------------------------
 def score_relevance(items, query, key_fields=("title", "description")):
-    if not items:
-        return []
-
-    q = (query or "").lower()
-    now = datetime.datetime.utcnow()
-
-    def parse_date(dt_str):
-        try:
-            if not dt_str:
-                return 0
-            if isinstance(dt_str, datetime.datetime):
-                dt = dt_str
-            else:
-                dt = datetime.datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-            diff_days = (now - dt).days
-            return max(0, 90 - diff_days) / 90
-        except Exception:
-            return 0
-
-    def normalize_engagement(item):
-        if "views" in item:
-            val = item.get("views")
-            if isinstance(val, str) and val.replace(",", "").isdigit():
-                val = int(val.replace(",", ""))
-            if isinstance(val, (int, float)):
-                return min(1.0, val / 1_000_000)
-        if "upvotes" in item:
-            val = item.get("upvotes")
-            if isinstance(val, str) and val.replace(",", "").isdigit():
-                val = int(val.replace(",", ""))
-            if isinstance(val, (int, float)):
-                return min(1.0, val / 10_000)
-        return 0
-
-    for item in items:
-        text = " ".join(str(item.get(k, "")) for k in key_fields).lower()
-        text_score = difflib.SequenceMatcher(None, q, text[:400]).ratio()
-        engagement_score = normalize_engagement(item)
-        recency_score = parse_date(item.get("published"))
-
-        if "views" in item:
-            item["_score"] = (
-                0.45 * text_score + 0.40 * engagement_score + 0.15 * recency_score
-            )
-        elif "upvotes" in item:
-            item["_score"] = (
-                0.50 * text_score + 0.30 * engagement_score + 0.20 * recency_score
-            )
-        else:
-            item["_score"] = 0.70 * text_score + 0.30 * recency_score
-
-    return sorted(items, key=lambda x: x.get("_score", 0), reverse=True)
+    """Rank items by text relevance, engagement and recency (batched, see core/scoring.py)."""
+    return score_items(items, query, key_fields)
 
 
 # -----------------------------------------------------------
@@ -186,19 +237,9 @@ def score_relevance(items, query, key_fields=("title", "description")):
 def handle_intent(intent: str, tone: str, user_message: str):
 
     # --- SUMMARY HANDLING ---
-    summary_triggers = [
-        "summarize that",
-        "summarize this",
-        "summarize above",
-        "summarize previous",
-        "summarize the above",
-        "summarise",
-        "summary please",
-    ]
-
     lower_msg = user_message.lower().strip()
 
-    if any(t in lower_msg for t in summary_triggers):
+    if "intent:summary" in _hits(lower_msg):
         from src.core.session_state import get_last_bot_message
 
         last = get_last_bot_message()
@@ -211,7 +252,7 @@ def handle_intent(intent: str, tone: str, user_message: str):
             }
 
         prompt = f"Summarize the following into 2 simple lines:\n\n{last}"
-        return generate_llm_response("chat", tone, prompt)
+        return generate_llm_response("summary", tone, prompt)
 
     # empty query
     if not user_message.strip():
@@ -245,17 +286,13 @@ def handle_intent(intent: str, tone: str, user_message: str):
 
     print(f"🧩 Intent: {intent} | Tone: {tone}")
 
-    remember_query(user_message)
-
     # -----------------------------------------------------------
-    # Query refinement (except news)
+    # TRENDING (local burst counts, never remembered for "more")
     # -----------------------------------------------------------
-    if intent in ("news", "news_only", "news_more"):
-        refined_message = user_message.strip()
-    else:
-        refined_message = refine_search_query(user_message)
+    if intent == "trending":
+        return _trending_response(user_message)
 
-    print(f"✨ Refined topic: {refined_message}")
+    remember_query(user_message)
 
     # -----------------------------------------------------------
     # PAGINATION ("more")
@@ -275,45 +312,73 @@ def handle_intent(intent: str, tone: str, user_message: str):
         fetch_map = {"news": fetch_news, "reddit": fetch_reddit, "youtube": fetch_youtube}
         func = fetch_map.get(source)
 
-        data_list = func(last_query) or []
+        data_list = store_first(source, last_query, func) or []
         data_list = score_relevance(data_list, last_query)
 
         chunk = data_list[offset : offset + 5]
         return {"status": "success", "results": chunk}
 
     # -----------------------------------------------------------
-    # NEWS INTENT
+    # Query refinement (except news) — bounded by its deadline,
+    # falls back to the raw message if the LLM is slow
     # -----------------------------------------------------------
     if intent in ("news", "news_only"):
-        news_list = fetch_news(refined_message, max_articles=30) or []
-        news_scored = score_relevance(news_list, refined_message)
-        news_final = news_scored[:5]
+        refined_message = user_message.strip()
+    elif intent in ("reddit", "reddit_only", "youtube", "youtube_only"):
+        refined_message = call_with_deadline(
+            "refine", functools.partial(refine_search_query, user_message), default=None
+        ) or user_message.strip()
+    else:
+        refined_message = user_message.strip()
+
+    print(f"✨ Refined topic: {refined_message}")
+    raise_if_cancelled()
 
+    # -----------------------------------------------------------
+    # NEWS INTENT
+    # -----------------------------------------------------------
+    if intent in ("news", "news_only"):
         if intent == "news_only":
+            news_list = call_with_deadline(
+                "news", functools.partial(store_first, "news", refined_message, fetch_news, max_articles=30),
+                default=[],
+            ) or []
+            news_final = score_relevance(news_list, refined_message)[:5]
             return {
                 "status": "success",
                 "results": news_final or [{"source_type": "aether_reply", "title": "No news found."}],
             }
 
-        # fetch extras for briefing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
-            fr = ex.submit(fetch_reddit, refined_message)
-            fy = ex.submit(fetch_youtube, refined_message)
-            reddit_list = fr.result() or []
-            yt_list = fy.result() or []
+        # 🚨 FIX: Briefing **only when user didn't explicitly mention reddit OR youtube**
+        show_briefing = "intent:named_source" not in _hits(lower_msg)
+
+        # all three sources + the briefing take are independent → fan out
+        # (warm topics come straight from the local article store)
+        calls = {
+            "news": functools.partial(store_first, "news", refined_message, fetch_news, max_articles=30),
+            "reddit": functools.partial(store_first, "reddit", refined_message, fetch_reddit),
+            "youtube": functools.partial(store_first, "youtube", refined_message, fetch_youtube),
+        }
+        if show_briefing:
+            calls["take"] = functools.partial(generate_take, refined_message)
 
-        reddit_final = score_relevance(reddit_list, refined_message)[:5]
-        yt_final = score_relevance(yt_list, refined_message)[:5]
+        # a take that misses its deadline falls back to the canned one (never a second, inline LLM call)
+        fetched = fan_out_sync(calls, defaults={"news": [], "reddit": [], "youtube": [], "take": FALLBACK_TAKE})
+        raise_if_cancelled()
 
-        # 🚨 FIX: Briefing **only when user didn't explicitly mention reddit OR youtube**
-        show_briefing = not any(
-            w in lower_msg for w in ["reddit", "youtube", "yt", "video", "clip"]
-        )
+        # one story across sources → one card (news wins, then YouTube, then Reddit)
+        unique = collapse_sources({k: fetched[k] or [] for k in ("news", "reddit", "youtube")})
+
+        news_final = score_relevance(unique["news"], refined_message)[:5]
+        reddit_final = score_relevance(unique["reddit"], refined_message)[:5]
+        yt_final = score_relevance(unique["youtube"], refined_message)[:5]
 
         final_results = []
 
         if show_briefing:
-            summary_card = summarize_results(news_final, reddit_final, yt_final, tone, refined_message)
+            summary_card = summarize_results(
+                news_final, reddit_final, yt_final, tone, refined_message, take=fetched.get("take")
+            )
             if summary_card:
                 summary_card["source_type"] = "briefing"
                 final_results.append(summary_card)
@@ -325,7 +390,10 @@ def handle_intent(intent: str, tone: str, user_message: str):
     # REDDIT INTENT
     # -----------------------------------------------------------
     if intent in ("reddit", "reddit_only"):
-        reddit_list = fetch_reddit(refined_message) or []
+        reddit_list = call_with_deadline(
+            "reddit", functools.partial(store_first, "reddit", refined_message, fetch_reddit, refine=False),
+            default=[],
+        ) or []
         reddit_final = score_relevance(reddit_list, refined_message)[:5]
         return {
             "status": "success",
@@ -336,7 +404,9 @@ def handle_intent(intent: str, tone: str, user_message: str):
     # YOUTUBE INTENT
     # -----------------------------------------------------------
     if intent in ("youtube", "youtube_only"):
-        yt_list = fetch_youtube(refined_message) or []
+        yt_list = call_with_deadline(
+            "youtube", functools.partial(store_first, "youtube", refined_message, fetch_youtube), default=[]
+        ) or []
         yt_final = score_relevance(yt_list, refined_message)[:5]
         return {
             "status": "success",
@@ -0,0 +1,127 @@
+# === intent_model.py ===
+# Small local intent classifier (hashed n-gram features + linear model) in front of the keyword rules
+
+import json
+import os
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.linear_model import SGDClassifier
+from sklearn.utils import murmurhash3_32
+
+from src.core.keywords import tokenize
+
+# -------------------------
+# Config
+# -------------------------
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_data")
+TRAIN_PATH = os.path.join(DATA_DIR, "train.jsonl")
+EVAL_PATH = os.path.join(DATA_DIR, "eval.jsonl")
+
+ENABLED = os.getenv("AETHER_INTENT_MODEL", "1") not in ("0", "false", "off")
+# below this probability the keyword rules decide instead
+MIN_CONFIDENCE = float(os.getenv("AETHER_INTENT_MIN_CONFIDENCE", "0.4"))
+N_FEATURES = 2 ** 16
+
+
+def features(text):
+    """Word unigrams + bigrams and char 3–4-grams per word (typos, 'vids', 'yt')."""
+    toks = tokenize(text)
+    feats = [f"w:{t}" for t in toks]
+    feats += [f"b:{a} {b}" for a, b in zip(toks, toks[1:])]
+    # the opening word carries a lot of intent ("explain …", "will …", "show …")
+    if toks:
+        feats.append(f"first:{toks[0]}")
+    for t in toks:
+        padded = f"<{t}>"
+        for n in (3, 4):
+            feats += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    return feats
+
+
+def hashed_row(text):
+    """(column indices, l2-normalized counts) of the message in the hashed feature space."""
+    cols = np.fromiter(
+        (murmurhash3_32(f, positive=True) % N_FEATURES for f in features(text)), dtype=np.int64
+    )
+    cols, counts = np.unique(cols, return_counts=True)
+    values = counts.astype(np.float32)
+    if len(values):
+        values /= np.sqrt((values * values).sum())
+    return cols, values
+
+
+def load_examples(path):
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [r["text"] for r in rows], [r["intent"] for r in rows]
+
+
+class IntentModel:
+    """
+    One-vs-rest logistic regression (SGD) over hashed features. Training
+    on the shipped examples takes tens of milliseconds, so nothing is
+    persisted — the model is fit on first use. Prediction gathers the
+    message's nonzero weight rows directly instead of going through
+    sklearn's per-call validation.
+    """
+
+    def __init__(self, labels, coef, intercept):
+        self.labels = list(labels)
+        self.coef = np.ascontiguousarray(coef.T, dtype=np.float32)  # features × classes, for row gathers
+        self.intercept = intercept.astype(np.float32)
+
+    @classmethod
+    def train(cls, path=TRAIN_PATH):
+        texts, labels = load_examples(path)
+        rows = [hashed_row(t) for t in texts]
+        indptr = np.cumsum([0] + [len(cols) for cols, _ in rows])
+        X = sp.csr_matrix(
+            (np.concatenate([v for _, v in rows]), np.concatenate([c for c, _ in rows]), indptr),
+            shape=(len(rows), N_FEATURES),
+        )
+        clf = SGDClassifier(loss="log_loss", alpha=3e-5, max_iter=50, tol=None, random_state=0)
+        clf.fit(X, labels)
+        return cls(clf.classes_, clf.coef_, clf.intercept_)
+
+    def predict(self, text):
+        """(intent, probability) for one message — normalized one-vs-rest sigmoids, like predict_proba."""
+        cols, values = hashed_row(text)
+        logits = values @ self.coef[cols] + self.intercept
+        probs = 1.0 / (1.0 + np.exp(-logits))
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+
+# -------------------------
+# Process-wide model, trained on first use
+# -------------------------
+_model = None
+_model_failed = False
+_model_lock = threading.Lock()
+
+
+def get_model():
+    global _model, _model_failed
+    if _model is not None or _model_failed or not ENABLED:
+        return _model
+    with _model_lock:
+        if _model is None and not _model_failed:
+            try:
+                _model = IntentModel.train()
+                print(f"🧭 Intent model ready ({len(_model.labels)} intents)")
+            except Exception as e:
+                # unreadable dataset etc. → the keyword rules handle everything
+                print(f"⚠️ Intent model unavailable ({e}) — using keyword rules only")
+                _model_failed = True
+    return _model
+
+
+def predict_intent(text):
+    """(intent, confidence), or (None, 0.0) when the model is disabled or unavailable."""
+    model = get_model()
+    if model is None or not (text or "").strip():
+        return None, 0.0
+    return model.predict(text)
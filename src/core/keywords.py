@@ -0,0 +1,142 @@
+# === keywords.py ===
+# One word-boundary keyword automaton (Aho-Corasick over tokens) shared by intent, tone,
+# summary-trigger and moderation checks — every hit for a message in a single pass
+
+import functools
+import re
+import threading
+from collections import deque
+
+# words (with inner apostrophes: "what's") or single punctuation marks ("?", "/", "-")
+_TOKEN = re.compile(r"\w+(?:'\w+)*|[^\w\s]")
+
+
+def tokenize(text: str):
+    return _TOKEN.findall((text or "").lower().replace("’", "'"))
+
+
+class Hits:
+    """Matches of one message: group → phrases found (in message order), plus where they start."""
+
+    __slots__ = ("_found", "_starts")
+
+    def __init__(self):
+        self._found = {}
+        self._starts = {}
+
+    def _add(self, group, phrase, start):
+        self._found.setdefault(group, []).append(phrase)
+        self._starts.setdefault(group, set()).add(start)
+
+    def __contains__(self, group) -> bool:
+        return group in self._found
+
+    def any(self, *groups) -> bool:
+        return any(g in self._found for g in groups)
+
+    def phrases(self, group):
+        return self._found.get(group, [])
+
+    def at_start(self, group) -> bool:
+        """True when one of the group's phrases opens the message."""
+        return 0 in self._starts.get(group, ())
+
+    def first_of(self, groups):
+        """The first of `groups` (in the given order) with a hit, else None."""
+        for g in groups:
+            if g in self._found:
+                return g
+        return None
+
+
+class KeywordMatcher:
+    """
+    Phrases are token sequences, so "will" never matches inside "willing"
+    and "more" never inside "anymore". The trie + failure links are built
+    once; scanning is linear in the message's tokens regardless of how
+    many phrases are registered.
+    """
+
+    def __init__(self, groups=None):
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._compiled = None
+        for name, phrases in (groups or {}).items():
+            self.register(name, phrases)
+
+    def register(self, group, phrases):
+        """Add (or replace) a named group of phrases; the automaton is rebuilt on next scan."""
+        with self._lock:
+            self._groups[group] = tuple(phrases)
+            self._compiled = None
+            self._scan_cached.cache_clear()
+
+    def _compile(self):
+        goto = [{}]
+        outputs = [[]]
+        for group, phrases in self._groups.items():
+            for phrase in phrases:
+                tokens = tokenize(phrase)
+                if not tokens:
+                    continue
+                node = 0
+                for tok in tokens:
+                    nxt = goto[node].get(tok)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][tok] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    node = nxt
+                outputs[node].append((group, phrase, len(tokens)))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in goto[node].items():
+                f = fail[node]
+                while f and tok not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(tok, 0)
+                # a node also reports every phrase that ends at its suffix
+                outputs[child] = outputs[child] + outputs[fail[child]]
+                queue.append(child)
+        return goto, fail, outputs
+
+    def scan(self, text: str) -> Hits:
+        # normalized first, so "Roast me" / "roast me " from different callers share one cached pass
+        return self._scan_cached((text or "").strip().lower())
+
+    @functools.lru_cache(maxsize=512)
+    def _scan_cached(self, text):
+        compiled = self._compiled
+        if compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = self._compile()
+                compiled = self._compiled
+        goto, fail, outputs = compiled
+
+        hits = Hits()
+        node = 0
+        for i, tok in enumerate(tokenize(text)):
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for group, phrase, length in outputs[node]:
+                hits._add(group, phrase, i - length + 1)
+        return hits
+
+
+# the process-wide matcher: each module registers its groups under its own prefix
+# ("intent:news", "tone:roast", "moderation") so one scan answers all of them
+MESSAGE_KEYWORDS = KeywordMatcher()
+
+
+def register(group, phrases):
+    MESSAGE_KEYWORDS.register(group, phrases)
+
+
+def scan(text: str) -> Hits:
+    return MESSAGE_KEYWORDS.scan(text)
@@ -1,15 +1,20 @@
 # src/core/moderation.py
 # Lightweight moderation — NO transformers required
 
+from src.core import keywords
+
 DISALLOWED_PATTERNS = [
-    "kill them", "should die", "praise attack", "celebrate deaths",
-    "wipe out", "execute", "genocide", "massacre", "deserve to die"
+    "kill them", "kill themselves", "should die", "praise attack", "praise attacks", "praise attackers",
+    "celebrate deaths", "wipe out", "wipe them out", "execute", "executes", "executed", "executing",
+    "genocide", "genocides", "massacre", "massacres", "massacred", "massacring",
+    "deserve to die", "deserves to die"
 ]
 
+# whole-word phrases, matched in the same pass as intent + tone keywords
+# (so every inflected form that must be caught is listed above)
+keywords.register("moderation", DISALLOWED_PATTERNS)
+
+
 def is_disallowed(text: str) -> bool:
     """Check if user message or model output violates safety rules."""
-    lower = text.lower()
-    for phrase in DISALLOWED_PATTERNS:
-        if phrase in lower:
-            return True
-    return False
+    return "moderation" in keywords.scan(text)
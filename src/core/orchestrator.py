@@ -0,0 +1,121 @@
+# === orchestrator.py ===
+# Async fan-out for handle_intent — runs source fetches, query refinement and
+# the briefing take concurrently, each under its own deadline
+
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core import cancellation
+
+# -------------------------
+# Config
+# -------------------------
+
+# Per-call deadlines (seconds). A call that misses its deadline is dropped from
+# the response instead of holding every other source hostage.
+DEADLINES = {
+    "refine": float(os.getenv("AETHER_DEADLINE_REFINE", "4")),
+    "news": float(os.getenv("AETHER_DEADLINE_NEWS", "12")),
+    "reddit": float(os.getenv("AETHER_DEADLINE_REDDIT", "10")),
+    "youtube": float(os.getenv("AETHER_DEADLINE_YOUTUBE", "12")),
+    "take": float(os.getenv("AETHER_DEADLINE_TAKE", "8")),
+}
+DEFAULT_DEADLINE = 10.0
+
+# The fetchers are blocking, so they run on a process-wide pool. It is NOT the
+# event loop's default executor: asyncio.run() joins that one on exit, which
+# would make every request wait for its slowest straggler anyway.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AETHER_FANOUT_WORKERS", "16")),
+    thread_name_prefix="aether-fanout",
+)
+
+
+# -------------------------
+# Async core
+# -------------------------
+async def _call_with_deadline(name, func, default=None, deadline=None):
+    """Run a blocking callable on the fan-out pool, give up after its deadline."""
+    loop = asyncio.get_running_loop()
+    timeout = deadline if deadline is not None else DEADLINES.get(name, DEFAULT_DEADLINE)
+    # carry contextvars (request-scoped state) into the worker thread
+    ctx = contextvars.copy_context()
+    start = time.perf_counter()
+
+    try:
+        result = await asyncio.wait_for(
+            loop.run_in_executor(_EXECUTOR, functools.partial(ctx.run, func)),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        print(f"⏱️ {name} missed its {timeout:.1f}s deadline — continuing without it")
+        return default
+    except Exception as e:
+        # RequestCancelled is a BaseException → not swallowed here
+        print(f"❌ {name} failed: {e}")
+        return default
+
+    print(f"⚡ {name} finished in {time.perf_counter() - start:.2f}s")
+    return result
+
+
+async def fan_out(calls, defaults=None, deadlines=None):
+    """
+    Run every callable in `calls` ({name: zero-arg callable}) concurrently.
+    Returns {name: result}; failed or late calls get their default instead.
+    """
+    defaults = defaults or {}
+    deadlines = deadlines or {}
+    names = list(calls)
+
+    gathered = asyncio.ensure_future(asyncio.gather(*(
+        _call_with_deadline(n, calls[n], defaults.get(n), deadlines.get(n))
+        for n in names
+    )))
+
+    token = cancellation.current_token()
+    if token is not None:
+        # stop waiting the moment the request is aborted; the worker threads
+        # bail out at their next HTTP call or chunk read
+        watcher = asyncio.ensure_future(_wait_cancelled(token))
+        await asyncio.wait({gathered, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        watcher.cancel()
+        if token.is_cancelled():
+            gathered.cancel()
+            # mark any late exception as retrieved so asyncio doesn't log it
+            gathered.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise cancellation.RequestCancelled(token.request_id)
+
+    results = await gathered
+    return dict(zip(names, results))
+
+
+async def _wait_cancelled(token, interval=0.05):
+    while not token.is_cancelled():
+        await asyncio.sleep(interval)
+
+
+# -------------------------
+# Sync shims (Flask views are synchronous)
+# -------------------------
+def _run(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # already inside a loop (e.g. called from async code) → use a helper thread
+    return _EXECUTOR.submit(asyncio.run, coro).result()
+
+
+def fan_out_sync(calls, defaults=None, deadlines=None):
+    """Blocking wrapper around fan_out()."""
+    return _run(fan_out(calls, defaults, deadlines))
+
+
+def call_with_deadline(name, func, default=None, deadline=None):
+    """Blocking wrapper for a single deadline-bound call."""
+    return _run(_call_with_deadline(name, func, default, deadline))
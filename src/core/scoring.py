@@ -0,0 +1,126 @@
+# === scoring.py ===
+# Batched relevance scoring — text, engagement and recency as vector ops
+
+import datetime
+import re
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.data_ingest.models import Item
+
+# (text, engagement, recency) weights — same as the original per-item scorer
+WEIGHTS = {
+    "views": (0.45, 0.40, 0.15),    # YouTube
+    "upvotes": (0.50, 0.30, 0.20),  # Reddit
+    None: (0.70, 0.00, 0.30),       # News
+}
+ENGAGEMENT_SCALE = {"views": 1_000_000, "upvotes": 10_000}
+RECENCY_WINDOW_DAYS = 90
+
+_HOURS_AGO = re.compile(r"^\s*(\d+)\s*h(?:rs?|ours?)?\s+ago", re.I)
+
+
+# -------------------------
+# Per-item field extraction (one cheap pass)
+# -------------------------
+def _engagement_kind(item):
+    if "views" in item:
+        return "views"
+    if "upvotes" in item:
+        return "upvotes"
+    return None
+
+
+def _number(val):
+    if isinstance(val, str) and val.replace(",", "").isdigit():
+        return int(val.replace(",", ""))
+    if isinstance(val, (int, float)):
+        return val
+    return 0
+
+
+def _age_days(item, now):
+    """Age in days, or NaN when the item carries no usable date."""
+    if isinstance(item, Item):
+        # typed items carry a precomputed timestamp → no parsing
+        return (now.timestamp() - item.ts) / 86400 if item.ts else np.nan
+
+    dt = item.get("publishedAt")
+    if not isinstance(dt, datetime.datetime):
+        raw = item.get("published")
+        if isinstance(raw, datetime.datetime):
+            dt = raw
+        elif isinstance(raw, str) and raw:
+            m = _HOURS_AGO.match(raw)
+            if m:
+                return int(m.group(1)) / 24
+            try:
+                dt = datetime.datetime.fromisoformat(raw.replace("Z", "+00:00"))
+            except ValueError:
+                return np.nan
+        else:
+            return np.nan
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return (now - dt).total_seconds() / 86400
+
+
+# -------------------------
+# Vector scores
+# -------------------------
+def text_scores(query, texts):
+    """Cosine similarity of each text to the query in one TF-IDF space."""
+    scores = np.zeros(len(texts))
+    if not query or not texts:
+        return scores
+
+    vectorizer = TfidfVectorizer(lowercase=True, sublinear_tf=True, token_pattern=r"(?u)\b\w+\b")
+    try:
+        doc_matrix = vectorizer.fit_transform(texts)
+    except ValueError:  # empty vocabulary
+        return scores
+
+    query_vec = vectorizer.transform([query])
+    if query_vec.nnz == 0:
+        return scores
+    # rows are L2-normalized, so the dot product is the cosine
+    return (doc_matrix @ query_vec.T).toarray().ravel()
+
+
+def score_items(items, query, key_fields=("title", "description")):
+    """
+    Score every item in one batch, store it as item["_score"] and return the
+    items sorted best-first. Drop-in for intent.score_relevance.
+    """
+    if not items:
+        return []
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    n = len(items)
+
+    texts = [" ".join(str(item.get(k, "")) for k in key_fields) for item in items]
+    kinds = [_engagement_kind(item) for item in items]
+
+    raw_engagement = np.fromiter(
+        (_number(item.get(kind)) if kind else 0 for item, kind in zip(items, kinds)),
+        dtype=float, count=n,
+    )
+    scale = np.fromiter((ENGAGEMENT_SCALE.get(k, 1) for k in kinds), dtype=float, count=n)
+    ages = np.fromiter((_age_days(item, now) for item in items), dtype=float, count=n)
+
+    text = text_scores(query, texts)
+    engagement = np.minimum(1.0, raw_engagement / scale)
+    # undated items (NaN age) get no recency credit
+    recency = np.clip(RECENCY_WINDOW_DAYS - np.floor(ages), 0, RECENCY_WINDOW_DAYS) / RECENCY_WINDOW_DAYS
+    recency = np.nan_to_num(recency)
+
+    weights = np.array([WEIGHTS[k] for k in kinds])
+    scores = weights[:, 0] * text + weights[:, 1] * engagement + weights[:, 2] * recency
+
+    for item, score in zip(items, scores.tolist()):
+        item["_score"] = score
+
+    order = np.argsort(-scores, kind="stable")
+    return [items[i] for i in order]
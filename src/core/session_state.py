@@ -1,78 +1,115 @@
 # === session_state.py ===
-# Keeps persona mode + lightweight memory for "more posts" continuation
+# Keeps persona mode + lightweight memory for "more posts" continuation, per session
+#
+# State lives in the session store (see core/session_store.py), keyed by the
+# session ID the chat routes bind for each request. Unbound callers (CLI,
+# scripts) share the "default" session.
 
-persona_state = {
+import contextlib
+import contextvars
+
+from src.core.session_store import SessionStore
+
+DEFAULT_SESSION_ID = "default"
+
+DEFAULT_STATE = {
     "persona": "Neutral",
     "persona_mode": "casual",  # default conversational mode
-}
-
-# Memory to track last search + offset for pagination
-memory_state = {
+    # Memory to track last search + offset for pagination
     "last_query": None,
     "news_offset": 0,
     "reddit_offset": 0,
     "youtube_offset": 0,
+    # Last bot message (full text)
+    "last_bot_message": "",
+    "partial": "",
 }
 
-# Last bot message (full text)
-_last_bot_message = {"text": "", "partial": ""}
+store = SessionStore(DEFAULT_STATE)
+_current_sid = contextvars.ContextVar("aether_session_id", default=DEFAULT_SESSION_ID)
+
+
+# -------- Session binding --------
+@contextlib.contextmanager
+def bind(session_id: str):
+    """Make `session_id` the session for everything called in this context."""
+    token = _current_sid.set(session_id or DEFAULT_SESSION_ID)
+    try:
+        yield session_id
+    finally:
+        _current_sid.reset(token)
+
+
+def current_session_id():
+    return _current_sid.get()
+
+
+def _get(key):
+    return store.get(_current_sid.get())[key]
+
+
+def _set(**fields):
+    store.set(_current_sid.get(), **fields)
 
 
 # -------- Persona --------
 def get_persona():
-    return persona_state.get("persona", "Neutral")
+    return _get("persona")
 
 
 def set_persona(p):
-    persona_state["persona"] = p
+    _set(persona=p)
 
 
 def get_mode():
-    return persona_state.get("persona_mode", "casual")
+    return _get("persona_mode")
 
 
 def set_mode(mode):
-    persona_state["persona_mode"] = mode
+    _set(persona_mode=mode)
 
 
 # -------- Memory Tracking --------
 def remember_query(query):
-    memory_state["last_query"] = query
-    memory_state["news_offset"] = 0
-    memory_state["reddit_offset"] = 0
-    memory_state["youtube_offset"] = 0
+    _set(last_query=query, news_offset=0, reddit_offset=0, youtube_offset=0)
 
 
 def get_last_query():
-    return memory_state.get("last_query")
+    return _get("last_query")
 
 
 def increment_offset(source_type, step=5):
     key = f"{source_type}_offset"
-    if key in memory_state:
-        memory_state[key] += step
+    if key not in DEFAULT_STATE:
+        return
+
+    def bump(state):
+        state[key] = state.get(key, 0) + step
+
+    store.update(_current_sid.get(), bump)
 
 
 def get_offset(source_type):
-    return memory_state.get(f"{source_type}_offset", 0)
+    return store.get(_current_sid.get()).get(f"{source_type}_offset", 0)
 
 
 # -------- Last bot message helpers --------
 def set_last_bot_message(text: str):
-    _last_bot_message["text"] = text or ""
     # reset partial
-    _last_bot_message["partial"] = ""
+    _set(last_bot_message=text or "", partial="")
 
 
 def get_last_bot_message():
-    return _last_bot_message["text"]
+    return _get("last_bot_message")
 
 
 def set_partial_bot_message(prefix: str, remaining: str):
     # store both for potential debugging / recovery
-    _last_bot_message["text"] = (prefix or "") + (remaining or "")
-    _last_bot_message["partial"] = {"prefix": prefix or "", "remaining": remaining or ""}
+    _set(
+        last_bot_message=(prefix or "") + (remaining or ""),
+        partial={"prefix": prefix or "", "remaining": remaining or ""},
+    )
 
 
 def get_partial_bot_message():
-    return _last_bot_message.get("partial", {"prefix": "", "remaining": ""})
+    return _get("partial")
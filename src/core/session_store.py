@@ -0,0 +1,196 @@
+# === session_store.py ===
+# Per-session state (tone, pagination, last reply) keyed by session ID, shared across workers
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# -------------------------
+# Config
+# -------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# "memory" (per worker — only correct with a single worker), "sqlite" (file shared by
+# all workers on a host) or "redis" (anything speaking the Redis protocol, shared across hosts)
+SESSION_BACKEND = os.getenv("AETHER_SESSION_BACKEND", "sqlite").lower()
+SESSION_TTL = int(os.getenv("AETHER_SESSION_TTL", str(7 * 86400)))
+SESSION_DB_PATH = os.getenv("AETHER_SESSION_DB", os.path.join(PROJECT_ROOT, "data", "sessions", "sessions.sqlite3"))
+REDIS_URL = os.getenv("AETHER_REDIS_URL", "redis://localhost:6379/0")
+MEMORY_MAX_SESSIONS = int(os.getenv("AETHER_SESSION_MAX_ENTRIES", "10000"))
+
+
+# -------------------------
+# Backends — each stores one JSON-able dict per session ID
+# -------------------------
+class MemorySessionBackend:
+    """LRU of sid → (expires_at, state) with TTL; O(1) get/update."""
+
+    def __init__(self, ttl=SESSION_TTL, max_entries=MEMORY_MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._data[sid]
+                return None
+            self._data.move_to_end(sid)
+            return copy.deepcopy(entry[1])
+
+    def update(self, sid, mutate, default):
+        with self._lock:
+            entry = self._data.get(sid)
+            state = entry[1] if entry and entry[0] >= time.time() else copy.deepcopy(default)
+            mutate(state)
+            self._data[sid] = (time.time() + self.ttl, state)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+
+class SQLiteSessionBackend:
+    """JSON rows in a WAL-mode SQLite file; updates are read-modify-write inside one write transaction."""
+
+    def __init__(self, path=SESSION_DB_PATH, ttl=SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, expires_at REAL NOT NULL, state TEXT NOT NULL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid):
+        row = self._conn().execute(
+            "SELECT state FROM sessions WHERE sid = ? AND expires_at >= ?", (sid, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, sid, mutate, default):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT state FROM sessions WHERE sid = ? AND expires_at >= ?", (sid, now)
+            ).fetchone()
+            state = json.loads(row[0]) if row else copy.deepcopy(default)
+            mutate(state)
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (sid, expires_at, state) VALUES (?, ?, ?)",
+                (sid, now + self.ttl, json.dumps(state)),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._writes += 1
+        if self._writes % 200 == 0:
+            conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+
+    def delete(self, sid):
+        self._conn().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+class RedisSessionBackend:
+    """Redis (or any protocol-compatible server) with native key TTLs; updates use WATCH/MULTI."""
+
+    PREFIX = "aether:session:"
+
+    def __init__(self, url=REDIS_URL, ttl=SESSION_TTL):
+        import redis  # optional dependency, only needed for this backend
+
+        self.ttl = ttl
+        self.client = redis.Redis.from_url(url, socket_timeout=2)
+        self.client.ping()
+
+    def get(self, sid):
+        raw = self.client.get(self.PREFIX + sid)
+        if raw is None:
+            return None
+        self.client.expire(self.PREFIX + sid, self.ttl)
+        return json.loads(raw)
+
+    def update(self, sid, mutate, default):
+        key = self.PREFIX + sid
+
+        def txn(pipe):
+            raw = pipe.get(key)
+            state = json.loads(raw) if raw is not None else copy.deepcopy(default)
+            mutate(state)
+            pipe.multi()
+            pipe.set(key, json.dumps(state), ex=self.ttl)
+
+        self.client.transaction(txn, key)
+
+    def delete(self, sid):
+        self.client.delete(self.PREFIX + sid)
+
+
+def make_backend(kind=SESSION_BACKEND):
+    if kind == "redis":
+        try:
+            return RedisSessionBackend()
+        except Exception as e:
+            print(f"⚠️ Redis session store unavailable ({e}) — falling back to SQLite")
+            kind = "sqlite"
+    if kind == "sqlite":
+        try:
+            return SQLiteSessionBackend()
+        except Exception as e:
+            print(f"⚠️ SQLite session store unavailable ({e}) — falling back to memory")
+    return MemorySessionBackend()
+
+
+class SessionStore:
+    """Session ID → state dict, with `default` filled in for new or expired sessions."""
+
+    def __init__(self, default, backend=None):
+        self.default = default
+        self.backend = backend or make_backend()
+
+    def get(self, sid) -> dict:
+        try:
+            state = self.backend.get(sid)
+        except Exception as e:
+            print(f"⚠️ Session read failed: {e}")
+            state = None
+        merged = copy.deepcopy(self.default)
+        merged.update(state or {})
+        return merged
+
+    def update(self, sid, mutate):
+        """Apply `mutate(state)` atomically (per backend) and refresh the session's TTL."""
+        try:
+            self.backend.update(sid, mutate, self.default)
+        except Exception as e:
+            print(f"⚠️ Session write failed: {e}")
+
+    def set(self, sid, **fields):
+        self.update(sid, lambda state: state.update(fields))
+
+    def delete(self, sid):
+        self.backend.delete(sid)
@@ -0,0 +1,145 @@
+# === transport.py ===
+# Process-wide pooled HTTP client for OpenAI, NewsAPI, GNews, Reddit and YouTube
+
+import atexit
+import contextlib
+import os
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core import cancellation
+
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = os.getenv("AETHER_HTTP2", "1") != "0"
+except ImportError:
+    HTTP2_ENABLED = False
+
+# -------------------------
+# Pool config (per host)
+# -------------------------
+MAX_CONNECTIONS = int(os.getenv("AETHER_HTTP_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.getenv("AETHER_HTTP_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("AETHER_HTTP_KEEPALIVE_EXPIRY", "60"))
+CONNECT_TIMEOUT = float(os.getenv("AETHER_HTTP_CONNECT_TIMEOUT", "5"))
+DEFAULT_TIMEOUT = float(os.getenv("AETHER_HTTP_TIMEOUT", "10"))
+
+_clients = {}
+_lock = threading.Lock()
+_owner_pid = os.getpid()
+
+
+def _new_client():
+    return httpx.Client(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+        follow_redirects=True,
+    )
+
+
+def get_client(url: str) -> httpx.Client:
+    """Return the keep-alive client for the host of `url` (created on first use)."""
+    global _owner_pid
+    host = urlsplit(url).netloc
+
+    with _lock:
+        # forked worker (gunicorn --preload) → never share the parent's sockets
+        if os.getpid() != _owner_pid:
+            _clients.clear()
+            _owner_pid = os.getpid()
+
+        client = _clients.get(host)
+        if client is None:
+            client = _new_client()
+            _clients[host] = client
+        return client
+
+
+def _timeout(timeout):
+    if timeout is None:
+        return None
+    return httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout))
+
+
+# -------------------------
+# Request helpers
+# -------------------------
+def request(method: str, url: str, timeout=None, **kwargs) -> httpx.Response:
+    if timeout is not None:
+        kwargs["timeout"] = _timeout(timeout)
+    client = get_client(url)
+
+    token = cancellation.current_token()
+    if token is None:
+        return client.request(method, url, **kwargs)
+
+    # inside a cancellable request: fail fast, and let /abort close the
+    # connection mid-read instead of waiting out the timeout
+    token.raise_if_cancelled()
+    response = client.send(client.build_request(method, url, **kwargs), stream=True)
+    token.on_cancel(response.close)
+    try:
+        response.read()
+    except Exception:
+        token.raise_if_cancelled()
+        raise
+    finally:
+        token.discard(response.close)
+        response.close()
+    token.raise_if_cancelled()
+    return response
+
+
+def get(url: str, **kwargs) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> httpx.Response:
+    return request("POST", url, **kwargs)
+
+
+@contextlib.contextmanager
+def stream(method: str, url: str, timeout=None, **kwargs):
+    """Context manager yielding a streaming response on the pooled client."""
+    if timeout is not None:
+        kwargs["timeout"] = _timeout(timeout)
+
+    token = cancellation.current_token()
+    if token is not None:
+        token.raise_if_cancelled()
+
+    with get_client(url).stream(method, url, **kwargs) as response:
+        if token is None:
+            yield response
+            return
+        token.on_cancel(response.close)
+        try:
+            yield response
+        finally:
+            token.discard(response.close)
+
+
+# -------------------------
+# Shutdown
+# -------------------------
+def close_all():
+    """Close every pooled connection (runs at interpreter exit / worker shutdown)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"⚠️ HTTP client close failed: {e}")
+
+
+atexit.register(close_all)
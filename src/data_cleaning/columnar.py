@@ -0,0 +1,185 @@
+# === columnar.py ===
+# Parquet datasets that hand data between the offline pipeline stages
+#
+#   data/processed/<dataset>/topic=<topic>/date=<YYYY-MM-DD>/part-<name>.parquet
+#
+# Each stage reads only the columns it needs (memory-mapped) and writes one
+# part per input part, so re-runs only touch parts whose input changed.
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# -------------------------
+# Config
+# -------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATASET_ROOT = Path(os.getenv("AETHER_DATASET_ROOT", os.path.join(PROJECT_ROOT, "data", "processed")))
+COMPRESSION = os.getenv("AETHER_PARQUET_COMPRESSION", "zstd")
+BATCH_ROWS = int(os.getenv("AETHER_PARQUET_BATCH_ROWS", "5000"))
+
+_TS = pa.timestamp("us", tz="UTC")
+
+# one schema per stage output; rows are coerced to it on write
+SCHEMAS = {
+    "cleaned": pa.schema([
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("text", pa.string()),
+        ("source", pa.string()),
+        ("author", pa.string()),
+        ("published_at", _TS),
+    ]),
+    "nlp_ready": pa.schema([
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("published_at", _TS),
+        ("raw_text", pa.string()),
+        ("clean_text", pa.string()),
+        ("lemmatized", pa.string()),
+        ("num_words", pa.int32()),
+        ("num_chars", pa.int32()),
+    ]),
+    "topics": pa.schema([
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("published_at", _TS),
+        ("topic", pa.int16()),
+    ]),
+}
+
+
+class SchemaError(ValueError):
+    """A stage tried to write rows that don't fit its dataset's schema."""
+
+
+def topic_tag(topic: str) -> str:
+    return (topic or "all").lower().strip().replace(" ", "_")
+
+
+def dataset_dir(dataset, topic) -> Path:
+    return DATASET_ROOT / dataset / f"topic={topic_tag(topic)}"
+
+
+def to_table(df, dataset) -> pa.Table:
+    """Project `df` onto the dataset schema: missing columns become nulls, extras are dropped."""
+    schema = SCHEMAS[dataset]
+    df = df.copy()
+    for name in schema.names:
+        if name not in df.columns:
+            df[name] = None
+    try:
+        return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise SchemaError(f"Rows don't match the '{dataset}' schema: {e}") from e
+
+
+# -------------------------
+# Writes
+# -------------------------
+def write_frames(dataset, path, frames) -> int:
+    """
+    Stream DataFrames into one part file (schema-checked). Written to a tmp
+    file and renamed, so readers never see a half-written part.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    rows = 0
+    writer = pq.ParquetWriter(tmp, SCHEMAS[dataset], compression=COMPRESSION)
+    try:
+        for df in frames:
+            table = to_table(df, dataset)
+            writer.write_table(table)
+            rows += table.num_rows
+    except BaseException:
+        writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    writer.close()
+    os.replace(tmp, path)
+    return rows
+
+
+def write_partitioned(dataset, df, topic, part, date_column="published_at"):
+    """
+    Append `df` to the topic's dataset as `part`, split by the UTC date of
+    `date_column` (rows without one go under today). Rewriting the same
+    `part` replaces it — including dropping it from dates it no longer
+    has rows for; other parts are untouched.
+    """
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    if date_column in df.columns and len(df):
+        dates = df[date_column].dt.strftime("%Y-%m-%d").fillna(today)
+    else:
+        dates = [today] * len(df)
+
+    root = dataset_dir(dataset, topic)
+    groups = list(df.groupby(dates, sort=True))
+    keep = {root / f"date={date}" / f"part-{part}.parquet" for date, _ in groups}
+    if root.is_dir():
+        for stale in root.glob(f"date=*/part-{part}.parquet"):
+            if stale not in keep:
+                stale.unlink(missing_ok=True)
+
+    paths = []
+    for date, rows in groups:
+        path = root / f"date={date}" / f"part-{part}.parquet"
+        write_frames(dataset, path, [rows])
+        paths.append(path)
+    return paths
+
+
+# -------------------------
+# Reads
+# -------------------------
+def list_parts(dataset, topic):
+    root = dataset_dir(dataset, topic)
+    return sorted(root.glob("date=*/part-*.parquet")) if root.is_dir() else []
+
+
+def read_part(path, columns=None):
+    """One part as a DataFrame, reading only `columns` (memory-mapped)."""
+    return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def iter_batches(path, columns=None, batch_rows=BATCH_ROWS):
+    """Stream a part as DataFrames of at most `batch_rows` rows."""
+    with pq.ParquetFile(path, memory_map=True) as f:
+        for batch in f.iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+
+
+def read_dataset(dataset, topic, columns=None):
+    """Every part of a topic's dataset, concatenated."""
+    tables = [pq.read_table(p, columns=columns, memory_map=True) for p in list_parts(dataset, topic)]
+    if not tables:
+        return SCHEMAS[dataset].empty_table().select(columns or SCHEMAS[dataset].names).to_pandas()
+    return pa.concat_tables(tables).to_pandas()
+
+
+def output_part(path, src_dataset, dst_dataset) -> Path:
+    """The `dst_dataset` part that mirrors a `src_dataset` part (same topic/date/name)."""
+    rel = Path(path).relative_to(DATASET_ROOT / src_dataset)
+    return DATASET_ROOT / dst_dataset / rel
+
+
+def pending_parts(src_dataset, dst_dataset, topic):
+    """
+    (input, output) pairs whose output is missing or older than its input.
+    Outputs whose input part is gone are deleted, so stale rows don't
+    carry on into later stages.
+    """
+    for dst in list_parts(dst_dataset, topic):
+        if not output_part(dst, dst_dataset, src_dataset).exists():
+            dst.unlink(missing_ok=True)
+
+    pending = []
+    for src in list_parts(src_dataset, topic):
+        dst = output_part(src, src_dataset, dst_dataset)
+        if not dst.exists() or dst.stat().st_mtime < src.stat().st_mtime:
+            pending.append((src, dst))
+    return pending
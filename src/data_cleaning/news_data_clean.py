@@ -1,12 +1,16 @@
 import pandas as pd
 from pathlib import Path
 
-def clean_news_data(input_path, custom_output=None):
+from src.data_cleaning.columnar import dataset_dir, write_partitioned
+
+def clean_news_data(input_path, custom_output=None, topic=None):
     """
     Cleans the raw news data:
       - Loads JSON or CSV
       - Removes duplicates, NaN, and empty text
-      - Saves a cleaned CSV file (default or custom_output)
+      - Appends it to the topic's "cleaned" Parquet dataset, one part per
+        input file (or saves a CSV when custom_output ends in .csv)
+    Topic defaults to the input name without its "news_" prefix.
     """
 
     df = pd.read_json(input_path) if str(input_path).endswith(".json") else pd.read_csv(input_path)
@@ -38,19 +42,26 @@ def clean_news_data(input_path, custom_output=None):
 
     # Filter out junk rows (like "nan" or too short)
     df = df[df["title"].str.len() > 5]
-    df = df[df["text"].str.len() > 10]
+    df = df[df["text"].str.len() > 10].copy()
 
-    # Decide output path
-    if custom_output:
+    # Legacy CSV export
+    if custom_output and str(custom_output).endswith(".csv"):
         output_path = Path(custom_output)
-    else:
-        output_path = Path(input_path).with_name("cleaned_" + Path(input_path).stem + ".csv")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_path, index=False)
+        print(f"🧹 Cleaned news data saved to: {output_path} ({len(df)} rows)")
+        return output_path
 
-    # Ensure directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # NewsAPI nests the outlet as {"id", "name"}
+    if "source" in df.columns:
+        df["source"] = df["source"].map(lambda s: s.get("name") if isinstance(s, dict) else s)
+    published = next((c for c in ("publishedat", "published_at", "published") if c in df.columns), None)
+    df["published_at"] = pd.to_datetime(df[published], utc=True, errors="coerce") if published else pd.NaT
 
-    # Save cleaned file
-    df.to_csv(output_path, index=False)
+    stem = Path(input_path).stem
+    topic = topic or stem.removeprefix("news_")
+    paths = write_partitioned("cleaned", df, topic, part=stem)
 
-    print(f"🧹 Cleaned news data saved to: {output_path} ({len(df)} rows)")
+    output_path = dataset_dir("cleaned", topic)
+    print(f"🧹 Cleaned news data saved to: {output_path} ({len(df)} rows in {len(paths)} partitions)")
     return output_path
@@ -0,0 +1,282 @@
+# === article_store.py ===
+# Local SQLite (FTS5) store of fetched news / Reddit / YouTube items
+
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+
+from src.core.cache import normalize_query
+from src.data_ingest.federation import url_key
+
+# -------------------------
+# Config
+# -------------------------
+STORE_ENABLED = os.getenv("AETHER_STORE", "1") != "0"
+# anchored to the project root: the web dyno runs with --chdir webapp, the worker doesn't
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STORE_PATH = os.getenv("AETHER_STORE_DB", os.path.join(PROJECT_ROOT, "data", "store", "articles.sqlite3"))
+# items fetched longer ago than this (s) don't count as a warm answer —
+# about twice the ingest worker's refresh interval for each source
+STORE_FRESHNESS = {
+    "news": int(os.getenv("AETHER_STORE_FRESHNESS_NEWS", "1800")),
+    "reddit": int(os.getenv("AETHER_STORE_FRESHNESS_REDDIT", "1200")),
+    "youtube": int(os.getenv("AETHER_STORE_FRESHNESS_YOUTUBE", "7200")),
+}
+# fewer matches than this → the topic is cold, go upstream
+STORE_MIN_HITS = int(os.getenv("AETHER_STORE_MIN_HITS", "5"))
+RETENTION_DAYS = int(os.getenv("AETHER_STORE_RETENTION_DAYS", "14"))
+# only items published inside this window are served (same week the fetchers use)
+PUBLISHED_WINDOW = 7 * 86400
+
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+# request phrasing and source words: "show me the latest news about nvidia" is stored
+# and searched as "nvidia" (otherwise every word has to appear in an item to match)
+_TOPIC_FILLER = frozenset(
+    "a an the and some any me my i we you please pls can could would will tell show give get find "
+    "search look up fetch list play watch see want wanna know what whats what's is are was were "
+    "going on happening with about on of for in regarding related to from latest recent new newest "
+    "top best trending popular today todays this week now current currently more just only "
+    "news headline headlines article articles story stories update updates "
+    "video videos clip clips youtube yt vlog vlogs reddit post posts thread threads discussion discussions".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    source_type TEXT NOT NULL,
+    url_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    ts REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload BLOB NOT NULL,
+    UNIQUE (source_type, url_key)
+);
+CREATE INDEX IF NOT EXISTS items_source_ts ON items (source_type, ts);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, body, content='items', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO items_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+
+-- topics the daemon keeps warm: the watchlist plus anything users asked for
+CREATE TABLE IF NOT EXISTS topics (
+    topic TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    requested_at REAL NOT NULL DEFAULT 0,
+    refreshed_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (topic, source_type)
+);
+"""
+
+
+def _body(item) -> str:
+    """Searchable text besides the title, per source."""
+    if item.source_type == "reddit":
+        return item.subreddit or ""
+    if item.source_type == "youtube":
+        return item.channel or ""
+    return f"{item.description or ''} {item.source or ''}"
+
+
+def store_topic(topic: str) -> str:
+    """The subject words of a chat message or query — the key items are searched and refreshed by."""
+    tokens = _FTS_TOKEN.findall(normalize_query(topic))
+    return " ".join(t for t in tokens if t not in _TOPIC_FILLER)
+
+
+def fts_query(topic: str) -> str:
+    """All subject words must match (porter-stemmed); quoted so FTS syntax can't leak in."""
+    return " AND ".join(f'"{t}"' for t in store_topic(topic).split())
+
+
+class ArticleStore:
+    """WAL-mode SQLite file shared by the ingest worker (writer) and web workers (readers)."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def upsert(self, items, fetched_at=None) -> int:
+        """Insert or refresh items (keyed by source + normalized URL). Returns rows written."""
+        fetched_at = fetched_at or time.time()
+        rows = []
+        for item in items or []:
+            key = url_key(item.url) or f"title:{normalize_query(item.title)}"
+            rows.append((
+                item.source_type, key, item.title or "", _body(item), item.ts, fetched_at,
+                pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL),
+            ))
+        if not rows:
+            return 0
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                """
+                INSERT INTO items (source_type, url_key, title, body, ts, fetched_at, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source_type, url_key) DO UPDATE SET
+                    title = excluded.title, body = excluded.body, ts = excluded.ts,
+                    fetched_at = excluded.fetched_at, payload = excluded.payload
+                """,
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def touch_topic(self, topic, source_type, requested=False, refreshed=False):
+        now = time.time()
+        self._conn().execute(
+            """
+            INSERT INTO topics (topic, source_type, requested_at, refreshed_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (topic, source_type) DO UPDATE SET
+                requested_at = CASE WHEN ? THEN excluded.requested_at ELSE requested_at END,
+                refreshed_at = CASE WHEN ? THEN excluded.refreshed_at ELSE refreshed_at END
+            """,
+            (store_topic(topic) or normalize_query(topic), source_type,
+             now if requested else 0, now if refreshed else 0, requested, refreshed),
+        )
+
+    def prune(self, retention_days=RETENTION_DAYS) -> int:
+        cutoff = time.time() - retention_days * 86400
+        conn = self._conn()
+        cur = conn.execute("DELETE FROM items WHERE ts < ? AND fetched_at < ?", (cutoff, cutoff))
+        conn.execute("DELETE FROM topics WHERE requested_at < ? AND refreshed_at < ?", (cutoff, cutoff))
+        return cur.rowcount
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def search(self, topic, source_type, limit=30, fresh_within=None):
+        """BM25-ranked items for `topic`, fetched within `fresh_within` s and published this week."""
+        query = fts_query(topic)
+        if not query:
+            return []
+        if fresh_within is None:
+            fresh_within = STORE_FRESHNESS.get(source_type, 1800)
+        now = time.time()
+        try:
+            rows = self._conn().execute(
+                """
+                SELECT items.payload FROM items_fts
+                JOIN items ON items.id = items_fts.rowid
+                WHERE items_fts MATCH ? AND items.source_type = ?
+                  AND items.fetched_at >= ? AND items.ts >= ?
+                ORDER BY bm25(items_fts, 3.0, 1.0)
+                LIMIT ?
+                """,
+                (query, source_type, now - fresh_within, now - PUBLISHED_WINDOW, limit),
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Article store read failed: {e}")
+            return []
+
+        out = []
+        for (payload,) in rows:
+            try:
+                out.append(pickle.loads(payload))
+            except Exception:
+                continue
+        return out
+
+    def topics_due(self, source_type, interval, requested_within):
+        """Recently requested topics whose last refresh is older than `interval`."""
+        now = time.time()
+        rows = self._conn().execute(
+            """
+            SELECT topic FROM topics
+            WHERE source_type = ? AND requested_at >= ? AND refreshed_at < ?
+            ORDER BY requested_at DESC
+            """,
+            (source_type, now - requested_within, now - interval),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        counts = dict(conn.execute("SELECT source_type, COUNT(*) FROM items GROUP BY source_type").fetchall())
+        topics = conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+        return {"items": counts, "topics": topics}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide store, or None when disabled/unavailable."""
+    global _store
+    if not STORE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = ArticleStore()
+            except Exception as e:
+                print(f"⚠️ Article store unavailable ({e}) — fetching upstream only")
+                return None
+        return _store
+
+
+# -------------------------
+# Read-through for handle_intent
+# -------------------------
+def store_first(source_type, topic, fetch, limit=30, **params):
+    """
+    Answer from the local store when the topic is warm; otherwise call the
+    upstream `fetch(topic, **params)`, write its results through, and mark
+    the topic so the ingest worker keeps it warm from now on.
+    """
+    store = get_store()
+    key = store_topic(topic)
+    if store is None or not key:
+        return fetch(topic, **params)
+
+    try:
+        hits = store.search(key, source_type, limit=limit)
+        store.touch_topic(key, source_type, requested=True)
+    except Exception as e:
+        print(f"⚠️ Article store lookup failed: {e}")
+        return fetch(topic, **params)
+
+    if len(hits) >= STORE_MIN_HITS:
+        print(f"🗄️ {source_type}: {len(hits)} items for '{topic}' from the local store")
+        return hits
+
+    items = fetch(topic, **params)
+    try:
+        store.upsert(items)
+    except Exception as e:
+        print(f"⚠️ Article store write failed: {e}")
+    return items
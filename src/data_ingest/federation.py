@@ -0,0 +1,266 @@
+# === federation.py ===
+# Concurrent, hedged news search across every enabled provider
+
+import contextvars
+import functools
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from src.core.cancellation import RequestCancelled
+from src.core.dedupe import NearDuplicateIndex
+from src.data_ingest.news_providers import default_providers
+
+# -------------------------
+# Config
+# -------------------------
+FEDERATION_BUDGET = float(os.getenv("AETHER_NEWS_BUDGET", "8"))
+PROVIDER_TIMEOUT = float(os.getenv("AETHER_NEWS_PROVIDER_TIMEOUT", "6"))
+# once one provider has answered with articles, wait at most this long for the rest
+GRACE_AFTER_FIRST = float(os.getenv("AETHER_NEWS_GRACE", "1.0"))
+HEDGE_ENABLED = os.getenv("AETHER_NEWS_HEDGE", "1") != "0"
+# hedge fires after `factor × typical latency`, clamped to [min, max] seconds
+HEDGE_FACTOR = float(os.getenv("AETHER_NEWS_HEDGE_FACTOR", "2.0"))
+HEDGE_MIN = float(os.getenv("AETHER_NEWS_HEDGE_MIN", "0.5"))
+HEDGE_MAX = float(os.getenv("AETHER_NEWS_HEDGE_MAX", "3.0"))
+# after this many consecutive failures a provider sits out for the cooldown
+BREAKER_FAILURES = int(os.getenv("AETHER_NEWS_BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.getenv("AETHER_NEWS_BREAKER_COOLDOWN", "60"))
+
+_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AETHER_NEWS_WORKERS", "8")),
+    thread_name_prefix="aether-news",
+)
+
+
+# -------------------------
+# Provider health
+# -------------------------
+class ProviderHealth:
+    """EWMA latency and error rate for one provider, plus a simple circuit breaker."""
+
+    ALPHA = 0.2
+
+    def __init__(self, name, initial_latency=1.0):
+        self.name = name
+        self.latency = initial_latency
+        self.error_rate = 0.0
+        self.calls = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency):
+        with self._lock:
+            self.calls += 1
+            self.latency += self.ALPHA * (latency - self.latency)
+            self.error_rate *= 1 - self.ALPHA
+            self.consecutive_failures = 0
+
+    def record_failure(self, latency=None):
+        with self._lock:
+            self.calls += 1
+            if latency is not None:
+                self.latency += self.ALPHA * (latency - self.latency)
+            self.error_rate += self.ALPHA * (1 - self.error_rate)
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= BREAKER_FAILURES:
+                self.open_until = time.monotonic() + BREAKER_COOLDOWN
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def hedge_delay(self) -> float:
+        return min(HEDGE_MAX, max(HEDGE_MIN, self.latency * HEDGE_FACTOR))
+
+    def score(self) -> float:
+        """Higher is healthier: success share over latency."""
+        return (1.0 - self.error_rate) / (1.0 + self.latency)
+
+    def snapshot(self) -> dict:
+        return {
+            "latency": round(self.latency, 3),
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "score": round(self.score(), 3),
+            "open": not self.available(),
+        }
+
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def health_for(name) -> ProviderHealth:
+    with _health_lock:
+        health = _health.get(name)
+        if health is None:
+            health = _health[name] = ProviderHealth(name)
+        return health
+
+
+def health_snapshot() -> dict:
+    with _health_lock:
+        return {name: h.snapshot() for name, h in _health.items()}
+
+
+def _record_late(name, started, fut):
+    elapsed = time.monotonic() - started
+    if fut.cancelled():
+        return
+    error = fut.exception()
+    if isinstance(error, RequestCancelled):
+        return
+    if error is not None:
+        health_for(name).record_failure(elapsed)
+    else:
+        health_for(name).record_success(elapsed)
+
+
+# -------------------------
+# Merge / dedupe
+# -------------------------
+_TRACKING_PARAMS = re.compile(r"^(utm_|fbclid$|gclid$|ocid$|cmpid$|ref$|src$)")
+
+
+def url_key(url) -> str:
+    """scheme/www/trailing-slash/tracking-param insensitive form of a URL."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)))
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+
+def merge_results(ranked_lists, limit):
+    """
+    Round-robin the providers' lists (healthiest provider first), dropping any
+    item whose URL was already taken or that near-duplicates a kept story
+    (syndicated copies), until `limit` items.
+    """
+    seen_urls = set()
+    stories = NearDuplicateIndex()
+    merged = []
+    iters = [iter(items) for items in ranked_lists]
+    while iters and len(merged) < limit:
+        for it in list(iters):
+            item = next(it, None)
+            if item is None:
+                iters.remove(it)
+                continue
+            u = url_key(item.url)
+            if u and u in seen_urls:
+                continue
+            if not stories.add(item):
+                continue
+            seen_urls.add(u)
+            merged.append(item)
+            if len(merged) >= limit:
+                break
+    return merged
+
+
+# -------------------------
+# Federation
+# -------------------------
+def federated_search(topic, max_articles, since, matcher, providers=None,
+                     budget=FEDERATION_BUDGET, hedge=HEDGE_ENABLED):
+    """
+    Query every available provider at once. A provider that is slower than
+    its usual latency gets one hedged duplicate request; whichever attempt
+    answers first wins. Once any provider has returned articles, the others
+    get a short grace window instead of the full budget. Returns merged,
+    deduplicated NewsItems.
+    """
+    providers = [p for p in (providers if providers is not None else default_providers()) if p.enabled()]
+    live = [p for p in providers if health_for(p.name).available()]
+    if providers and not live:
+        # every breaker is open — better a slow answer than none
+        live = providers
+
+    started_at = time.monotonic()
+    deadline = started_at + budget
+    timeout = min(PROVIDER_TIMEOUT, budget)
+
+    attempts = {}     # future → (provider, started)
+    outstanding = {}  # provider name → live attempt count
+    hedged = set()
+    first_started = {}
+    results = {}      # provider name → items (resolved providers only)
+
+    def _submit(provider):
+        ctx = contextvars.copy_context()  # keeps the request's cancel token
+        fut = _pool.submit(ctx.run, provider.fetch, topic, max_articles, since, matcher, timeout)
+        now = time.monotonic()
+        attempts[fut] = (provider, now)
+        outstanding[provider.name] = outstanding.get(provider.name, 0) + 1
+        first_started.setdefault(provider.name, now)
+
+    for provider in live:
+        _submit(provider)
+
+    while attempts and len(results) < len(live):
+        now = time.monotonic()
+        if now >= deadline:
+            break
+
+        # wake up for the next hedge, if one is due before the deadline
+        wake = deadline
+        if hedge:
+            for p in live:
+                if p.hedge and p.name not in results and p.name not in hedged:
+                    wake = min(wake, first_started[p.name] + health_for(p.name).hedge_delay())
+
+        done, _ = wait(list(attempts), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+
+        for fut in done:
+            provider, started = attempts.pop(fut)
+            outstanding[provider.name] -= 1
+            elapsed = time.monotonic() - started
+            health = health_for(provider.name)
+            try:
+                items = fut.result()
+            except Exception as e:
+                if provider.name in results:
+                    continue
+                health.record_failure(elapsed)
+                print(f"❌ {provider.name} failed for '{topic}': {e}")
+                if outstanding[provider.name] == 0 and provider.name not in results:
+                    results[provider.name] = []
+                continue
+            if provider.name in results:
+                continue  # the other attempt already answered
+            health.record_success(elapsed)
+            results[provider.name] = items
+            if items:
+                deadline = min(deadline, time.monotonic() + GRACE_AFTER_FIRST)
+
+        if hedge:
+            now = time.monotonic()
+            for p in live:
+                if (p.hedge and p.name not in results and p.name not in hedged
+                        and now >= first_started[p.name] + health_for(p.name).hedge_delay()):
+                    hedged.add(p.name)
+                    print(f"🪃 Hedging {p.name} for '{topic}' after {now - first_started[p.name]:.2f}s")
+                    _submit(p)
+
+    for p in live:
+        if p.name not in results:
+            print(f"⏱️ {p.name} missed the news deadline for '{topic}' ({time.monotonic() - first_started[p.name]:.2f}s)")
+    # stragglers finish in the background; their answers are no longer needed,
+    # but their outcome still counts towards the provider's health
+    for fut, (provider, started) in attempts.items():
+        if not fut.cancel():
+            fut.add_done_callback(functools.partial(_record_late, provider.name, started))
+
+    ranked = sorted(results, key=lambda name: health_for(name).score(), reverse=True)
+    merged = merge_results([results[name] for name in ranked], max_articles)
+    print(
+        f"🧩 News federation: {', '.join(f'{n}={len(results[n])}' for n in ranked) or 'no providers'} "
+        f"→ {len(merged)} merged in {time.monotonic() - started_at:.2f}s"
+    )
+    return merged
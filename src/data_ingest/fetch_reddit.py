@@ -1,43 +1,24 @@
-import requests
 import re
 from datetime import datetime, timedelta, timezone
 from src.llm.response_engine import refine_search_query
-
-
-def _is_relevant(text: str, topic: str):
-    """Smart semantic relevance checker (v2.1)"""
-    text = (text or "").lower()
-    topic = topic.lower()
-    topic_words = [w for w in re.findall(r"\w+", topic)]
-
-    if not text or not topic_words:
-        return False
-
-    score = sum(1 for w in topic_words if w in text)
-    similar = (
-        topic in text
-        or re.search(rf"\b{re.escape(topic[:-1])}\w*\b", text)
-        or any(w in text for w in topic_words)
-    )
-
-    window_text = re.sub(r"[^a-z0-9\s]", " ", text)
-    tokens = window_text.split()
-    proximity_hits = 0
-    for i in range(len(tokens) - 1):
-        if tokens[i] in topic_words:
-            for j in range(i + 1, min(i + 7, len(tokens))):
-                if tokens[j] in topic_words and tokens[j] != tokens[i]:
-                    proximity_hits += 1
-                    break
-
-    return (score >= 2 or proximity_hits >= 1 or similar) if len(topic_words) >= 2 else (score >= 1 or similar)
-
-
-def fetch_reddit_posts(topic="news", limit=30):
-    """Fetch Reddit posts as list[dict] compatible with Aether’s pipeline."""
+from src.core import transport
+from src.core.cache import cached_source
+from src.core.dedupe import collapse
+from src.data_ingest.relevance import REDDIT_POLICY, get_matcher
+from src.data_ingest.models import RedditPost
+from src.data_ingest.variants import run_variants
+
+
+@cached_source("reddit")
+def fetch_reddit_posts(topic="news", limit=30, refine=True):
+    """
+    Fetch Reddit posts as list[dict] compatible with Aether’s pipeline.
+    Pass refine=False when the topic was already refined for this turn.
+    """
     print(f"🧵 Reddit: Fetching posts for '{topic}'...")
-    topic = refine_search_query(topic)
-    print(f"🔍 Refined Reddit topic: {topic}")
+    if refine:
+        topic = refine_search_query(topic)
+        print(f"🔍 Refined Reddit topic: {topic}")
 
     topic_variants = list(dict.fromkeys([
         topic.strip(),
@@ -48,23 +29,25 @@ def fetch_reddit_posts(topic="news", limit=30):
 
     now = datetime.now(timezone.utc)
     week_ago = now - timedelta(days=7)
-    posts = []
+    matcher = get_matcher(topic, REDDIT_POLICY)
 
-    for variant in topic_variants:
-        url = f"https://www.reddit.com/search.json?q={variant}&sort=top&t=week&limit={limit}"
+    def _fetch_variant(variant):
+        url = "https://www.reddit.com/search.json"
+        params = {"q": variant, "sort": "top", "t": "week", "limit": limit}
         headers = {"User-agent": "AetherBot/3.1"}
 
         try:
-            r = requests.get(url, headers=headers, timeout=10)
+            r = transport.get(url, params=params, headers=headers, timeout=10)
             if r.status_code == 429:
                 print("⛔ Reddit rate limit — skipping variant temporarily.")
-                continue
+                return []
             r.raise_for_status()
             data = r.json()
         except Exception as e:
             print(f"⚠️ Reddit fetch failed for '{variant}': {e}")
-            continue
+            return []
 
+        found = []
         for post in data.get("data", {}).get("children", []):
             p = post.get("data", {})
             title = p.get("title", "").strip()
@@ -75,42 +58,32 @@ def fetch_reddit_posts(topic="news", limit=30):
                 continue
 
             combined = f"{title} {body} {sub}"
-            if not _is_relevant(combined, topic):
+            if not matcher.matches(combined):
                 continue
 
             created = datetime.fromtimestamp(p.get("created_utc", 0), tz=timezone.utc)
             if created < week_ago:
                 continue
 
-            upvotes = int(p.get("score", 0))
-            comments = int(p.get("num_comments", 0))
-            hours = max(1, int((now - created).total_seconds() // 3600))
-            published_str = f"{hours}h ago" if hours < 24 else created.strftime("%Y-%m-%d")
-
-            posts.append({
-                "source_type": "reddit",
-                "title": title,
-                "url": f"https://reddit.com{p.get('permalink','')}",
-                "subreddit": sub,
-                "upvotes": upvotes,
-                "comments": comments,
-                "published": published_str
-            })
+            found.append(RedditPost(
+                title=title,
+                url=f"https://reddit.com{p.get('permalink','')}",
+                ts=created.timestamp(),
+                subreddit=sub,
+                upvotes=int(p.get("score", 0)),
+                comments=int(p.get("num_comments", 0)),
+            ))
+        return found
 
-        if len(posts) >= 10:
-            break
+    # variants run concurrently; stop as soon as 10 relevant posts are in
+    posts = run_variants("reddit", topic_variants, _fetch_variant, enough=lambda found: len(found) >= 10)
 
     if not posts:
         print(f"⚠️ Reddit: No relevant posts for '{topic}'")
         return []
 
-    # Remove duplicates by title
-    seen = set()
-    unique_posts = []
-    for p in posts:
-        if p["title"].lower() not in seen:
-            seen.add(p["title"].lower())
-            unique_posts.append(p)
+    # Remove near-duplicates (crossposts, reworded reposts)
+    unique_posts = collapse(posts)
 
-    print(f"✅ Reddit: {len(unique_posts)} relevant posts found (top: {unique_posts[0]['title'][:60]}...)")
+    print(f"✅ Reddit: {len(unique_posts)} relevant posts found (top: {unique_posts[0].title[:60]}...)")
     return unique_posts
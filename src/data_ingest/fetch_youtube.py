@@ -1,9 +1,13 @@
 import os
-import requests
 import re
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from src.llm.response_engine import refine_search_query
+from src.core import transport
+from src.core.cache import cached_source
+from src.data_ingest.relevance import YOUTUBE_POLICY, get_matcher
+from src.data_ingest.models import YouTubeVideo
+from src.data_ingest.variants import run_variants
 
 
 load_dotenv()
@@ -29,33 +33,7 @@ def _iso8601_duration_to_seconds(dur):
     return h * 3600 + m * 60 + s
 
 
-def _is_relevant(text: str, topic: str):
-    text = (text or "").lower()
-    topic = topic.lower()
-    topic_words = [w for w in re.findall(r"\w+", topic)]
-
-    if not text or not topic_words:
-        return False
-
-    score = sum(1 for w in topic_words if w in text)
-    similar = (
-        topic in text
-        or re.search(rf"\b{re.escape(topic[:-1])}\w*\b", text)
-        or any(w in text for w in topic_words)
-    )
-
-    tokens = re.sub(r"[^a-z0-9\s]", " ", text).split()
-    proximity_hits = 0
-    for i in range(len(tokens) - 1):
-        if tokens[i] in topic_words:
-            for j in range(i + 1, min(i + 7, len(tokens))):
-                if tokens[j] in topic_words and tokens[j] != tokens[i]:
-                    proximity_hits += 1
-                    break
-
-    return (score >= 2 or proximity_hits >= 1 or similar) if len(topic_words) >= 2 else (score >= 1 or similar)
-
-
+@cached_source("youtube")
 def fetch_youtube_videos(query="news", max_results=20):
     """Fetch YouTube videos as list[dict] compatible with Aether’s pipeline."""
     print(f"🎥 YouTube: Fetching videos for '{query}'...")
@@ -70,6 +48,7 @@ def fetch_youtube_videos(query="news", max_results=20):
 
     now = datetime.now(timezone.utc)
     week_ago = now - timedelta(days=7)
+    matcher = get_matcher(query, YOUTUBE_POLICY)
 
     query_variants = list(dict.fromkeys([
         query,
@@ -92,7 +71,7 @@ def fetch_youtube_videos(query="news", max_results=20):
             "key": YOUTUBE_API_KEY,
         }
         try:
-            r = requests.get("https://www.googleapis.com/youtube/v3/search", params=params, timeout=10)
+            r = transport.get("https://www.googleapis.com/youtube/v3/search", params=params, timeout=10)
             r.raise_for_status()
             data = r.json()
             return [i["id"]["videoId"] for i in data.get("items", []) if "videoId" in i["id"]]
@@ -100,12 +79,12 @@ def fetch_youtube_videos(query="news", max_results=20):
             print(f"⚠️ YouTube search failed for '{q}' ({duration}): {e}")
             return []
 
-    all_ids = []
-    for q in query_variants:
-        ids = _search_youtube(q, "medium") or _search_youtube(q, "long") or _search_youtube(q, "any")
-        all_ids.extend(ids)
-        if len(all_ids) >= 5:
-            break
+    def _ids_for_variant(q):
+        # duration fallback stays sequential per variant — each search costs quota
+        return _search_youtube(q, "medium") or _search_youtube(q, "long") or _search_youtube(q, "any")
+
+    # variants run concurrently; stop as soon as 5 ids are in
+    all_ids = run_variants("youtube", query_variants, _ids_for_variant, enough=lambda ids: len(ids) >= 5)
 
     all_ids = list(dict.fromkeys(all_ids))
     if not all_ids:
@@ -115,7 +94,7 @@ def fetch_youtube_videos(query="news", max_results=20):
     params = {"part": "statistics,snippet,contentDetails", "id": ",".join(all_ids[:50]), "key": YOUTUBE_API_KEY}
 
     try:
-        r = requests.get("https://www.googleapis.com/youtube/v3/videos", params=params, timeout=10)
+        r = transport.get("https://www.googleapis.com/youtube/v3/videos", params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
     except Exception as e:
@@ -143,20 +122,16 @@ def fetch_youtube_videos(query="news", max_results=20):
             continue
 
         combined = f"{title} {desc} {channel}"
-        if not _is_relevant(combined, query):
+        if not matcher.matches(combined):
             continue
 
-        hours = max(1, int((now - pub_dt).total_seconds() // 3600))
-        published_str = f"{hours}h ago" if hours < 24 else pub_dt.strftime("%Y-%m-%d")
-
-        videos.append({
-            "source_type": "youtube",
-            "title": title,
-            "channel": channel,
-            "published": published_str,
-            "views": views,
-            "url": f"https://www.youtube.com/watch?v={item['id']}",
-        })
+        videos.append(YouTubeVideo(
+            title=title,
+            channel=channel,
+            ts=pub_dt.timestamp(),
+            views=views,
+            url=f"https://www.youtube.com/watch?v={item['id']}",
+        ))
 
     if not videos:
         print("⚠️ Filtered out all YT videos after relevance check")
@@ -168,40 +143,33 @@ def fetch_youtube_videos(query="news", max_results=20):
 
     def _score_video(v):
         """Compute a weighted score for relevance + engagement."""
-        title = v.get("title", "").lower()
-        channel = v.get("channel", "").lower()
+        title = v.title.lower()
+        channel = v.channel.lower()
 
         # ✅ 1. Title and channel keyword matches (weighted)
         keyword_hits = sum(k in title for k in query_keywords) * 3
         keyword_hits += sum(k in channel for k in query_keywords) * 2
 
         # ✅ 2. Engagement score (views in hundreds of thousands)
-        view_boost = min(v.get("views", 0) / 200_000, 5)  # scaled 0–5
+        view_boost = min(v.views / 200_000, 5)  # scaled 0–5
 
-        # ✅ 3. Recency bonus (prefer newer videos)
-        recent_bonus = 0
-        if v["published"].endswith("ago"):
-            try:
-                hours_ago = int(v["published"].split("h")[0])
-                recent_bonus = max(0, 3 - (hours_ago / 12))  # fades after ~36h
-            except:
-                pass
+        # ✅ 3. Recency bonus (prefer newer videos) — from the numeric timestamp
+        hours_ago = v.hours_ago
+        recent_bonus = max(0, 3 - (hours_ago / 12)) if hours_ago < 24 else 0  # fades after ~36h
 
         return keyword_hits + view_boost + recent_bonus
 
     # 🧠 Optional: boost exact channel match
     for v in videos:
-        if query_lower in v.get("channel", "").lower():
-            v["views"] *= 2  # stronger weight for exact creator
-
-    # Score and sort
-    videos.sort(key=_score_video, reverse=True)
+        if query_lower in v.channel.lower():
+            v.views *= 2  # stronger weight for exact creator
 
-    # Filter out weakly relevant results
-    videos = [v for v in videos if _score_video(v) >= 2]
+    # Score once, sort, filter out weakly relevant results
+    scored = sorted(((_score_video(v), v) for v in videos), key=lambda sv: sv[0], reverse=True)
+    videos = [v for s, v in scored if s >= 2]
 
     # Limit to top results
     videos = videos[:max_results]
 
-    print(f"✅ YouTube: {len(videos)} ranked videos (top={videos[0]['title'][:60]}...)")
+    print(f"✅ YouTube: {len(videos)} ranked videos (top={videos[0].title[:60]}...)")
     return videos
@@ -0,0 +1,168 @@
+# === ingest_daemon.py ===
+# Scheduled ingestion worker: keeps the watchlist (and recently asked topics) warm
+#
+#   PYTHONPATH=$(pwd) python -m src.data_ingest.ingest_daemon          # run forever
+#   PYTHONPATH=$(pwd) python -m src.data_ingest.ingest_daemon --once   # one pass
+
+import argparse
+import os
+import signal
+import threading
+import time
+
+from src.data_ingest.article_store import PROJECT_ROOT, get_store
+from src.data_ingest.fetch_news import fetch_news
+from src.data_ingest.fetch_reddit import fetch_reddit_posts
+from src.data_ingest.fetch_youtube import fetch_youtube_videos
+from src.nlp import topic_engine, trend_engine
+
+# -------------------------
+# Config
+# -------------------------
+DEFAULT_WATCHLIST = "artificial intelligence,technology,stock market,climate change,cryptocurrency,space,cricket"
+WATCHLIST_FILE = os.getenv("AETHER_WATCHLIST_FILE", os.path.join(PROJECT_ROOT, "data", "watchlist.txt"))
+
+# seconds between refreshes of one topic, per source
+# (a YouTube refresh is ≥2 search.list calls at 100 units each against a 10k/day
+# quota → 7 watchlist topics every 6h ≈ 5.6k units/day, leaving room for users)
+INTERVALS = {
+    "news": int(os.getenv("AETHER_INGEST_INTERVAL_NEWS", "900")),
+    "reddit": int(os.getenv("AETHER_INGEST_INTERVAL_REDDIT", "600")),
+    "youtube": int(os.getenv("AETHER_INGEST_INTERVAL_YOUTUBE", str(6 * 3600))),
+}
+SOURCES = [s.strip() for s in os.getenv("AETHER_INGEST_SOURCES", "news,reddit,youtube").split(",") if s.strip()]
+# user-requested topics stay on the refresh list this long after the last ask
+REQUESTED_WINDOW = int(os.getenv("AETHER_INGEST_REQUESTED_WINDOW", str(24 * 3600)))
+MAX_REQUESTED_PER_PASS = int(os.getenv("AETHER_INGEST_MAX_REQUESTED", "20"))
+# requested topics are kept warm on YouTube only when opted in (quota, see INTERVALS)
+REQUESTED_SOURCES = [
+    s.strip() for s in os.getenv("AETHER_INGEST_REQUESTED_SOURCES", "news,reddit").split(",") if s.strip()
+]
+TICK = int(os.getenv("AETHER_INGEST_TICK", "60"))
+
+# the same upstream calls handle_intent makes, minus the fetch cache
+FETCHERS = {
+    "news": lambda topic: fetch_news.uncached(topic, max_articles=30),
+    "reddit": lambda topic: fetch_reddit_posts.uncached(topic, refine=False),
+    "youtube": lambda topic: fetch_youtube_videos.uncached(topic),
+}
+
+
+def load_watchlist():
+    """AETHER_WATCHLIST (comma-separated) wins, then the watchlist file, then the defaults."""
+    raw = os.getenv("AETHER_WATCHLIST")
+    if raw is None and os.path.exists(WATCHLIST_FILE):
+        with open(WATCHLIST_FILE, "r", encoding="utf-8") as f:
+            topics = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        return list(dict.fromkeys(topics))
+    return list(dict.fromkeys(t.strip() for t in (raw or DEFAULT_WATCHLIST).split(",") if t.strip()))
+
+
+class IngestDaemon:
+    def __init__(self, store=None, watchlist=None, sources=None):
+        self.store = store or get_store()
+        if self.store is None:
+            raise RuntimeError("Article store is disabled (AETHER_STORE=0) — nothing to ingest into")
+        self.watchlist = watchlist if watchlist is not None else load_watchlist()
+        self.sources = sources or SOURCES
+        self._last_run = {}  # (topic, source) → monotonic time of last refresh
+        self._dirty = set()  # engines updated since the last save
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        print("🛑 Ingest daemon stopping...")
+        self._stop.set()
+
+    def _due(self, source):
+        """Watchlist topics past their interval, then recently requested ones."""
+        interval = INTERVALS.get(source, 900)
+        now = time.monotonic()
+        due = [
+            t for t in self.watchlist
+            if now - self._last_run.get((t, source), float("-inf")) >= interval
+        ]
+        requested = []
+        if source in REQUESTED_SOURCES:
+            requested = self.store.topics_due(source, interval, REQUESTED_WINDOW)[:MAX_REQUESTED_PER_PASS]
+        return list(dict.fromkeys(due + requested))
+
+    def refresh(self, topic, source) -> int:
+        start = time.perf_counter()
+        try:
+            items = FETCHERS[source](topic) or []
+            written = self.store.upsert(items)
+            self.store.touch_topic(topic, source, refreshed=True)
+        except Exception as e:
+            print(f"⚠️ Ingest {source} '{topic}' failed: {e}")
+            return 0
+        finally:
+            self._last_run[(topic, source)] = time.monotonic()
+        print(f"📥 {source}: {written} items for '{topic}' in {time.perf_counter() - start:.1f}s")
+        self._update_models(topic, items)
+        return written
+
+    def _update_models(self, topic, items):
+        """Stream the new items into the topic's clusters and trend counts (and the global ones)."""
+        texts = [f"{item.get('title', '')} {item.get('description', '')}" for item in items]
+        try:
+            for name in (topic, "all"):
+                if topic_engine.ingest(name, texts, save=False):
+                    self._dirty.add((topic_engine, name))
+        except Exception as e:
+            print(f"⚠️ Topic update for '{topic}' failed: {e}")
+        try:
+            for name in (topic, "all"):
+                if trend_engine.ingest(name, items, save=False):
+                    self._dirty.add((trend_engine, name))
+        except Exception as e:
+            print(f"⚠️ Trend update for '{topic}' failed: {e}")
+
+    def _save_models(self):
+        """One save per updated engine per pass — not one per fetch (web workers reload on every save)."""
+        while self._dirty:
+            engine_module, name = self._dirty.pop()
+            try:
+                engine_module.persist(name)
+            except Exception as e:
+                print(f"⚠️ Saving {engine_module.__name__.rsplit('.', 1)[-1]} '{name}' failed: {e}")
+
+    def run_once(self) -> int:
+        total = 0
+        try:
+            for source in self.sources:
+                for topic in self._due(source):
+                    if self._stop.is_set():
+                        return total
+                    total += self.refresh(topic, source)
+        finally:
+            self._save_models()
+        pruned = self.store.prune()
+        if pruned:
+            print(f"🧹 Pruned {pruned} expired items")
+        return total
+
+    def run_forever(self):
+        print(f"🛰️ Ingest daemon watching {len(self.watchlist)} topics on {', '.join(self.sources)}")
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(TICK)
+        print(f"✅ Ingest daemon stopped — store: {self.store.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aether background ingestion worker")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    args = parser.parse_args()
+
+    daemon = IngestDaemon()
+    if args.once:
+        print(f"✅ Ingested {daemon.run_once()} items — store: {daemon.store.stats()}")
+        return
+
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.run_forever()
+
+
+if __name__ == "__main__":
+    main()
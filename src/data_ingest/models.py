@@ -0,0 +1,149 @@
+# === models.py ===
+# Compact slotted item types shared by the fetchers, scoring and the web layer
+
+import time
+from datetime import datetime, timezone
+
+
+def _hours_ago(ts: float, now: float = None) -> int:
+    return max(1, int(((now or time.time()) - ts) // 3600))
+
+
+class Item:
+    """
+    Base for NewsItem / RedditPost / YouTubeVideo.
+
+    Keeps a numeric `ts` (epoch seconds) so scoring and sorting never reparse
+    dates; display strings are derived lazily. Supports dict-style access
+    (item["title"], item.get(...), "views" in item) so existing callers work.
+    """
+
+    __slots__ = ("title", "url", "ts", "score", "_published")
+
+    source_type = ""
+    FIELDS = ()  # public keys, in JSON order
+
+    def __init__(self, title="", url="", ts=0.0):
+        self.title = title
+        self.url = url
+        self.ts = float(ts or 0.0)
+        self.score = None
+        self._published = None
+
+    # --- lazily computed display fields ---
+    @property
+    def published_dt(self) -> datetime:
+        return datetime.fromtimestamp(self.ts, tz=timezone.utc)
+
+    @property
+    def hours_ago(self) -> int:
+        return _hours_ago(self.ts)
+
+    @property
+    def published(self) -> str:
+        if self._published is None:
+            hours = self.hours_ago
+            self._published = f"{hours}h ago" if hours < 24 else self.published_dt.strftime("%Y-%m-%d")
+        return self._published
+
+    # --- dict compatibility ---
+    def _key(self, key):
+        return "score" if key == "_score" else key
+
+    def __contains__(self, key):
+        return key in self.FIELDS or (key == "_score" and self.score is not None)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, self._key(key))
+
+    def __setitem__(self, key, value):
+        if key != "_score" and key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, self._key(key), value)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return list(self.FIELDS) + (["_score"] if self.score is not None else [])
+
+    def to_dict(self) -> dict:
+        out = {"source_type": self.source_type}
+        for k in self.FIELDS:
+            if k != "source_type":
+                out[k] = getattr(self, k)
+        if self.score is not None:
+            out["_score"] = self.score
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.title[:40]!r})"
+
+
+class NewsItem(Item):
+    __slots__ = ("source", "description", "author")
+
+    source_type = "news"
+    FIELDS = ("source_type", "source", "title", "description", "url", "publishedAt", "published", "author")
+
+    def __init__(self, title="", url="", ts=0.0, source="Unknown", description="", author=""):
+        super().__init__(title, url, ts)
+        self.source = source
+        self.description = description
+        self.author = author
+
+    @property
+    def publishedAt(self) -> datetime:
+        return self.published_dt
+
+    @property
+    def published(self) -> str:
+        # news keeps its own wording ("5 hrs ago")
+        if self._published is None:
+            hours = int((time.time() - self.ts) // 3600)
+            self._published = f"{hours} hrs ago" if hours < 24 else self.published_dt.strftime("%Y-%m-%d")
+        return self._published
+
+    def to_dict(self) -> dict:
+        out = super().to_dict()
+        out["publishedAt"] = self.published_dt.isoformat()
+        return out
+
+
+class RedditPost(Item):
+    __slots__ = ("subreddit", "upvotes", "comments")
+
+    source_type = "reddit"
+    FIELDS = ("source_type", "title", "url", "subreddit", "upvotes", "comments", "published")
+
+    def __init__(self, title="", url="", ts=0.0, subreddit="", upvotes=0, comments=0):
+        super().__init__(title, url, ts)
+        self.subreddit = subreddit
+        self.upvotes = upvotes
+        self.comments = comments
+
+
+class YouTubeVideo(Item):
+    __slots__ = ("channel", "views")
+
+    source_type = "youtube"
+    FIELDS = ("source_type", "title", "channel", "published", "views", "url")
+
+    def __init__(self, title="", url="", ts=0.0, channel="", views=0):
+        super().__init__(title, url, ts)
+        self.channel = channel
+        self.views = views
+
+
+# -------------------------
+# JSON
+# -------------------------
+def json_default(o):
+    """`default=` hook for json.dumps / Flask's provider: items → plain dicts."""
+    if isinstance(o, Item):
+        return o.to_dict()
+    if isinstance(o, datetime):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
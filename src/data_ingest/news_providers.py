@@ -0,0 +1,252 @@
+# === news_providers.py ===
+# Pluggable news backends (NewsAPI, GNews, offline fake) for the news federation
+
+import hashlib
+import os
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+from src.core import transport
+from src.data_ingest.models import NewsItem
+
+load_dotenv()
+
+NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
+
+# sources whose articles skip the topic-match filter on NewsAPI
+TRUSTED_SOURCES = ("times of india", "indian express", "bbc", "reuters", "ndtv", "hindustan times")
+
+
+class ProviderError(Exception):
+    """Upstream answered, but not with usable results (HTTP error, rate limit, bad payload)."""
+
+
+# ------------------------
+# helpers
+# ------------------------
+def _clean_author(raw_author, source_name):
+    if not raw_author or str(raw_author).lower() in ("nan", "none", "null", ""):
+        return source_name or "News Desk"
+    a = str(raw_author)
+    a = re.sub(r"http\S+|www\.\S+", "", a)
+    a = re.sub(r"^by\s+", "", a, flags=re.I)
+    a = a.split(",")[0].strip()
+        # allow Hindi / international characters
+    a = re.sub(r"[^\w\s@\.]", "", a, flags=re.UNICODE).strip()
+
+    # if email-like
+    if "@" in a:
+        name = a.split("@")[0].replace(".", " ").title()
+        return name if len(name) >= 3 else (source_name or "News Desk")
+    # drop common role words
+    for w in ["contributor", "staff writer", "editor", "reporter", "tech desk"]:
+        a = re.sub(w, "", a, flags=re.I).strip()
+    return a if len(a) >= 2 else (source_name or "News Desk")
+
+
+def _is_garbage_title(t):
+    if not t:
+        return True
+    t = t.strip().lower()
+    if re.search(r'\b\d+(\.\d+){1,3}\b', t):
+        return True
+    return len(t) < 4
+
+
+def _parse_published(raw, fallback):
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00")) if raw else fallback
+    except Exception:
+        return fallback
+
+
+# ------------------------
+# Providers
+# ------------------------
+class NewsProvider:
+    """
+    One news backend. Subclasses implement `search()`, which returns raw
+    article dicts (NewsAPI shape) and raises on any upstream failure so the
+    federation can record it against the provider's health.
+    """
+
+    name = ""
+    # identical retries are safe (read-only search) — allow a hedged duplicate
+    hedge = True
+    # trusted outlets bypass the topic-match filter
+    trust_bypass = False
+    # drop articles older than `since`
+    enforce_since = True
+
+    def enabled(self) -> bool:
+        return True
+
+    def search(self, topic, max_articles, since, timeout):
+        raise NotImplementedError
+
+    def fetch(self, topic, max_articles, since, matcher, timeout=10):
+        """search() + the shared filtering/normalisation into NewsItem."""
+        out = []
+        for art in self.search(topic, max_articles, since, timeout):
+            title = art.get("title") or ""
+            desc = art.get("description") or ""
+            author = art.get("author") or ""
+            source_name = (art.get("source") or {}).get("name")
+
+            if _is_garbage_title(title):
+                continue
+
+            if not matcher.matches(f"{title} {desc} {author}"):
+                trusted = (source_name or "").lower()
+                if not (self.trust_bypass and any(t in trusted for t in TRUSTED_SOURCES)):
+                    continue
+
+            published_dt = _parse_published(art.get("publishedAt"), since)
+            # skip too old
+            if self.enforce_since and published_dt < since:
+                continue
+
+            out.append(NewsItem(
+                source=source_name or "Unknown",
+                title=title.strip(),
+                description=desc.strip() if desc else "",
+                url=art.get("url"),
+                ts=published_dt.timestamp(),
+                author=_clean_author(author, source_name),
+            ))
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class NewsAPIProvider(NewsProvider):
+    name = "newsapi"
+    trust_bypass = True
+    url = "https://newsapi.org/v2/everything"
+
+    def enabled(self):
+        return bool(NEWS_API_KEY)
+
+    def search(self, topic, max_articles, since, timeout):
+        params = {
+            "q": topic,
+            "searchIn": "title,description",
+            "language": "en",
+            "sortBy": "relevancy",
+            "pageSize": max_articles,
+            "from": since.strftime("%Y-%m-%d"),
+            "apiKey": NEWS_API_KEY,
+        }
+        r = transport.get(self.url, params=params, timeout=timeout)
+        print(f"🛰️ NewsAPI HTTP {r.status_code} for '{topic}'")
+        data = r.json()
+        if r.status_code != 200 or data.get("status") != "ok":
+            raise ProviderError(f"NewsAPI HTTP {r.status_code}: {data.get('code') or data.get('message', '')}")
+        return data.get("articles", [])
+
+
+class GNewsProvider(NewsProvider):
+    name = "gnews"
+    enforce_since = False
+    url = "https://gnews.io/api/v4/search"
+
+    def enabled(self):
+        return bool(GNEWS_API_KEY)
+
+    def search(self, topic, max_articles, since, timeout):
+        params = {
+            "q": topic,
+            "lang": "en",
+            "max": max_articles,
+            "token": GNEWS_API_KEY,
+        }
+        r = transport.get(self.url, params=params, timeout=timeout)
+        data = r.json()
+        if r.status_code != 200:
+            raise ProviderError(f"GNews HTTP {r.status_code}: {data.get('errors', '')}")
+        return data.get("articles", [])
+
+
+_FAKE_WORDS = (
+    "regulators investors startups earnings launch lawsuit record shortage demand supply "
+    "europe india china rally slump merger partnership outage security breakthrough delay "
+    "forecast ban subsidy factory talent layoffs funding chips cloud energy"
+).split()
+
+
+class FakeNewsProvider(NewsProvider):
+    """
+    Offline provider for local runs and benchmarks. Latency is drawn from
+    `latency ± jitter`, with a `slow_rate` chance of a `slow_latency` tail,
+    and an `error_rate` chance of raising. Articles are deterministic per
+    (provider, topic), and `overlap` of them share URLs with other fakes so
+    dedupe has something to do.
+    """
+
+    def __init__(self, name="fake", latency=0.15, jitter=0.05, slow_rate=0.0, slow_latency=3.0,
+                 error_rate=0.0, overlap=0.3, seed=None):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.overlap = overlap
+        self._rng = random.Random(seed)
+
+    def search(self, topic, max_articles, since, timeout):
+        delay = self.slow_latency if self._rng.random() < self.slow_rate else self.latency
+        delay = max(0.0, delay + self._rng.uniform(-self.jitter, self.jitter))
+        time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise ProviderError(f"{self.name} timed out after {timeout:.1f}s")
+        if self._rng.random() < self.error_rate:
+            raise ProviderError(f"{self.name} HTTP 503")
+
+        now = datetime.now(timezone.utc)
+        articles = []
+        for i in range(max_articles):
+            shared = i < int(max_articles * self.overlap)
+            slug = hashlib.md5(f"{'shared' if shared else self.name}:{topic}:{i}".encode()).hexdigest()[:10]
+            words = random.Random(slug).sample(_FAKE_WORDS, 6)
+            articles.append({
+                "source": {"name": "Shared Wire" if shared else f"{self.name.title()} Daily"},
+                "title": f"{topic.title()}: {' '.join(words)}",
+                "description": f"Coverage of {topic} from {self.name}, story {i + 1}.",
+                "url": f"https://{'wire' if shared else self.name}.example.com/{slug}",
+                "publishedAt": (now - timedelta(hours=i + 1)).isoformat(),
+                "author": f"{self.name} desk",
+            })
+        return articles
+
+
+# ------------------------
+# Registry
+# ------------------------
+PROVIDER_FACTORIES = {
+    "newsapi": NewsAPIProvider,
+    "gnews": GNewsProvider,
+    "fake": FakeNewsProvider,
+}
+
+# comma-separated, e.g. "newsapi,gnews" (default) or "fake" for offline runs
+ENABLED_PROVIDERS = [
+    p.strip() for p in os.getenv("AETHER_NEWS_PROVIDERS", "newsapi,gnews").split(",") if p.strip()
+]
+
+
+def default_providers():
+    providers = []
+    for name in ENABLED_PROVIDERS:
+        factory = PROVIDER_FACTORIES.get(name)
+        if factory is None:
+            print(f"⚠️ Unknown news provider '{name}' — skipping")
+            continue
+        providers.append(factory())
+    return providers
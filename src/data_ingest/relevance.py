@@ -0,0 +1,89 @@
+# === relevance.py ===
+# One precompiled topic matcher shared by the news, Reddit and YouTube fetchers
+
+import functools
+import re
+
+_WORD = re.compile(r"\w+")
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]")
+
+
+class RelevancePolicy:
+    """
+    How strict a source is about topic matches.
+    - min_hits: topic words that must appear (substring match) in the text
+    - multiword_min_hits: same, when the topic has 2+ words
+    - proximity_window: two different topic words within this many tokens also count
+    - fuzzy: accept the whole phrase, or its stem as a word prefix ("ai chip" → "ai chips")
+    """
+
+    __slots__ = ("name", "min_hits", "multiword_min_hits", "proximity_window", "fuzzy")
+
+    def __init__(self, name, min_hits=1, multiword_min_hits=1, proximity_window=7, fuzzy=False):
+        self.name = name
+        self.min_hits = min_hits
+        self.multiword_min_hits = multiword_min_hits
+        self.proximity_window = proximity_window
+        self.fuzzy = fuzzy
+
+
+NEWS_POLICY = RelevancePolicy("news")
+REDDIT_POLICY = RelevancePolicy("reddit", multiword_min_hits=2, fuzzy=True)
+YOUTUBE_POLICY = RelevancePolicy("youtube", multiword_min_hits=2, fuzzy=True)
+
+
+class RelevanceMatcher:
+    """Everything derived from the topic is built once, then reused per item."""
+
+    def __init__(self, topic: str, policy: RelevancePolicy):
+        self.policy = policy
+        self.topic = (topic or "").lower()
+        self.words = tuple(_WORD.findall(self.topic))
+        self.word_set = frozenset(self.words)
+        multiword = len(self.words) >= 2
+        self.required_hits = policy.multiword_min_hits if multiword else policy.min_hits
+        self.prefix_re = (
+            re.compile(rf"\b{re.escape(self.topic[:-1])}\w*\b") if policy.fuzzy and self.topic else None
+        )
+
+    def matches(self, text: str) -> bool:
+        if not text or not self.words:
+            return False
+        text = text.lower()
+
+        hits = sum(1 for w in self.words if w in text)
+        if hits >= self.required_hits:
+            return True
+
+        if self.policy.fuzzy and (
+            hits >= 1 or self.topic in text or self.prefix_re.search(text)
+        ):
+            return True
+
+        return self._near_each_other(text)
+
+    def _near_each_other(self, text: str) -> bool:
+        """Two different topic words within the policy's token window."""
+        window = self.policy.proximity_window
+        if not window or len(self.word_set) < 2:
+            return False
+        # positional index of topic words only, built in one pass
+        positions = [
+            (i, tok) for i, tok in enumerate(_NON_ALNUM.sub(" ", text).split()) if tok in self.word_set
+        ]
+        for k, (i, a) in enumerate(positions):
+            for j, b in positions[k + 1:]:
+                if j - i >= window:
+                    break
+                if b != a:
+                    return True
+        return False
+
+    def filter(self, items, text_fn):
+        """Keep the items whose text (via `text_fn(item)`) matches, in one pass."""
+        return [item for item in items if self.matches(text_fn(item))]
+
+
+@functools.lru_cache(maxsize=256)
+def get_matcher(topic: str, policy: RelevancePolicy) -> RelevanceMatcher:
+    return RelevanceMatcher(topic, policy)
@@ -0,0 +1,83 @@
+# === variants.py ===
+# Concurrent query-variant executor for the Reddit and YouTube fetchers
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Max in-flight upstream calls per provider, across all requests in this worker.
+# YouTube stays low: every search costs 100 quota units.
+PROVIDER_CONCURRENCY = {
+    "reddit": int(os.getenv("AETHER_REDDIT_CONCURRENCY", "4")),
+    "youtube": int(os.getenv("AETHER_YOUTUBE_CONCURRENCY", "2")),
+}
+DEFAULT_BUDGET = float(os.getenv("AETHER_VARIANT_BUDGET", "12"))
+
+_semaphores = {name: threading.BoundedSemaphore(n) for name, n in PROVIDER_CONCURRENCY.items()}
+_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AETHER_VARIANT_WORKERS", "12")),
+    thread_name_prefix="aether-variants",
+)
+
+
+def _limited(provider, fn, variant):
+    sem = _semaphores.get(provider)
+    if sem is None:
+        return fn(variant)
+    with sem:
+        return fn(variant)
+
+
+def run_variants(provider, variants, fetch_one, enough, budget=DEFAULT_BUDGET):
+    """
+    Run `fetch_one(variant) -> list` for every variant, at most the provider's
+    concurrency cap at a time, and stop early once `enough(results)` holds or
+    the time budget runs out. Results are concatenated in variant order, so
+    the primary variant still ranks first.
+    """
+    variants = list(variants)
+    window = max(1, PROVIDER_CONCURRENCY.get(provider, len(variants)))
+    deadline = time.monotonic() + budget
+
+    results = {}
+    pending = {}
+    next_idx = 0
+
+    def _collected():
+        return [x for i in sorted(results) for x in results[i]]
+
+    def _launch():
+        nonlocal next_idx
+        while next_idx < len(variants) and len(pending) < window:
+            ctx = contextvars.copy_context()  # keeps the request's cancel token
+            fut = _pool.submit(ctx.run, _limited, provider, fetch_one, variants[next_idx])
+            pending[fut] = next_idx
+            next_idx += 1
+
+    _launch()
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"⏱️ {provider}: variant budget ({budget:.0f}s) spent — using {len(results)} of {len(variants)}")
+            break
+
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            idx = pending.pop(fut)
+            try:
+                results[idx] = fut.result() or []
+            except Exception as e:
+                print(f"⚠️ {provider} variant '{variants[idx]}' failed: {e}")
+                results[idx] = []
+
+        if enough(_collected()):
+            break
+        _launch()
+
+    # anything still queued is no longer needed
+    for fut in pending:
+        fut.cancel()
+
+    return _collected()
@@ -0,0 +1,168 @@
+# === prompt_builder.py ===
+# Chat prompts from the active tone only, local token counting, per-intent budgets and usage logs
+
+import math
+import os
+import re
+import threading
+
+from src.core.persona_prompt import PERSONALITY_MODES
+
+# -------------------------
+# Tokenizer
+# -------------------------
+# gpt-4o family encoding; tiktoken is optional — without it a close estimate is used
+ENCODING = os.getenv("AETHER_TOKEN_ENCODING", "o200k_base")
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding(ENCODING)
+except Exception:
+    _encoding = None
+
+# roughly the BPE pre-split: words (with a leading space), digit runs, punctuation runs
+_PIECES = re.compile(r" ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+# chat format overhead (OpenAI cookbook): per message, plus priming the reply
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+def count_tokens(text) -> int:
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # common English words are one token; longer/rarer ones split about every 4 chars
+    return sum(1 if len(p) <= 6 else math.ceil(len(p.strip()) / 4) for p in _PIECES.findall(text))
+
+
+def truncate_to_tokens(text, limit) -> str:
+    """Keep the head of `text` within `limit` tokens (marked with an ellipsis when cut)."""
+    if count_tokens(text) <= limit:
+        return text
+    limit = max(limit - 1, 0)
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text, disallowed_special=())[:limit]) + "…"
+    kept, used = [], 0
+    for piece in _PIECES.findall(text):
+        cost = count_tokens(piece)
+        if used + cost > limit:
+            break
+        kept.append(piece)
+        used += cost
+    return "".join(kept).rstrip() + "…"
+
+
+def count_message_tokens(messages) -> int:
+    return sum(TOKENS_PER_MESSAGE + count_tokens(m["content"]) for m in messages) + TOKENS_PER_REPLY
+
+
+# -------------------------
+# Budgets
+# -------------------------
+class TokenBudget:
+    """Most prompt tokens an intent may send, and the max_tokens it asks for."""
+
+    __slots__ = ("name", "input", "output")
+
+    def __init__(self, name, input, output):
+        self.name = name
+        self.input = input
+        self.output = output
+
+
+INTENT_BUDGETS = {
+    # 1–2 paragraphs need ~250 tokens; the rest is headroom before the model would be cut off
+    "chat": TokenBudget("chat", input=int(os.getenv("AETHER_CHAT_INPUT_TOKENS", "1000")),
+                        output=int(os.getenv("AETHER_CHAT_OUTPUT_TOKENS", "350"))),
+    # "summarize that" carries the whole previous reply; two lines come back
+    "summary": TokenBudget("summary", input=int(os.getenv("AETHER_SUMMARY_INPUT_TOKENS", "1500")),
+                           output=int(os.getenv("AETHER_SUMMARY_OUTPUT_TOKENS", "120"))),
+}
+DEFAULT_BUDGET = INTENT_BUDGETS["chat"]
+
+INTENT_INSTRUCTIONS = {
+    "chat": "Respond naturally in 1–2 short paragraphs. Avoid disclaimers and system-style text.",
+    "summary": "Follow the user's summarizing instruction exactly. No preamble.",
+}
+
+
+class PromptPlan:
+    """Messages ready to send plus what they cost locally (for budget checks + usage logs)."""
+
+    __slots__ = ("intent", "tone", "messages", "input_tokens", "max_tokens", "truncated")
+
+    def __init__(self, intent, tone, messages, input_tokens, max_tokens, truncated):
+        self.intent = intent
+        self.tone = tone
+        self.messages = messages
+        self.input_tokens = input_tokens
+        self.max_tokens = max_tokens
+        self.truncated = truncated
+
+
+def system_prompt(intent, tone) -> str:
+    """Only the active tone's instructions — not the rules of every tone."""
+    style = PERSONALITY_MODES.get(tone) or PERSONALITY_MODES["neutral"]
+    instruction = INTENT_INSTRUCTIONS.get(intent, INTENT_INSTRUCTIONS["chat"])
+    return f"You are Aether — a helpful, human-like AI companion. {style}\n{instruction}"
+
+
+def build_messages(intent, tone, user_input) -> PromptPlan:
+    """
+    System prompt for (intent, tone) + the user's message, with the message
+    cut to whatever the intent's input budget leaves after the system prompt.
+    """
+    budget = INTENT_BUDGETS.get(intent, DEFAULT_BUDGET)
+    system = system_prompt(intent, tone)
+    user = (user_input or "").strip()
+    if intent != "summary":
+        user = f"User said: {user}"
+
+    fixed = count_message_tokens([{"content": system}, {"content": ""}])
+    room = max(budget.input - fixed, 32)
+    compact = truncate_to_tokens(user, room)
+    truncated = compact != user
+    if truncated:
+        print(f"✂️ Prompt over the {budget.name} budget — message cut to {room} tokens")
+
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": compact},
+    ]
+    return PromptPlan(intent, tone, messages, count_message_tokens(messages), budget.output, truncated)
+
+
+# -------------------------
+# Usage log
+# -------------------------
+_usage = {}
+_usage_lock = threading.Lock()
+
+
+def log_usage(intent, tone, estimated_prompt=None, usage=None, completion_text=None, max_tokens=None):
+    """
+    Record one call's tokens. `usage` is OpenAI's {"prompt_tokens", "completion_tokens"};
+    without it (errors, aborted streams) the local counts stand in.
+    """
+    usage = usage or {}
+    prompt = usage.get("prompt_tokens", estimated_prompt or 0)
+    completion = usage.get("completion_tokens", count_tokens(completion_text))
+    budget = f" / {max_tokens}" if max_tokens else ""
+    estimate = f" (est {estimated_prompt})" if estimated_prompt is not None and "prompt_tokens" in usage else ""
+    print(f"🧮 Tokens [{intent}/{tone}]: prompt {prompt}{estimate} + completion {completion}{budget}")
+
+    with _usage_lock:
+        totals = _usage.setdefault(intent, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0})
+        totals["requests"] += 1
+        totals["prompt_tokens"] += prompt
+        totals["completion_tokens"] += completion
+
+
+def usage_summary() -> dict:
+    """Per-intent totals for this worker, with the average prompt size."""
+    with _usage_lock:
+        return {
+            intent: {**t, "avg_prompt_tokens": round(t["prompt_tokens"] / t["requests"], 1)}
+            for intent, t in _usage.items()
+        }
@@ -0,0 +1,201 @@
+# === response_cache.py ===
+# Reuses LLM replies for repeated prompts: exact fingerprint tier + near-duplicate similarity tier
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from src.core.cache import CACHE_DIR, TTLCache, make_backend
+from src.core.keywords import tokenize
+
+# -------------------------
+# Config
+# -------------------------
+ENABLED = os.getenv("AETHER_LLM_CACHE", "1") not in ("0", "false", "off")
+# "memory" (per worker) or "sqlite" (memory in front of a file shared by all workers)
+CACHE_BACKEND = os.getenv("AETHER_LLM_CACHE_BACKEND", "memory").lower()
+CACHE_DB_PATH = os.getenv("AETHER_LLM_CACHE_DB", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+TTL = int(os.getenv("AETHER_LLM_CACHE_TTL", str(6 * 3600)))
+MAX_ENTRIES = int(os.getenv("AETHER_LLM_CACHE_MAX_ENTRIES", "2000"))
+
+# near-duplicate tier: prompts that only differ in request phrasing ("can you…",
+# "please"), plurals or a one-letter typo reuse a reply. Short prompts only — two
+# long "summarize: <text>" prompts are different texts however similar they look.
+SIMILAR_MAX_CHARS = 200
+# a typo is one substituted letter in a word this long or longer: anything looser
+# swaps entities (niger/nigeria, ronaldo/ronaldinho, messi/messy, trump/trumpet)
+TYPO_MIN_LEN = 6
+PARTITION_MAX_ENTRIES = 256  # indexed prompts per (tone, intent)
+
+_PUNCT = re.compile(r"^[^\w]+$")
+# phrasing that never changes what is being asked
+_FILLER = frozenset(
+    "please pls plz kindly can could would you u me tell hey hi aether so just simply briefly quickly "
+    "quick a an the i want wanna to know".split()
+)
+_CONTRACTIONS = {"what's": "what is", "whats": "what is", "who's": "who is", "how's": "how is",
+                 "it's": "it is", "that's": "that is", "where's": "where is"}
+# never dropped, never fuzzy-matched: "is 5 …" ≠ "is 6 …", "not" flips the question
+_NEGATIONS = frozenset("not no never don't doesn't isn't aren't won't can't without".split())
+
+
+def normalize_prompt(text) -> str:
+    """Lowercase words only — casing, spacing and punctuation don't change the answer."""
+    return " ".join(t for t in tokenize(text) if not _PUNCT.match(t))
+
+
+def fingerprint(intent, tone, text) -> str:
+    norm = normalize_prompt(text)
+    digest = hashlib.blake2b(norm.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{tone}|{intent}|{digest}"
+
+
+def _exact_token(tok) -> bool:
+    return tok in _NEGATIONS or any(c.isdigit() for c in tok)
+
+
+def canonical_tokens(norm) -> tuple:
+    """Content tokens of a normalized prompt: contractions expanded, filler dropped, plurals singular."""
+    out = []
+    for tok in " ".join(_CONTRACTIONS.get(t, t) for t in norm.split()).split():
+        if tok in _FILLER:
+            continue
+        if not _exact_token(tok) and len(tok) > 3 and tok.endswith("s") and not tok.endswith(("ss", "us", "is")):
+            tok = tok[:-1]
+        out.append(tok)
+    return tuple(out)
+
+
+def _tokens_close(a, b) -> bool:
+    if a == b:
+        return True
+    if _exact_token(a) or _exact_token(b) or len(a) != len(b) or len(a) < TYPO_MIN_LEN:
+        return False
+    return sum(x != y for x, y in zip(a, b)) == 1
+
+
+class _Partition:
+    """Recent prompts of one (tone, intent): canonical tokens → exact-tier key, LRU-capped."""
+
+    def __init__(self):
+        self.entries = OrderedDict()  # canonical tokens → (key, stored_at)
+
+    def add(self, tokens, key, stored_at):
+        self.entries[tokens] = (key, stored_at)
+        self.entries.move_to_end(tokens)
+        while len(self.entries) > PARTITION_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+
+    def nearest(self, tokens, min_stored_at):
+        """Key of a cached prompt with the same content tokens (or one letter off in a long word), or None."""
+        entry = self.entries.get(tokens)
+        if entry is None:
+            # typo pass: same tokens except one, and that one a single letter off
+            for other, candidate in reversed(self.entries.items()):
+                if len(other) != len(tokens):
+                    continue
+                diff = [(a, b) for a, b in zip(tokens, other) if a != b]
+                if len(diff) == 1 and _tokens_close(*diff[0]):
+                    entry = candidate
+                    break
+        if entry is None or entry[1] < min_stored_at:
+            return None
+        return entry[0]
+
+
+class ResponseCache:
+    """
+    Exact tier: (tone, intent, normalized prompt) fingerprint → reply in a
+    TTL + size-bounded cache (concurrent misses on one fingerprint share a
+    single LLM call). Near-duplicate tier: per-(tone, intent) index of
+    recent short prompts by content tokens; a match reuses the reply its
+    exact-tier key points to.
+    """
+
+    def __init__(self, backend=None, ttl=TTL):
+        self.ttl = ttl
+        self.cache = TTLCache(backend or make_backend(CACHE_BACKEND, CACHE_DB_PATH, MAX_ENTRIES))
+        self._partitions = {}
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "stores": 0}
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def _similar(self, intent, tone, norm):
+        tokens = canonical_tokens(norm)
+        if len(norm) > SIMILAR_MAX_CHARS or not tokens:
+            return None
+        with self._lock:
+            part = self._partitions.get((tone, intent))
+            key = part.nearest(tokens, time.time() - self.ttl) if part else None
+        if key is None:
+            return None
+        reply = self.cache.get(key, self.ttl)
+        if reply:
+            print(f"♻️ Reusing cached reply for a near-duplicate prompt: '{norm}'")
+        return reply
+
+    def lookup(self, intent, tone, text):
+        """(reply, "exact" | "similar") or (None, None)."""
+        if not ENABLED:
+            return None, None
+        reply = self.cache.get(fingerprint(intent, tone, text), self.ttl)
+        if reply:
+            self.stats["exact_hits"] += 1
+            return reply, "exact"
+        reply = self._similar(intent, tone, normalize_prompt(text))
+        if reply:
+            self.stats["similar_hits"] += 1
+            return reply, "similar"
+        return None, None
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def _index(self, intent, tone, key, norm):
+        tokens = canonical_tokens(norm)
+        if len(norm) > SIMILAR_MAX_CHARS or not tokens:
+            return
+        with self._lock:
+            self._partitions.setdefault((tone, intent), _Partition()).add(tokens, key, time.time())
+
+    def store(self, intent, tone, text, reply):
+        if not ENABLED or not reply:
+            return
+        key = fingerprint(intent, tone, text)
+        self.cache.set(key, reply)
+        self._index(intent, tone, key, normalize_prompt(text))
+        self.stats["stores"] += 1
+
+    def get_or_load(self, intent, tone, text, loader):
+        """
+        Cached reply, or `loader()` (the LLM call) on a miss. Loader errors
+        propagate and are never cached; neither are empty replies.
+        """
+        reply, _ = self.lookup(intent, tone, text)
+        if reply:
+            return reply
+        self.stats["misses"] += 1
+        if not ENABLED:
+            return loader()
+
+        key = fingerprint(intent, tone, text)
+        reply = self.cache.get_or_load(key, loader, self.ttl)
+        if reply:
+            self._index(intent, tone, key, normalize_prompt(text))
+            self.stats["stores"] += 1
+        return reply
+
+    def summary(self) -> dict:
+        hits = self.stats["exact_hits"] + self.stats["similar_hits"]
+        lookups = hits + self.stats["misses"]
+        with self._lock:
+            indexed = {f"{tone}/{intent}": len(p.entries) for (tone, intent), p in self._partitions.items()}
+        return {**self.stats, "hit_rate": round(hits / lookups, 3) if lookups else 0.0, "indexed": indexed}
+
+
+response_cache = ResponseCache()
@@ -2,7 +2,12 @@
 # Handles LLM replies and tone detection for Aether
 
 import os
-import httpx
+import re
+import json
+from src.core import keywords, transport
+from src.core.cache import CACHE_DIR, TTLCache, make_backend
+from src.llm.prompt_builder import build_messages, log_usage
+from src.llm.response_cache import response_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,6 +15,37 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 
+# ---------------------------------------------------------
+# 🧱 Chat prompt (shared by blocking + streaming generation)
+# ---------------------------------------------------------
+# built per (intent, tone) in prompt_builder.py — only the active tone's instructions
+
+
+def _complete(plan):
+    """One blocking chat completion → reply text (raises on transport / API errors)."""
+    response = transport.post(
+        "https://api.openai.com/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        json={
+            "model": "gpt-4o-mini",
+            "messages": plan.messages,
+            "temperature": 0.8,
+            "max_tokens": plan.max_tokens,
+        },
+        timeout=50.0,
+    )
+
+    data = response.json()
+    print("🔥 RAW OPENAI RESPONSE:", data)  # <— DEBUG HERE
+
+    reply = data["choices"][0]["message"].get("content", "").strip()
+    log_usage(plan.intent, plan.tone, plan.input_tokens, data.get("usage"), reply, plan.max_tokens)
+    return reply
+
+
 # ---------------------------------------------------------
 # 🔹 MAIN LLM RESPONSE GENERATOR (supports resume)
 # ---------------------------------------------------------
@@ -48,54 +84,11 @@ def generate_llm_response(
             ],
         }
 
-    # --- SYSTEM PROMPT ---
-    system_prompt = f"""
-You are Aether — a helpful, human-like AI companion.
-Current persona tone: {tone}
-Current intent: {intent.capitalize()}
-
-Respond naturally in 1–2 paragraphs.
-
-Tone rules:
-- sarcastic: dry humor, light mocking
-- roast: playful savage but NOT hateful
-- genz: casual TikTok Gen-Z chaos
-- dark_humor: edgy but not harmful
-- cold: emotionless, logical
-- wholesome: uplifting, soft
-- bollywood: dramatic, filmy
-- ultra_nerd: hyper technical
-- shakespeare: thee-thou poetic style
-
-Avoid disclaimers and system-style text.
-"""
-
-    user_prompt = f"User said: {user_input}\nRespond naturally in {tone} tone."
+    plan = build_messages(intent, tone, user_input)
 
     try:
-        with httpx.Client(timeout=50.0) as client:
-            response = client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": system_prompt.strip()},
-                        {"role": "user", "content": user_prompt.strip()},
-                    ],
-                    "temperature": 0.8,
-                    "max_tokens": 600,
-                },
-            )
-
-        data = response.json()
-        print("🔥 RAW OPENAI RESPONSE:", data)  # <— DEBUG HERE
-
-        reply = data["choices"][0]["message"].get("content", "").strip()
-
+        # repeated / near-duplicate prompts (incl. "summarize that" on the same text) skip OpenAI
+        reply = response_cache.get_or_load(intent, tone, user_input, lambda: _complete(plan))
     except Exception as e:
         print("❌ OPENAI ERROR:", str(e))
         reply = f"❌ OpenAI failed: {str(e)}"
@@ -109,240 +102,416 @@ Avoid disclaimers and system-style text.
     }
 
 
+# ---------------------------------------------------------
+# 🌊 STREAMING GENERATOR (token deltas as they arrive)
+# ---------------------------------------------------------
+def stream_llm_response(intent, tone, user_input, should_stop=None):
+    """
+    Yield reply text chunks from the OpenAI streaming API.
+    `should_stop` is polled between chunks; returning True closes the
+    upstream stream so OpenAI stops generating (and billing) tokens.
+    """
+    if not OPENAI_API_KEY:
+        yield "⚠️ Missing API key. Please check your .env file."
+        return
+
+    cached, _ = response_cache.lookup(intent, tone, user_input)
+    if cached:
+        yield cached
+        return
+
+    plan = build_messages(intent, tone, user_input)
+    chunks = []
+    usage = None
+    try:
+        with transport.stream(
+            "POST",
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": "gpt-4o-mini",
+                "messages": plan.messages,
+                "temperature": 0.8,
+                "max_tokens": plan.max_tokens,
+                "stream": True,
+                # the last event then carries the request's token usage
+                "stream_options": {"include_usage": True},
+            },
+            timeout=50.0,
+        ) as response:
+            for line in response.iter_lines():
+                if should_stop and should_stop():
+                    print("🛑 Stream cancelled — closing upstream connection")
+                    log_usage(intent, tone, plan.input_tokens, None, "".join(chunks), plan.max_tokens)
+                    return
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    event = json.loads(payload)
+                    usage = event.get("usage") or usage
+                    choices = event.get("choices") or []
+                    delta = choices[0]["delta"].get("content") if choices else None
+                except (ValueError, KeyError, IndexError, AttributeError):
+                    continue
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+
+    except Exception as e:
+        if should_stop and should_stop():
+            # /abort closed the connection under us — not an error
+            return
+        print("❌ OPENAI STREAM ERROR:", str(e))
+        yield f"❌ OpenAI failed: {str(e)}"
+        return
+
+    log_usage(intent, tone, plan.input_tokens, usage, "".join(chunks), plan.max_tokens)
+    # only complete replies are reused (cancelled / failed streams returned above)
+    response_cache.store(intent, tone, user_input, "".join(chunks).strip())
+
+
 # ---------------------------------------------------------
 # 🎭 TONE DETECTION — FIXED
 # ---------------------------------------------------------
-def detect_tone_change(user_message: str):
-    msg = user_message.lower().strip()
-
-    tone_map = tone_map = {
-        "casual": [
-            "casual",
-            "friendly",
-            "chill",
-            "talk normally",
-            "normal tone",
-            "simple tone",
-            "relaxed",
-            "easy going",
-        ],
-        "professional": [
-            "professional",
-            "formal",
-            "business",
-            "official",
-            "corporate",
-            "proper",
-            "structured",
-        ],
-        "comic": [
-            "comic",
-            "funny",
-            "humorous",
-            "funniest",
-            "make me laugh",
-            "be funny",
-            "joke",
-            "crack me up",
-            "fun way",
-            "make it hilarious",
-            "hilarious",
-            "tell in a funny way",
-            "comedy mode",
-            "joke mode",
-            "funny tone",
-        ],
-        "empathetic": [
-            "empathetic",
-            "kind",
-            "understanding",
-            "soft tone",
-            "be gentle",
-            "emotional",
-            "supportive",
-            "comfort me",
-            "be nice",
-            "be sweet",
-        ],
-        "creative": [
-            "creative",
-            "artistic",
-            "imaginative",
-            "fantasy",
-            "poetic",
-            "story mode",
-            "describe beautifully",
-            "use metaphors",
-            "expressive",
-        ],
-        "analytical": [
-            "analytical",
-            "logical",
-            "rational",
-            "explain logically",
-            "break it down",
-            "deep analysis",
-            "technical explanation",
-        ],
-        "professor": [
-            "professor",
-            "teacher",
-            "academic",
-            "phd",
-            "explain like teacher",
-            "explain like professor",
-            "university style",
-            "lecture mode",
-            "educational tone",
-        ],
-        "confident": [
-            "confident",
-            "assertive",
-            "bold",
-            "strong tone",
-            "dominating",
-            "commanding",
-        ],
-        "sarcastic": [
-            "sarcastic",
-            "sarcasm",
-            "be sarcastic",
-            "dry humor",
-            "mocking",
-            "deadpan tone",
-        ],
-        "roast": [
-            "roast",
-            "roast me",
-            "insult me",
-            "destroy me",
-            "burn me",
-            "funny insult",
-            "clown me",
-            "light roast",
-        ],
-        "genz": [
-            "genz",
-            "gen z",
-            "sigma",
-            "skibidi",
-            "rizz",
-            "npc talk",
-            "tiktok style",
-            "zoomery",
-            "slay",
-            "w rizz",
-            "based",
-            "gyatt",
-            "ohio",
-            "fanum tax",
-        ],
-        "dark_humor": [
-            "dark humor",
-            "dark-humor",
-            "dark jokes",
-            "edgy joke",
-            "twisted humor",
-        ],
-        "cold": [
-            "cold",
-            "emotionless",
-            "robotic",
-            "heartless",
-            "neutral tone",
-            "detached",
-            "dead inside",
-        ],
-        "wholesome": [
-            "wholesome",
-            "comforting",
-            "kind-hearted",
-            "soft",
-            "warm tone",
-            "encouraging",
-            "pure tone",
-        ],
-        "bollywood": [
-            "bollywood",
-            "dramatic",
-            "filmy",
-            "over dramatic",
-            "dramatic way",
-            "movie style",
-        ],
-        "ultra_nerd": [
-            "ultra nerd",
-            "scientific",
-            "hyper technical",
-            "nerd",
-            "nerdy",
-            "be a nerd",
-            "geek",
-            "geeky",
-            "nerdy way",
-            "talk nerdy",
-            "nerd mode",
-            "geek mode",
-            "super nerd",
-            "full nerd",
-            "math lover",
-            "space lover",
-            "astrophysics",
-            "coding nerd",
-            "explain like a scientist",
-            "go geek mode",
-            "tech nerd",
-            "engineer tone",
-            "scientific tone",
-        ],
-        "shakespeare": [
-            "shakespeare",
-            "bard",
-            "old english",
-            "elizabethan",
-            "thee thou",
-            "poetic old style",
-        ],
-    }
+TONE_KEYWORDS = {
+    "casual": [
+        "casual",
+        "friendly",
+        "chill",
+        "talk normally",
+        "normal tone",
+        "simple tone",
+        "relaxed",
+        "easy going",
+    ],
+    "professional": [
+        "professional",
+        "formal",
+        "business",
+        "official",
+        "corporate",
+        "proper",
+        "structured",
+    ],
+    "comic": [
+        "comic",
+        "funny",
+        "humorous",
+        "funniest",
+        "make me laugh",
+        "be funny",
+        "joke",
+        "jokes",
+        "crack me up",
+        "fun way",
+        "make it hilarious",
+        "hilarious",
+        "tell in a funny way",
+        "comedy mode",
+        "joke mode",
+        "funny tone",
+    ],
+    "empathetic": [
+        "empathetic",
+        "kind",
+        "understanding",
+        "soft tone",
+        "be gentle",
+        "emotional",
+        "supportive",
+        "comfort me",
+        "be nice",
+        "be sweet",
+    ],
+    "creative": [
+        "creative",
+        "artistic",
+        "imaginative",
+        "fantasy",
+        "poetic",
+        "story mode",
+        "describe beautifully",
+        "use metaphors",
+        "expressive",
+    ],
+    "analytical": [
+        "analytical",
+        "logical",
+        "rational",
+        "explain logically",
+        "break it down",
+        "deep analysis",
+        "technical explanation",
+    ],
+    "professor": [
+        "professor",
+        "teacher",
+        "academic",
+        "phd",
+        "explain like teacher",
+        "explain like professor",
+        "university style",
+        "lecture mode",
+        "educational tone",
+    ],
+    "confident": [
+        "confident",
+        "assertive",
+        "bold",
+        "strong tone",
+        "dominating",
+        "commanding",
+    ],
+    "sarcastic": [
+        "sarcastic",
+        "sarcasm",
+        "be sarcastic",
+        "dry humor",
+        "mocking",
+        "deadpan tone",
+    ],
+    "roast": [
+        "roast",
+        "roast me",
+        "insult me",
+        "destroy me",
+        "burn me",
+        "funny insult",
+        "clown me",
+        "light roast",
+    ],
+    "genz": [
+        "genz",
+        "gen z",
+        "sigma",
+        "skibidi",
+        "rizz",
+        "npc talk",
+        "tiktok style",
+        "zoomery",
+        "slay",
+        "w rizz",
+        "based",
+        "gyatt",
+        "ohio",
+        "fanum tax",
+    ],
+    "dark_humor": [
+        "dark humor",
+        "dark-humor",
+        "dark jokes",
+        "edgy joke",
+        "twisted humor",
+    ],
+    "cold": [
+        "cold",
+        "emotionless",
+        "robotic",
+        "heartless",
+        "neutral tone",
+        "detached",
+        "dead inside",
+    ],
+    "wholesome": [
+        "wholesome",
+        "comforting",
+        "kind-hearted",
+        "soft",
+        "warm tone",
+        "encouraging",
+        "pure tone",
+    ],
+    "bollywood": [
+        "bollywood",
+        "dramatic",
+        "filmy",
+        "over dramatic",
+        "dramatic way",
+        "movie style",
+    ],
+    "ultra_nerd": [
+        "ultra nerd",
+        "scientific",
+        "hyper technical",
+        "nerd",
+        "nerdy",
+        "be a nerd",
+        "geek",
+        "geeky",
+        "nerdy way",
+        "talk nerdy",
+        "nerd mode",
+        "geek mode",
+        "super nerd",
+        "full nerd",
+        "math lover",
+        "space lover",
+        "astrophysics",
+        "coding nerd",
+        "explain like a scientist",
+        "go geek mode",
+        "tech nerd",
+        "engineer tone",
+        "scientific tone",
+    ],
+    "shakespeare": [
+        "shakespeare",
+        "bard",
+        "old english",
+        "elizabethan",
+        "thee thou",
+        "poetic old style",
+    ],
+}
+
+# tone phrases join the shared message matcher as "tone:<name>"
+_TONE_GROUPS = tuple(f"tone:{tone}" for tone in TONE_KEYWORDS)
+for _tone, _phrases in TONE_KEYWORDS.items():
+    keywords.register(f"tone:{_tone}", _phrases)
 
-    for tone, words in tone_map.items():
-        if any(w in msg for w in words):
-            return tone
-    return None
+
+def detect_tone_change(user_message: str):
+    # first tone (in TONE_KEYWORDS order) with a whole-word phrase in the message
+    group = keywords.scan(user_message).first_of(_TONE_GROUPS)
+    return group[len("tone:"):] if group else None
 
 
 # ---------------------------------------------------------
-# 🧭 Query Refinement — unchanged
+# 🧭 Query Refinement — local rules first, cached LLM fallback
 # ---------------------------------------------------------
-def refine_search_query(raw_query: str):
-    if not OPENAI_API_KEY:
-        return raw_query
+REFINE_TTL = int(os.getenv("AETHER_REFINE_TTL", str(7 * 24 * 3600)))
+
+# persistent across restarts (small strings → SQLite is cheap)
+_refine_cache = TTLCache(
+    make_backend(
+        os.getenv("AETHER_REFINE_CACHE", "sqlite"),
+        os.getenv("AETHER_REFINE_CACHE_DB", os.path.join(CACHE_DIR, "refine_cache.sqlite3")),
+    )
+)
+
+_LEADING_FILLER = re.compile(
+    r"^(?:please\s+)?(?:(?:can|could|would)\s+you\s+)?"
+    r"(?:show\s+me|give\s+me|get\s+me|find\s+me|find|search\s+for|search|look\s+up|"
+    r"fetch|list|play|watch|i\s+want\s+to\s+see|i\s+want)\b",
+    re.I,
+)
+
+# request and source words: never part of a topic when they sit at the edge of a query
+_REQUEST_WORDS = {
+    "please", "pls", "me", "some", "any", "latest", "recent",
+    "news", "headlines", "articles", "stories", "updates",
+    "videos", "clips", "youtube", "yt", "vlogs",
+    "reddit", "posts", "threads", "discussions",
+}
+# articles and prepositions are only dropped at the edges ("news about x", not "lord of the rings")
+_EDGE_WORDS = _REQUEST_WORDS | {
+    "a", "an", "the", "about", "on", "of", "for", "regarding", "related", "to", "from", "with",
+}
+
+_QUESTION_START = re.compile(r"^(?:when|where|who|what|why|how|which|whom|whose|is|are|does|do|will|can|should)\b", re.I)
+
+# bump when the rules change, so refinements cached under the old rules are never served
+_REFINE_KEY_VERSION = "v2"
+
+
+def _strip_edges(raw: str):
+    """Words of the query with request phrasing and edge filler removed; interior words are kept."""
+    text = _LEADING_FILLER.sub("", raw.strip()).strip()
+    words = [w.rstrip(".") for w in re.findall(r"[A-Za-z0-9][\w.+#-]*", text)]
+    while words and words[0].lower() in _EDGE_WORDS:
+        words.pop(0)
+    while words and words[-1].lower() in _EDGE_WORDS:
+        words.pop()
+    return words
+
 
+def _normalize_refine_key(raw: str) -> str:
+    return " ".join(w.lower() for w in _strip_edges(raw))
+
+
+def _rule_based_refine(raw: str):
+    """
+    Cheap local refiner: strips request phrasing and filler at the edges,
+    keeps the topic. Returns None when the message is too conversational
+    to trust the rules, or when a request word sits inside the phrase
+    ("ai news today") — dropping it would change the topic's words.
+    """
+    text = raw.strip()
+    if "?" in text or _QUESTION_START.match(text):
+        return None
+
+    kept = _strip_edges(text)
+    if not kept or len(kept) > 5 or any(w.lower() in _REQUEST_WORDS for w in kept):
+        return None
+    return " ".join(kept)
+
+
+def _llm_refine(raw_query: str):
     system_prompt = "Rewrite the user input into a short, API-friendly search phrase."
 
     user_prompt = f"User query: '{raw_query}'\nReturn only the refined phrase."
 
     try:
-        with httpx.Client(timeout=8.0) as client:
-            response = client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    "max_tokens": 25,
-                    "temperature": 0.4,
-                },
-            )
+        response = transport.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "max_tokens": 25,
+                "temperature": 0.4,
+            },
+            timeout=8.0,
+        )
 
         data = response.json()
         refined = data["choices"][0]["message"]["content"]
-        return refined.strip()
-    except:
+        log_usage("refine", "-", usage=data.get("usage"), completion_text=refined, max_tokens=25)
+        return refined.strip().strip('"').strip("'") or None
+    except Exception as e:
+        print(f"⚠️ Query refinement failed: {e}")
+        return None
+
+
+def refine_search_query(raw_query: str):
+    raw = (raw_query or "").strip()
+    if not raw:
         return raw_query
+
+    # 1. exact + normalized cache keys
+    norm = _normalize_refine_key(raw)
+    cached = _refine_cache.get(f"{_REFINE_KEY_VERSION}|exact|{raw}", REFINE_TTL) or (
+        norm and _refine_cache.get(f"{_REFINE_KEY_VERSION}|norm|{norm}", REFINE_TTL)
+    )
+    if cached:
+        return cached
+
+    # 2. local rules (fast path), 3. LLM on miss — concurrent misses share one call
+    refined = _rule_based_refine(raw)
+    if not refined:
+        if not OPENAI_API_KEY:
+            return raw_query
+        refined = _refine_cache.get_or_load(
+            f"{_REFINE_KEY_VERSION}|norm|{norm or raw.lower()}", lambda: _llm_refine(raw), REFINE_TTL
+        )
+        if not refined:
+            return raw_query
+
+    _refine_cache.set(f"{_REFINE_KEY_VERSION}|exact|{raw}", refined)
+    if norm:
+        _refine_cache.set(f"{_REFINE_KEY_VERSION}|norm|{norm}", refined)
+    # refining an already-refined phrase must never cost another round trip
+    _refine_cache.set(f"{_REFINE_KEY_VERSION}|exact|{refined}", refined)
+    return refined
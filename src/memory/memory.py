@@ -1,40 +1,273 @@
+import atexit
+import contextlib
 import os
 import json
 import re
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
-MEMORY_FILE = os.path.join("data", "session_memory.json")
+try:
+    import fcntl  # cross-process locking (POSIX); without it only threads are serialized
+except ImportError:
+    fcntl = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+
+# old whole-file snapshot — imported into the journal once, then left alone
+MEMORY_FILE = os.path.join(DATA_DIR, "session_memory.json")
+# append-only JSON Lines journal shared by all workers
+JOURNAL_FILE = os.getenv("AETHER_MEMORY_JOURNAL", os.path.join(DATA_DIR, "session_memory.jsonl"))
+
+RECENT_LIMIT = 5
+# rewrite the journal as a single snapshot once it holds this many records
+COMPACT_AFTER = int(os.getenv("AETHER_MEMORY_COMPACT_AFTER", "1000"))
+# at most one fsync per interval; writes in between are coalesced
+FSYNC_INTERVAL = float(os.getenv("AETHER_MEMORY_FSYNC_INTERVAL", "1.0"))
 
 # ensure data folder exists
-os.makedirs("data", exist_ok=True)
+os.makedirs(os.path.dirname(JOURNAL_FILE) or ".", exist_ok=True)
 
 
-def load_memory():
-    """Load memory JSON if exists."""
-    if not os.path.exists(MEMORY_FILE):
-        return {"last_topic": None, "recent_queries": []}
+def _encode(record) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _new_epoch() -> str:
+    return os.urandom(8).hex()
+
+
+def _epoch_of(first_line):
+    """Epoch of a journal from its first line (None for journals written before epochs)."""
+    if not first_line.endswith(b"\n"):
+        return None
     try:
-        with open(MEMORY_FILE, "r") as f:
-            return json.load(f)
-    except Exception:
-        return {"last_topic": None, "recent_queries": []}
+        return json.loads(first_line).get("epoch")
+    except (ValueError, AttributeError):
+        return None
+
+
+class MemoryJournal:
+    """
+    Session memory as an append-only journal with an in-memory index.
+
+    Records are one JSON object per line: {"op": "query", ...} appends a
+    query, {"op": "set", ...} replaces the whole state (legacy import,
+    save_memory, compaction). Each process keeps the replayed state plus
+    the byte offset it has read up to, so a read only parses what other
+    workers appended since. Writers hold an exclusive flock on a side lock
+    file (the journal itself is replaced on compaction), readers a shared one.
+
+    The first line of every journal file carries a random "epoch": a file
+    created or compacted by another worker has a different one, so a
+    stale offset is never applied to a new file (inode numbers are reused
+    after os.replace, so they can't tell).
+    """
+
+    def __init__(self, path=JOURNAL_FILE, keep=RECENT_LIMIT):
+        self.path = path
+        self.keep = keep
+        self._lock = threading.RLock()
+        self._lock_fd = None
+        self._locked = False  # this process holds the exclusive flock
+        self._append_fd = None
+        self._epoch = None
+        self._offset = 0
+        self._records = 0
+        self._last_topic = None
+        self._recent = deque(maxlen=keep)
+        self._last_fsync = 0.0
+        self._fsync_timer = None
+        self._import_legacy()
+
+    # -------------------------
+    # Locking
+    # -------------------------
+    @contextlib.contextmanager
+    def _flock(self, mode):
+        with self._lock:
+            # flock on an fd we already hold exclusively would downgrade it
+            if fcntl is None or self._locked:
+                yield
+                return
+            if self._lock_fd is None:
+                self._lock_fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, mode)
+            self._locked = mode == fcntl.LOCK_EX
+            try:
+                yield
+            finally:
+                self._locked = False
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _exclusive(self):
+        return self._flock(fcntl.LOCK_EX if fcntl else None)
+
+    def _shared(self):
+        return self._flock(fcntl.LOCK_SH if fcntl else None)
+
+    # -------------------------
+    # Index
+    # -------------------------
+    def _reset(self):
+        self._last_topic = None
+        self._recent.clear()
+        self._offset = 0
+        self._records = 0
+        if self._append_fd is not None:
+            os.close(self._append_fd)
+            self._append_fd = None
+
+    def _apply(self, record):
+        op = record.get("op")
+        if op == "query":
+            self._recent.append({"query": record["query"], "time": record.get("time")})
+            self._last_topic = record["query"]
+        elif op == "set":
+            self._recent.clear()
+            self._recent.extend(record.get("recent_queries") or [])
+            self._last_topic = record.get("last_topic")
+
+    def _catch_up(self):
+        """Replay whatever was appended since our offset (everything, if the file was replaced)."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._reset()
+            self._epoch = None
+            return
+        # size, epoch and data all come from the one open file, never from a separate stat
+        with f:
+            epoch = _epoch_of(f.readline())
+            size = os.fstat(f.fileno()).st_size
+            if epoch != self._epoch or size < self._offset:
+                self._reset()
+                self._epoch = epoch
+            if size == self._offset:
+                return
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+
+        # a concurrent writer's last line may be incomplete — leave it for next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                print(f"⚠️ Skipping corrupt memory journal line: {line[:80]!r}")
+            self._records += 1
+        self._offset += end
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def _append(self, record):
+        line = _encode(record)
+        with self._exclusive():
+            self._catch_up()
+            if self._append_fd is None:
+                self._append_fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if self._offset == 0:
+                # new (or empty) journal: it starts with its epoch
+                self._epoch = _new_epoch()
+                header = _encode({"op": "epoch", "epoch": self._epoch})
+                os.write(self._append_fd, header)
+                self._offset += len(header)
+                self._records += 1
+            os.write(self._append_fd, line)
+            # we hold the lock, so nobody else wrote in between
+            self._offset += len(line)
+            self._records += 1
+            self._apply(record)
+            if self._records > COMPACT_AFTER:
+                self._compact()
+            else:
+                self._schedule_fsync()
+
+    def _compact(self):
+        """Replace the journal with one snapshot record (caller holds the lock)."""
+        epoch = _new_epoch()
+        snapshot = {"op": "set", "epoch": epoch, **self.snapshot()}
+        line = _encode(snapshot)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._reset()
+        self._epoch = epoch
+        self._offset = len(line)
+        self._records = 1
+        self._apply(snapshot)
+
+    def _schedule_fsync(self):
+        wait = FSYNC_INTERVAL - (time.monotonic() - self._last_fsync)
+        if wait <= 0:
+            self.flush()
+        elif self._fsync_timer is None:
+            self._fsync_timer = threading.Timer(wait, self.flush)
+            self._fsync_timer.daemon = True
+            self._fsync_timer.start()
+
+    def flush(self):
+        """fsync pending appends (coalesced: called at most once per FSYNC_INTERVAL, and at exit)."""
+        with self._lock:
+            self._fsync_timer = None
+            if self._append_fd is not None:
+                with contextlib.suppress(OSError):
+                    os.fsync(self._append_fd)
+            self._last_fsync = time.monotonic()
+
+    def _import_legacy(self):
+        if os.path.exists(self.path) or not os.path.exists(MEMORY_FILE):
+            return
+        try:
+            with open(MEMORY_FILE, "r") as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        # two workers importing at once just write the same snapshot twice
+        self.replace(legacy)
+
+    # -------------------------
+    # Public
+    # -------------------------
+    def snapshot(self) -> dict:
+        return {"last_topic": self._last_topic, "recent_queries": list(self._recent)}
+
+    def read(self) -> dict:
+        with self._shared():
+            self._catch_up()
+            return self.snapshot()
+
+    def add_query(self, query: str):
+        self._append({"op": "query", "query": query, "time": datetime.now().isoformat()})
+
+    def replace(self, memory: dict):
+        self._append({"op": "set", "last_topic": memory.get("last_topic"),
+                      "recent_queries": list(memory.get("recent_queries") or [])[-self.keep:]})
+
+
+_journal = MemoryJournal()
+atexit.register(_journal.flush)
+
+
+def load_memory():
+    """Current memory (replays only what other workers appended since the last read)."""
+    return _journal.read()
 
 
 def save_memory(memory):
-    """Persist memory state to JSON."""
-    with open(MEMORY_FILE, "w") as f:
-        json.dump(memory, f, indent=2)
+    """Persist a whole memory state (one snapshot record)."""
+    _journal.replace(memory)
 
 
 def update_memory(new_query: str):
-    """Update last topic and history."""
-    memory = load_memory()
-    memory["last_topic"] = new_query
-    memory["recent_queries"].append({"query": new_query, "time": datetime.now().isoformat()})
-
-    # keep only last 5
-    memory["recent_queries"] = memory["recent_queries"][-5:]
-    save_memory(memory)
+    """Update last topic and history (one appended line, no rewrite)."""
+    _journal.add_query(new_query)
 
 
 def infer_continued_query(user_input: str):
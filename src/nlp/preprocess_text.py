@@ -1,11 +1,35 @@
+
+import argparse
+import hashlib
 import os
+import sqlite3
+import time
 from pathlib import Path
-import pandas as pd
 import re
-import spacy
 
-# Load spaCy model once
-nlp = spacy.load("en_core_web_sm", disable=["ner", "parser"])
+# -------------------------
+# Config
+# -------------------------
+SPACY_MODEL = os.getenv("AETHER_SPACY_MODEL", "en_core_web_sm")
+# docs per nlp.pipe batch, and worker processes (1 = in-process)
+BATCH_SIZE = int(os.getenv("AETHER_NLP_BATCH_SIZE", "256"))
+N_PROCESS = int(os.getenv("AETHER_NLP_PROCESSES", "1"))
+# rows held in memory at once
+CHUNK_ROWS = int(os.getenv("AETHER_NLP_CHUNK_ROWS", "5000"))
+# anchored to the project root like the other data/ files (the web dyno runs with --chdir webapp)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LEMMA_CACHE_PATH = os.getenv("AETHER_LEMMA_CACHE", os.path.join(PROJECT_ROOT, "data", "cache", "lemmas.sqlite3"))
+
+# spaCy model is loaded once, on first use — clean_text() never needs it
+_nlp = None
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load(SPACY_MODEL, disable=["ner", "parser"])
+    return _nlp
 
 def clean_text(text):
     if not isinstance(text, str):
@@ -15,42 +39,134 @@ def clean_text(text):
     text = re.sub(r"\s+", " ", text).strip()           # remove extra spaces
     return text.lower()
 
+def _lemmas(doc):
+    return " ".join(token.lemma_ for token in doc if not token.is_stop and token.is_alpha)
+
 def lemmatize_text(text):
-    doc = nlp(text)
-    lemmas = [token.lemma_ for token in doc if not token.is_stop and token.is_alpha]
-    return " ".join(lemmas)
+    return _lemmas(get_nlp()(text))
+
+
+# -------------------------
+# Lemma cache (content hash → lemmas)
+# -------------------------
+def text_key(text):
+    """Cache key: the model is part of it, so switching models never serves stale lemmas."""
+    return hashlib.blake2b(f"{SPACY_MODEL}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LemmaCache:
+    """SQLite file shared across runs; re-runs only lemmatize rows whose text changed."""
+
+    _QUERY_VARS = 500  # stay under SQLite's bound-parameter limit
+
+    def __init__(self, path=LEMMA_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)  # pipeline workers share it
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS lemmas (key TEXT PRIMARY KEY, lemmas TEXT NOT NULL)")
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), self._QUERY_VARS):
+            part = keys[i:i + self._QUERY_VARS]
+            rows = self.conn.execute(
+                f"SELECT key, lemmas FROM lemmas WHERE key IN ({','.join('?' * len(part))})", part
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def put_many(self, pairs):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO lemmas (key, lemmas) VALUES (?, ?)", pairs)
 
-def main(topic="AI"):
+    def close(self):
+        self.conn.close()
+
+
+def lemmatize_texts(texts, batch_size=BATCH_SIZE, n_process=N_PROCESS, cache=None):
     """
-    Preprocess cleaned news data for NLP.
-    Each topic saves to: data/processed/news_nlp_ready_<topic>.csv
+    Lemmas for each of `texts`, in order. Cached texts are looked up,
+    the rest (each distinct text once) go through nlp.pipe in batches.
+    Returns (lemmas, number of texts actually run through spaCy).
     """
-    topic_tag = topic.lower().replace(" ", "_")
+    keys = [text_key(t) if t else None for t in texts]
+    known = cache.get_many({k for k in keys if k}) if cache else {}
 
-    PROCESSED_DIR = Path("data/processed")
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    todo = {}
+    for key, text in zip(keys, texts):
+        if key and key not in known and key not in todo:
+            todo[key] = text
 
-    INPUT_CSV = PROCESSED_DIR / f"cleaned_news_{topic_tag}.csv"
-    OUTPUT_CSV = PROCESSED_DIR / f"news_nlp_ready_{topic_tag}.csv"
+    if todo:
+        docs = get_nlp().pipe(todo.values(), batch_size=batch_size, n_process=n_process)
+        fresh = list(zip(todo.keys(), (_lemmas(doc) for doc in docs)))
+        known.update(fresh)
+        if cache:
+            cache.put_many(fresh)
 
-    if not INPUT_CSV.exists():
-        raise FileNotFoundError(f"Input file not found: {INPUT_CSV}")
+    return [known[k] if k else "" for k in keys], len(todo)
 
-    df = pd.read_csv(INPUT_CSV)
-    df["raw_text"] = (df.get("title", "").fillna("") + " " + df.get("description", "").fillna("")).str.strip()
+
+def _prepare(df, batch_size, n_process, cache):
+    """Add the NLP columns to one batch of cleaned rows; returns it and how many texts spaCy parsed."""
+    df["raw_text"] = (df["title"].fillna("") + " " + df["text"].fillna("")).str.strip()
 
     # Clean and lemmatize
     df["clean_text"] = df["raw_text"].apply(clean_text)
-    df["lemmatized"] = df["clean_text"].apply(lemmatize_text)
+    df["lemmatized"], n_parsed = lemmatize_texts(
+        df["clean_text"].tolist(), batch_size=batch_size, n_process=n_process, cache=cache
+    )
 
     # Simple text features
     df["num_words"] = df["clean_text"].apply(lambda x: len(x.split()))
     df["num_chars"] = df["clean_text"].apply(len)
+    return df, n_parsed
+
+def main(topic="AI", batch_size=BATCH_SIZE, n_process=N_PROCESS, chunk_rows=CHUNK_ROWS, use_cache=True):
+    """
+    Preprocess cleaned news data for NLP.
+    Reads the topic's "cleaned" Parquet parts and writes matching parts to
+    its "nlp_ready" dataset. Only parts that are new or changed since the
+    last run are processed, each streamed in chunks so memory stays flat.
+    """
+    from src.data_cleaning.columnar import dataset_dir, iter_batches, list_parts, pending_parts, write_frames
+
+    if not list_parts("cleaned", topic):
+        raise FileNotFoundError(f"No cleaned data for '{topic}' in {dataset_dir('cleaned', topic)}")
+
+    todo = pending_parts("cleaned", "nlp_ready", topic)
+    cache = LemmaCache() if use_cache else None
+    start = time.perf_counter()
+    rows = parsed = 0
+
+    def prepared(src):
+        nonlocal parsed
+        for batch in iter_batches(src, columns=["url", "title", "text", "published_at"], batch_rows=chunk_rows):
+            df, n_parsed = _prepare(batch, batch_size, n_process, cache)
+            parsed += n_parsed
+            yield df
+
+    try:
+        for src, dst in todo:
+            rows += write_frames("nlp_ready", dst, prepared(src))
+    finally:
+        if cache:
+            cache.close()
 
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"✅ Saved NLP-ready data for '{topic}' to {OUTPUT_CSV}")
+    print(f"🧠 Lemmatized {rows} rows from {len(todo)} new parts in {time.perf_counter() - start:.1f}s "
+          f"(spaCy ran on {parsed} new texts, the rest were cached)")
+    OUTPUT_DIR = dataset_dir("nlp_ready", topic)
+    print(f"✅ Saved NLP-ready data for '{topic}' to {OUTPUT_DIR}")
 
-    return OUTPUT_CSV
+    return OUTPUT_DIR
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Clean + lemmatize a topic's cleaned news parts")
+    parser.add_argument("topic", nargs="?", default="AI")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--processes", type=int, default=N_PROCESS)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--no-cache", action="store_true", help="ignore and don't update the lemma cache")
+    args = parser.parse_args()
+    main(args.topic, args.batch_size, args.processes, args.chunk_rows, use_cache=not args.no_cache)
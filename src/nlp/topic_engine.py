@@ -0,0 +1,241 @@
+# === topic_engine.py ===
+# Incremental topic clustering: HashingVectorizer + MiniBatchKMeans.partial_fit
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer
+
+from src.nlp.preprocess_text import clean_text
+
+# -------------------------
+# Config
+# -------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODEL_DIR = os.getenv("AETHER_TOPIC_MODEL_DIR", os.path.join(PROJECT_ROOT, "data", "models"))
+N_CLUSTERS = int(os.getenv("AETHER_TOPIC_CLUSTERS", "8"))
+# every centroid is dense over the feature space and the engine is pickled on save:
+# 8 float32 centroids × 2**15 ≈ 1 MB (2**18 float64 was ~17 MB per topic)
+N_FEATURES = 2 ** 15
+# per-batch decay of keyword counts, so clusters follow the news instead of history
+KEYWORD_DECAY = float(os.getenv("AETHER_TOPIC_DECAY", "0.97"))
+MAX_TERMS_PER_CLUSTER = 2000
+MAX_SEEN = 50_000  # content hashes remembered to skip re-ingested items
+
+# stateless → identical features in every process and across runs
+_vectorizer = HashingVectorizer(
+    n_features=N_FEATURES,
+    stop_words="english",
+    alternate_sign=False,
+    norm="l2",
+    dtype=np.float32,
+)
+
+
+def topic_tag(topic: str) -> str:
+    return (topic or "all").lower().strip().replace(" ", "_")
+
+
+def _doc_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+class TopicEngine:
+    """
+    Online clustering for one topic. `update()` folds a batch of new texts
+    into the existing centroids (no refit), `keywords()` reads the current
+    clusters. Hashed features can't be inverted, so each cluster keeps its
+    own decayed term counts for labelling.
+    """
+
+    VERSION = 2
+
+    def __init__(self, topic="all", n_clusters=N_CLUSTERS):
+        self.topic = topic
+        self.n_clusters = n_clusters
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, batch_size=256, n_init=3)
+        self.fitted = False
+        self.term_counts = [Counter() for _ in range(n_clusters)]
+        self.sizes = np.zeros(n_clusters)
+        self.docs_seen = 0
+        self.updated_at = 0.0
+        self._seen = OrderedDict()
+        self._pending = []  # held until there are enough docs for the first fit
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def update(self, texts) -> int:
+        """Cluster new texts (already-seen ones are skipped). Returns how many were used."""
+        cleaned = [c for c in (clean_text(t) for t in texts) if c]
+
+        with self._lock:
+            fresh = []
+            for text in cleaned:
+                h = _doc_hash(text)
+                if h not in self._seen:
+                    self._seen[h] = None
+                    fresh.append(text)
+            while len(self._seen) > MAX_SEEN:
+                self._seen.popitem(last=False)
+
+            batch = self._pending + fresh
+            if not self.fitted and len(batch) < self.n_clusters:
+                self._pending = batch
+                return 0
+            self._pending = []
+            if not batch:
+                return 0
+
+            X = _vectorizer.transform(batch)
+            self.kmeans.partial_fit(X)
+            self.fitted = True
+            labels = self.kmeans.predict(X)
+
+            # decay old evidence, then count this batch's words per cluster
+            self.sizes *= KEYWORD_DECAY
+            for counts in self.term_counts:
+                for term in counts:
+                    counts[term] *= KEYWORD_DECAY
+            for text, label in zip(batch, labels):
+                self.sizes[label] += 1
+                self.term_counts[label].update(
+                    w for w in text.split() if len(w) > 2 and w not in ENGLISH_STOP_WORDS and not w.isdigit()
+                )
+            for i, counts in enumerate(self.term_counts):
+                if len(counts) > MAX_TERMS_PER_CLUSTER:
+                    self.term_counts[i] = Counter(dict(counts.most_common(MAX_TERMS_PER_CLUSTER // 2)))
+
+            self.docs_seen += len(batch)
+            self.updated_at = time.time()
+            return len(batch)
+
+    def predict(self, texts):
+        """Cluster id per text, or -1 for every text before the first fit."""
+        if not self.fitted:
+            return [-1] * len(texts)
+        return self.kmeans.predict(_vectorizer.transform([clean_text(t) for t in texts])).tolist()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def keywords(self, n=10):
+        """Current clusters, biggest first: [{"topic", "size", "keywords"}]."""
+        with self._lock:
+            out = []
+            for i, counts in enumerate(self.term_counts):
+                if not counts:
+                    continue
+                out.append({
+                    "topic": i,
+                    "size": round(float(self.sizes[i]), 1),
+                    "keywords": [w for w, _ in counts.most_common(n)],
+                })
+        return sorted(out, key=lambda c: c["size"], reverse=True)
+
+    def summary(self) -> dict:
+        return {
+            "topic": self.topic,
+            "clusters": self.n_clusters,
+            "docs_seen": self.docs_seen,
+            "updated_at": self.updated_at,
+            "fitted": self.fitted,
+        }
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def save(self, path=None):
+        """Atomic pickle (tmp file + rename) so readers never see a half-written model."""
+        path = path or model_path(self.topic)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": self.VERSION, "engine": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, topic="all", path=None):
+        """Saved engine for `topic`, or a fresh one if none (or an incompatible one) exists."""
+        path = path or model_path(topic)
+        try:
+            with open(path, "rb") as f:
+                blob = pickle.load(f)
+            if blob.get("version") == cls.VERSION:
+                return blob["engine"]
+            print(f"⚠️ Topic model {path} is from an older version — starting fresh")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Could not load topic model {path}: {e}")
+        return cls(topic)
+
+
+def model_path(topic) -> str:
+    return os.path.join(MODEL_DIR, f"topics_{topic_tag(topic)}.pkl")
+
+
+# -------------------------
+# Process-wide engines (reloaded when another process saves a newer file)
+# -------------------------
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(topic="all") -> TopicEngine:
+    tag = topic_tag(topic)
+    path = model_path(topic)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    with _engines_lock:
+        cached = _engines.get(tag)
+        if cached is not None and (mtime is None or cached[0] >= mtime):
+            return cached[1]
+        engine = TopicEngine.load(topic, path)
+        _engines[tag] = (mtime or 0.0, engine)
+        return engine
+
+
+def persist(topic):
+    """Save the topic's in-process engine (e.g. after a run of `ingest(..., save=False)`)."""
+    engine = get_engine(topic)
+    path = engine.save()
+    with _engines_lock:
+        _engines[topic_tag(topic)] = (os.path.getmtime(path), engine)
+
+
+def ingest(topic, texts, save=True) -> int:
+    """Fold `texts` into the topic's engine and, unless `save=False`, persist it."""
+    used = get_engine(topic).update(texts)
+    if used and save:
+        persist(topic)
+    return used
+
+
+def known_topics():
+    if not os.path.isdir(MODEL_DIR):
+        return []
+    return sorted(
+        f[len("topics_"):-len(".pkl")] for f in os.listdir(MODEL_DIR)
+        if f.startswith("topics_") and f.endswith(".pkl")
+    )
@@ -1,38 +1,50 @@
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
-from pathlib import Path
-
-def main(topic="AI", output_path=None):
-    topic_tag = topic.lower().replace(" ", "_")
-    DATA_PATH = Path(f"data/processed/news_nlp_ready_{topic_tag}.csv")
-    OUTPUT_PATH = Path(output_path) if output_path else Path(f"data/processed/news_topics_{topic_tag}.csv")
-
-    df = pd.read_csv(DATA_PATH)
-    print(f"🔍 Loaded {len(df)} articles for topic '{topic}'")
-
-    if len(df) < 3:
-        print("⚠️ Not enough data for topic modeling — need at least 3 articles.")
+from src.data_cleaning.columnar import dataset_dir, iter_batches, list_parts, pending_parts, write_frames
+from src.nlp.topic_engine import get_engine, ingest, persist
+
+CHUNK_ROWS = 2000
+
+
+def main(topic="AI"):
+    """
+    Fold the topic's NLP-ready articles into its incremental topic engine
+    (state persists in data/models/, so only new articles change the
+    clusters) and label new NLP-ready parts into the "topics" dataset.
+    Only the columns each pass needs are read.
+    """
+    parts = list_parts("nlp_ready", topic)
+    if not parts:
+        raise FileNotFoundError(f"No NLP-ready data for '{topic}' in {dataset_dir('nlp_ready', topic)}")
+
+    # pass 1: stream chunks into the engine (already-seen articles are skipped)
+    n_docs = new_docs = 0
+    for path in parts:
+        for chunk in iter_batches(path, columns=["clean_text"], batch_rows=CHUNK_ROWS):
+            texts = chunk["clean_text"].fillna("").astype(str).tolist()
+            n_docs += len(texts)
+            new_docs += ingest(topic, texts, save=False)
+    if new_docs:
+        persist(topic)
+    print(f"🔍 Loaded {n_docs} articles for topic '{topic}' ({new_docs} new to the model)")
+
+    engine = get_engine(topic)
+    if not engine.fitted:
+        print(f"⚠️ Not enough data for topic modeling — need at least {engine.n_clusters} articles.")
         return
 
-    n_docs = len(df)
-    min_df = 1 if n_docs < 20 else 5
-    max_df = 0.95 if n_docs < 50 else 0.8
-    k = 2 if n_docs < 20 else min(10, n_docs // 10)
-
-    vectorizer = TfidfVectorizer(max_df=max_df, min_df=min_df, stop_words="english", max_features=1000)
-    X = vectorizer.fit_transform(df["clean_text"])
-
-    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-    df["topic"] = kmeans.fit_predict(X)
+    # pass 2: label parts that are new since the last run, one output part per input part
+    def labelled(path):
+        for chunk in iter_batches(path, columns=["url", "title", "published_at", "clean_text"], batch_rows=CHUNK_ROWS):
+            chunk["topic"] = engine.predict(chunk["clean_text"].fillna("").astype(str).tolist())
+            yield chunk
 
-    terms = vectorizer.get_feature_names_out()
-    topic_keywords = {i: [terms[idx] for idx in kmeans.cluster_centers_[i].argsort()[-10:][::-1]] for i in range(k)}
+    todo = pending_parts("nlp_ready", "topics", topic)
+    for src, dst in todo:
+        write_frames("topics", dst, labelled(src))
 
-    df.to_csv(OUTPUT_PATH, index=False)
-    print(f"✅ Topic modeling complete for '{topic}'. Saved to {OUTPUT_PATH}")
+    OUTPUT_DIR = dataset_dir("topics", topic)
+    print(f"✅ Topic modeling complete for '{topic}' ({len(todo)} new parts). Saved to {OUTPUT_DIR}")
 
-    for t, words in topic_keywords.items():
-        print(f"🧩 Topic {t}: {', '.join(words)}")
+    for cluster in engine.keywords():
+        print(f"🧩 Topic {cluster['topic']}: {', '.join(cluster['keywords'])}")
 
-    return OUTPUT_PATH
+    return OUTPUT_DIR
@@ -0,0 +1,338 @@
+# === trend_engine.py ===
+# Burst detection: hourly mention counts in ring buffers, incremental z-scores
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from src.nlp.preprocess_text import clean_text
+
+# -------------------------
+# Config
+# -------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODEL_DIR = os.getenv("AETHER_TREND_MODEL_DIR", os.path.join(PROJECT_ROOT, "data", "models"))
+BUCKET_SECONDS = 3600
+# ring length (hours of history) and how many of the newest buckets count as "now"
+WINDOW = int(os.getenv("AETHER_TREND_WINDOW_HOURS", "72"))
+RECENT = int(os.getenv("AETHER_TREND_RECENT_HOURS", "3"))
+# a term needs this many recent mentions before it can trend
+MIN_RECENT = int(os.getenv("AETHER_TREND_MIN_MENTIONS", "3"))
+# std floor, so a term going 0 → 3 mentions doesn't score infinity
+MIN_SIGMA = 0.5
+MAX_TERMS = int(os.getenv("AETHER_TREND_MAX_TERMS", "20000"))
+TOP_K = 25
+MAX_SEEN = 50_000
+
+
+def topic_tag(topic: str) -> str:
+    return (topic or "all").lower().strip().replace(" ", "_")
+
+
+def extract_terms(text):
+    """Distinct words and two-word phrases (neither side a stopword) — phrases stand in for entities."""
+    words = [w for w in clean_text(text).split() if len(w) > 2 and not w.isdigit()]
+    keep = [w not in ENGLISH_STOP_WORDS for w in words]
+    terms = {w for w, k in zip(words, keep) if k}
+    terms.update(f"{a} {b}" for a, b, ka, kb in zip(words, words[1:], keep, keep[1:]) if ka and kb)
+    return terms
+
+
+def _item_key(item) -> str:
+    url = item.get("url") or ""
+    return url or hashlib.blake2b((item.get("title") or "").encode("utf-8"), digest_size=12).hexdigest()
+
+
+class TrendEngine:
+    """
+    Per-term hourly document counts in a (terms × WINDOW) uint16 ring.
+    The newest RECENT buckets are "now", the rest the baseline; running
+    sums for both are kept per term and shifted once per hour, so a
+    burst score is O(1) to refresh and the top list is kept up to date
+    on every write (by merging touched terms when only "now" counts
+    grew, by a vectorized rescore otherwise) — `trending()` only slices it.
+    """
+
+    VERSION = 1
+
+    def __init__(self, topic="all", now=None):
+        self.topic = topic
+        self.hour = int((now or time.time()) // BUCKET_SECONDS)
+        self.index = {}
+        self.terms = []
+        self.counts = np.zeros((256, WINDOW), dtype=np.uint16)
+        self.recent_sum = np.zeros(256)
+        self.base_sum = np.zeros(256)
+        self.base_sq = np.zeros(256)
+        self.top = []  # [(score, row)] best first
+        self.docs_seen = 0
+        self.updated_at = 0.0
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Ring maintenance
+    # -------------------------
+    def _advance(self, hour):
+        steps = hour - self.hour
+        if steps <= 0:
+            return
+        if steps >= WINDOW:
+            self.counts[:] = 0
+            self.recent_sum[:] = self.base_sum[:] = self.base_sq[:] = 0
+        else:
+            for _ in range(steps):
+                self.hour += 1
+                # the new hour reuses the column of the bucket that just left the window
+                col = self.hour % WINDOW
+                old = self.counts[:, col].astype(np.float64)
+                self.base_sum -= old
+                self.base_sq -= old * old
+                self.counts[:, col] = 0
+                # and the oldest "recent" bucket becomes baseline
+                moved = self.counts[:, (self.hour - RECENT) % WINDOW].astype(np.float64)
+                self.recent_sum -= moved
+                self.base_sum += moved
+                self.base_sq += moved * moved
+        self.hour = hour
+        self._compact()
+        self._rescore_all()
+
+    def _compact(self):
+        """Drop terms with no mentions left in the window once they are most of the rows."""
+        n = len(self.terms)
+        live = np.flatnonzero(self.recent_sum[:n] + self.base_sum[:n] > 0)
+        if n < 1024 or len(live) > n // 2:
+            return
+        self.terms = [self.terms[i] for i in live]
+        self.index = {t: i for i, t in enumerate(self.terms)}
+        cap = max(256, len(live) * 2)
+        for name in ("counts", "recent_sum", "base_sum", "base_sq"):
+            old = getattr(self, name)
+            new = np.zeros((cap,) + old.shape[1:], dtype=old.dtype)
+            new[:len(live)] = old[live]
+            setattr(self, name, new)
+
+    def _row(self, term):
+        row = self.index.get(term)
+        if row is not None:
+            return row
+        if len(self.terms) >= MAX_TERMS:
+            return None
+        row = len(self.terms)
+        if row == len(self.counts):
+            cap = row * 2
+            for name in ("counts", "recent_sum", "base_sum", "base_sq"):
+                old = getattr(self, name)
+                new = np.zeros((cap,) + old.shape[1:], dtype=old.dtype)
+                new[:row] = old
+                setattr(self, name, new)
+        self.index[term] = row
+        self.terms.append(term)
+        return row
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+    def _scores(self, rows):
+        """Burst z-score of recent rate against the baseline's hourly mean/std."""
+        n_base = WINDOW - RECENT
+        mu = self.base_sum[rows] / n_base
+        var = np.maximum(self.base_sq[rows] / n_base - mu * mu, 0.0)
+        # Poisson floor: a sparse baseline's variance is at least its mean
+        sigma = np.maximum(np.sqrt(np.maximum(var, mu)), MIN_SIGMA)
+        z = (self.recent_sum[rows] / RECENT - mu) / sigma
+        return np.where(self.recent_sum[rows] >= MIN_RECENT, z, -np.inf)
+
+    def _rescore_all(self):
+        n = len(self.terms)
+        if not n:
+            self.top = []
+            return
+        scores = self._scores(np.arange(n))
+        best = np.argpartition(-scores, min(TOP_K, n) - 1)[:TOP_K]
+        self.top = sorted(((float(scores[i]), int(i)) for i in best if scores[i] > 0), reverse=True)
+
+    def _rescore(self, rows):
+        """
+        Merge `rows` into the current top list. Exact only when their recent
+        counts went up and nothing else changed: scores can only rise then,
+        so no row outside the list can overtake one in it. A baseline
+        mention can lower a listed row's score — callers rescore everything then.
+        """
+        candidates = {r for _, r in self.top} | set(rows)
+        idx = np.fromiter(candidates, dtype=np.int64)
+        scores = self._scores(idx)
+        self.top = sorted(((float(s), int(r)) for s, r in zip(scores, idx) if s > 0), reverse=True)[:TOP_K]
+
+    # -------------------------
+    # Updates / reads
+    # -------------------------
+    def add(self, items, now=None) -> int:
+        """Count each new item's terms in its published hour. Returns how many items were new."""
+        now = now or time.time()
+        with self._lock:
+            self._advance(int(now // BUCKET_SECONDS))
+            touched = set()
+            base_touched = False
+            added = 0
+            for item in items:
+                key = _item_key(item)
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+
+                hour = min(int((item.get("ts") or now) // BUCKET_SECONDS), self.hour)
+                age = self.hour - hour
+                if age >= WINDOW:
+                    continue
+                col = hour % WINDOW
+                for term in extract_terms(f"{item.get('title') or ''} {item.get('description') or ''}"):
+                    row = self._row(term)
+                    if row is None:
+                        continue
+                    c = int(self.counts[row, col])
+                    if c == np.iinfo(np.uint16).max:
+                        continue
+                    self.counts[row, col] = c + 1
+                    if age < RECENT:
+                        self.recent_sum[row] += 1
+                    else:
+                        self.base_sum[row] += 1
+                        self.base_sq[row] += 2 * c + 1
+                        base_touched = True
+                    touched.add(row)
+                added += 1
+
+            while len(self._seen) > MAX_SEEN:
+                self._seen.popitem(last=False)
+            if base_touched:
+                self._rescore_all()
+            elif touched:
+                self._rescore(touched)
+            self.docs_seen += added
+            if added:
+                self.updated_at = now
+            return added
+
+    def trending(self, k=10, now=None):
+        """Top bursting terms: [{"term", "score", "recent", "baseline"}] (per-hour rates)."""
+        with self._lock:
+            self._advance(int((now or time.time()) // BUCKET_SECONDS))
+            out = []
+            for score, row in self.top[:k]:
+                out.append({
+                    "term": self.terms[row],
+                    "score": round(score, 2),
+                    "recent": round(float(self.recent_sum[row]) / RECENT, 2),
+                    "baseline": round(float(self.base_sum[row]) / (WINDOW - RECENT), 2),
+                })
+            return out
+
+    def summary(self) -> dict:
+        return {"topic": self.topic, "terms": len(self.terms), "docs_seen": self.docs_seen,
+                "updated_at": self.updated_at}
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        n = len(self.terms)
+        for name in ("counts", "recent_sum", "base_sum", "base_sq"):
+            state[name] = state[name][:max(n, 1)].copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def save(self, path=None):
+        """Atomic pickle (tmp file + rename), like the topic engines."""
+        path = path or model_path(self.topic)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with self._lock, open(tmp, "wb") as f:
+            pickle.dump({"version": self.VERSION, "window": WINDOW, "recent": RECENT, "engine": self}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, topic="all", path=None):
+        path = path or model_path(topic)
+        try:
+            with open(path, "rb") as f:
+                blob = pickle.load(f)
+            if (blob.get("version"), blob.get("window"), blob.get("recent")) == (cls.VERSION, WINDOW, RECENT):
+                return blob["engine"]
+            print(f"⚠️ Trend model {path} was built with other settings — starting fresh")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Could not load trend model {path}: {e}")
+        return cls(topic)
+
+
+def model_path(topic) -> str:
+    return os.path.join(MODEL_DIR, f"trends_{topic_tag(topic)}.pkl")
+
+
+# -------------------------
+# Process-wide engines (reloaded when the ingest worker saves a newer file)
+# -------------------------
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(topic="all") -> TrendEngine:
+    tag = topic_tag(topic)
+    path = model_path(topic)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    with _engines_lock:
+        cached = _engines.get(tag)
+        if cached is not None and (mtime is None or cached[0] >= mtime):
+            return cached[1]
+        engine = TrendEngine.load(topic, path)
+        _engines[tag] = (mtime or 0.0, engine)
+        return engine
+
+
+def persist(topic):
+    """Save the topic's in-process engine (e.g. after a run of `ingest(..., save=False)`)."""
+    engine = get_engine(topic)
+    path = engine.save()
+    with _engines_lock:
+        _engines[topic_tag(topic)] = (os.path.getmtime(path), engine)
+
+
+def ingest(topic, items, save=True) -> int:
+    """Count fetched items (NewsItem / RedditPost / YouTubeVideo) into the topic's trends."""
+    added = get_engine(topic).add(items)
+    if added and save:
+        persist(topic)
+    return added
+
+
+def trending(topic="all", k=10):
+    return get_engine(topic).trending(k)
+
+
+def known_topics():
+    if not os.path.isdir(MODEL_DIR):
+        return []
+    return sorted(
+        f[len("trends_"):-len(".pkl")] for f in os.listdir(MODEL_DIR)
+        if f.startswith("trends_") and f.endswith(".pkl")
+    )
@@ -0,0 +1,167 @@
+# === dag.py ===
+# Declarative stage graph: content-hashed inputs/outputs, skip what hasn't changed
+
+import graphlib
+import hashlib
+import json
+import os
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_READ_CHUNK = 1 << 20
+
+
+class Stage:
+    """
+    One step of a per-topic pipeline. `inputs(topic)` / `outputs(topic)`
+    return the files or directories it reads and writes; `run(topic)` does
+    the work. Bump `version` when the stage's logic changes so its cached
+    results stop matching.
+    """
+
+    def __init__(self, name, run, inputs, outputs, after=(), version=1):
+        self.name = name
+        self.run = run
+        self.inputs = inputs
+        self.outputs = outputs
+        self.after = tuple(after)
+        self.version = version
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+# -------------------------
+# Content hashing
+# -------------------------
+class ContentHasher:
+    """
+    blake2b over file contents. Files whose (size, mtime) match the memo
+    reuse their previous hash, so unchanged inputs are never re-read.
+    """
+
+    def __init__(self, memo=None):
+        self.memo = memo if memo is not None else {}
+
+    def file(self, path) -> str:
+        st = os.stat(path)
+        sig = [st.st_size, st.st_mtime_ns]
+        hit = self.memo.get(path)
+        if hit and hit[0] == sig:
+            return hit[1]
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            while chunk := f.read(_READ_CHUNK):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.memo[path] = [sig, digest]
+        return digest
+
+    def paths(self, paths, salt="") -> str:
+        """One digest for a set of files/directories (walked in sorted order, tmp files ignored)."""
+        h = hashlib.blake2b(salt.encode(), digest_size=16)
+        for path in sorted(str(p) for p in paths):
+            rel = os.path.relpath(path, PROJECT_ROOT)
+            if os.path.isfile(path):
+                h.update(f"{rel}\0{self.file(path)}\n".encode())
+            elif os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    dirs.sort()
+                    for name in sorted(files):
+                        if name.startswith("."):
+                            continue
+                        full = os.path.join(root, name)
+                        h.update(f"{os.path.relpath(full, PROJECT_ROOT)}\0{self.file(full)}\n".encode())
+            else:
+                h.update(f"{rel}\0missing\n".encode())
+        return h.hexdigest()
+
+
+# -------------------------
+# Per-topic run state
+# -------------------------
+def load_state(path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if isinstance(state, dict):
+            state.setdefault("stages", {})
+            state.setdefault("hashes", {})
+            return state
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable pipeline state {path}: {e}")
+    return {"stages": {}, "hashes": {}}
+
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+class Pipeline:
+    def __init__(self, stages):
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names in pipeline")
+        for s in stages:
+            missing = [d for d in s.after if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{s.name}' depends on unknown stage(s): {', '.join(missing)}")
+        # raises graphlib.CycleError on cycles
+        self.order = list(graphlib.TopologicalSorter({s.name: s.after for s in stages}).static_order())
+
+    def run(self, topic, state, force=False):
+        """
+        Run every stage for `topic` in dependency order. A stage is skipped
+        when its input and output hashes match the last successful run.
+        Returns one result dict per stage: status is ran / skipped /
+        no-input / failed / blocked.
+        """
+        hasher = ContentHasher(state["hashes"])
+        results = {}
+        for name in self.order:
+            stage = self.stages[name]
+            if any(results[d]["status"] in ("failed", "blocked") for d in stage.after):
+                results[name] = {"stage": name, "status": "blocked", "seconds": 0.0}
+                continue
+
+            start = time.perf_counter()
+            inputs = [str(p) for p in stage.inputs(topic)]
+            if not any(os.path.exists(p) for p in inputs):
+                results[name] = {"stage": name, "status": "no-input", "seconds": 0.0}
+                continue
+
+            in_hash = hasher.paths(inputs, salt=f"{name}:v{stage.version}")
+            prev = state["stages"].get(name)
+            if (not force and prev and prev.get("inputs") == in_hash
+                    and prev.get("outputs") == hasher.paths(stage.outputs(topic))):
+                results[name] = {"stage": name, "status": "skipped", "seconds": time.perf_counter() - start}
+                continue
+
+            try:
+                stage.run(topic)
+            except Exception as e:
+                print(f"❌ {topic}/{name} failed: {e}")
+                state["stages"].pop(name, None)
+                results[name] = {"stage": name, "status": "failed", "error": str(e),
+                                 "seconds": time.perf_counter() - start}
+                continue
+
+            seconds = time.perf_counter() - start
+            state["stages"][name] = {
+                "inputs": in_hash,
+                "outputs": hasher.paths(stage.outputs(topic)),
+                "seconds": round(seconds, 3),
+                "finished_at": time.time(),
+            }
+            results[name] = {"stage": name, "status": "ran", "seconds": seconds}
+
+        # forget hashes of files that no longer exist
+        for path in [p for p in state["hashes"] if not os.path.exists(p)]:
+            del state["hashes"][path]
+        return [results[name] for name in self.order]
@@ -0,0 +1,86 @@
+# === runner.py ===
+# Runs the news pipeline for many topics in parallel and records stage timings
+#
+#   PYTHONPATH=$(pwd) python -m src.pipeline.runner                 # every topic with raw data
+#   PYTHONPATH=$(pwd) python -m src.pipeline.runner ai cricket -j 4
+#   PYTHONPATH=$(pwd) python -m src.pipeline.runner ai --force      # ignore cached stage results
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.pipeline.dag import PROJECT_ROOT, load_state, save_state
+from src.pipeline.stages import NEWS_PIPELINE, discover_topics
+
+# -------------------------
+# Config
+# -------------------------
+STATE_DIR = os.getenv("AETHER_PIPELINE_STATE", os.path.join(PROJECT_ROOT, "data", "pipeline"))
+WORKERS = int(os.getenv("AETHER_PIPELINE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def run_topic(topic, force=False, pipeline=NEWS_PIPELINE) -> dict:
+    """Run one topic's DAG (in this process). State is per topic, so workers never share a file."""
+    from src.data_cleaning.columnar import topic_tag
+
+    start = time.perf_counter()
+    state_path = os.path.join(STATE_DIR, "state", f"{topic_tag(topic)}.json")
+    state = load_state(state_path)
+    results = pipeline.run(topic, state, force=force)
+    save_state(state_path, state)
+    return {"topic": topic, "stages": results, "seconds": time.perf_counter() - start}
+
+
+def run_topics(topics, workers=WORKERS, force=False) -> list:
+    """Independent topics run in parallel, one process each (up to `workers`)."""
+    start = time.perf_counter()
+    reports = []
+    if workers <= 1 or len(topics) <= 1:
+        reports = [run_topic(t, force) for t in topics]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(topics))) as pool:
+            futures = {pool.submit(run_topic, t, force): t for t in topics}
+            for fut in as_completed(futures):
+                try:
+                    reports.append(fut.result())
+                except Exception as e:
+                    print(f"❌ Pipeline for '{futures[fut]}' crashed: {e}")
+                    reports.append({"topic": futures[fut], "stages": [], "seconds": 0.0, "error": str(e)})
+
+    reports.sort(key=lambda r: topics.index(r["topic"]))
+    _log_run(reports, time.perf_counter() - start)
+    return reports
+
+
+def _log_run(reports, seconds):
+    """Print a per-stage timing table and append the run to data/pipeline/runs.jsonl."""
+    for r in reports:
+        cells = [f"{s['stage']} {s['status']} {s['seconds']:.1f}s" for s in r["stages"]] or [r.get("error", "crashed")]
+        print(f"📊 {r['topic']:<24} {r['seconds']:6.1f}s | " + " | ".join(cells))
+    ran = sum(1 for r in reports for s in r["stages"] if s["status"] == "ran")
+    skipped = sum(1 for r in reports for s in r["stages"] if s["status"] == "skipped")
+    print(f"✅ Pipeline finished {len(reports)} topics in {seconds:.1f}s ({ran} stages ran, {skipped} skipped)")
+
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(os.path.join(STATE_DIR, "runs.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"finished_at": time.time(), "seconds": round(seconds, 3), "topics": reports}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aether offline pipeline: clean → preprocess → topics")
+    parser.add_argument("topics", nargs="*", help="topics to run (default: every topic with raw data)")
+    parser.add_argument("-j", "--workers", type=int, default=WORKERS, help="topics processed in parallel")
+    parser.add_argument("--force", action="store_true", help="rerun stages even if their inputs are unchanged")
+    args = parser.parse_args()
+
+    topics = list(dict.fromkeys(args.topics or discover_topics()))
+    if not topics:
+        print("⚠️ No topics to process — put raw dumps in data/raw/ or name topics on the command line")
+        return
+    run_topics(topics, workers=args.workers, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# === stages.py ===
+# The offline news pipeline: clean → preprocess → topics, per topic
+
+import glob
+import os
+
+from src.pipeline.dag import PROJECT_ROOT, Pipeline, Stage
+
+RAW_DIR = os.getenv("AETHER_RAW_DIR", os.path.join(PROJECT_ROOT, "data", "raw"))
+RAW_EXTENSIONS = (".json", ".csv")
+
+
+def raw_inputs(topic):
+    """Raw news dumps for a topic: data/raw/news_<topic>.{json,csv} and data/raw/<topic>/*.{json,csv}."""
+    from src.data_cleaning.columnar import topic_tag
+
+    tag = topic_tag(topic)
+    paths = []
+    for ext in RAW_EXTENSIONS:
+        paths += glob.glob(os.path.join(RAW_DIR, f"news_{tag}{ext}"))
+        paths += glob.glob(os.path.join(RAW_DIR, tag, f"*{ext}"))
+    return sorted(paths)
+
+
+def discover_topics():
+    """Every topic that has raw input."""
+    if not os.path.isdir(RAW_DIR):
+        return []
+    topics = set()
+    for name in os.listdir(RAW_DIR):
+        full = os.path.join(RAW_DIR, name)
+        stem, ext = os.path.splitext(name)
+        if os.path.isfile(full) and ext in RAW_EXTENSIONS and stem.startswith("news_"):
+            topics.add(stem[len("news_"):])
+        elif os.path.isdir(full) and any(f.endswith(RAW_EXTENSIONS) for f in os.listdir(full)):
+            topics.add(name)
+    return sorted(topics)
+
+
+# -------------------------
+# Stage bodies (imports are deferred: pandas / pyarrow / spaCy load in the workers)
+# -------------------------
+def _clean(topic):
+    from src.data_cleaning.columnar import dataset_dir
+    from src.data_cleaning.news_data_clean import clean_news_data
+
+    for path in raw_inputs(topic):
+        # raw files already cleaned since they last changed keep their parts
+        stem = os.path.splitext(os.path.basename(path))[0]
+        parts = glob.glob(str(dataset_dir("cleaned", topic) / "date=*" / f"part-{stem}.parquet"))
+        if parts and min(os.path.getmtime(p) for p in parts) >= os.path.getmtime(path):
+            continue
+        clean_news_data(path, topic=topic)
+
+
+def _preprocess(topic):
+    from src.nlp.preprocess_text import main
+    main(topic)
+
+
+def _topics(topic):
+    from src.nlp.topic_modeling import main
+    main(topic)
+
+
+def _dataset(name):
+    def paths(topic):
+        from src.data_cleaning.columnar import dataset_dir
+        return [dataset_dir(name, topic)]
+    return paths
+
+
+def _topic_outputs(topic):
+    from src.nlp.topic_engine import model_path
+    return _dataset("topics")(topic) + [model_path(topic)]
+
+
+NEWS_PIPELINE = Pipeline([
+    Stage("clean", _clean, inputs=raw_inputs, outputs=_dataset("cleaned")),
+    Stage("preprocess", _preprocess, inputs=_dataset("cleaned"), outputs=_dataset("nlp_ready"), after=["clean"]),
+    Stage("topics", _topics, inputs=_dataset("nlp_ready"), outputs=_topic_outputs, after=["preprocess"]),
+])
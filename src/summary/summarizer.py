@@ -3,10 +3,12 @@
 
 import os
 import re
-import requests
 import random
 from datetime import datetime, timezone
 from dotenv import load_dotenv
+from src.core import transport
+from src.core.dedupe import collapse
+from src.llm.prompt_builder import log_usage
 
 load_dotenv()
 
@@ -27,15 +29,71 @@ def _fmt_time(dt):
     return str(dt)
 
 
+# ---------------------------
+# Aether’s Take
+# ---------------------------
+FALLBACK_TAKE = (
+    "AI evolves quickly, but meaning evolves slowly.\n"
+    "What we choose to build defines us more than the tech itself."
+)
+
+
+def generate_take(topic=""):
+    """
+    Reflective two-line take about the topic.
+    Depends only on the topic, so intent.py starts it alongside the fetches.
+    """
+    take_prompt = (
+        f"Write a reflective two-line take about '{topic}'. "
+        "No bullets. No summary of headlines. Philosophical tone."
+    )
+
+    try:
+        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+        if OPENAI_API_KEY:
+            resp = transport.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {"role": "system", "content": "Return exactly two lines. No bullets."},
+                        {"role": "user", "content": take_prompt},
+                    ],
+                    "max_tokens": 45,
+                    "temperature": 0.7
+                },
+                timeout=10
+            )
+
+            data = resp.json()
+            take_raw = data["choices"][0]["message"]["content"].strip()
+            log_usage("take", "-", usage=data.get("usage"), completion_text=take_raw, max_tokens=45)
+        else:
+            take_raw = FALLBACK_TAKE
+
+    except Exception:
+        take_raw = FALLBACK_TAKE
+
+    # Ensure exactly **2 cleaned lines**
+    take_lines = [line.strip() for line in take_raw.split("\n") if line.strip()]
+    take_lines = take_lines[:2]
+    if len(take_lines) == 1:
+        take_lines.append("")  # fill second line if missing
+
+    return "\n".join(take_lines)
+
+
 # ---------------------------
 # Main summarizer
 # ---------------------------
-def summarize_results(news_list=None, reddit_list=None, youtube_list=None, tone="casual", topic=""):
+def summarize_results(news_list=None, reddit_list=None, youtube_list=None, tone="casual", topic="", take=None):
     """
     Clean, modern briefing:
     - Only News + YouTube
     - Random 5 headlines max
-    - Aether’s Take (2 lines)
+    - Aether’s Take (2 lines) — pass `take` if it was generated ahead of time
     """
     news_list = news_list or []
     youtube_list = youtube_list or []
@@ -56,16 +114,9 @@ def summarize_results(news_list=None, reddit_list=None, youtube_list=None, tone=
             all_posts.append({"title": t, "tag": "(YouTube)"})
 
     # ------------------------------------------
-    # Dedupe titles
+    # Dedupe titles (near-duplicates too — the same story across sources)
     # ------------------------------------------
-    seen = set()
-    cleaned = []
-
-    for p in all_posts:
-        key = p["title"].lower()
-        if key not in seen:
-            seen.add(key)
-            cleaned.append(p)
+    cleaned = collapse(all_posts)
 
     random.shuffle(cleaned)
     cleaned = cleaned[:5]
@@ -90,45 +141,7 @@ def summarize_results(news_list=None, reddit_list=None, youtube_list=None, tone=
     # ------------------------------------------
     # Aether’s Take — clean 2 lines
     # ------------------------------------------
-    take_prompt = (
-        f"Write a reflective two-line take about '{topic}'. "
-        "No bullets. No summary of headlines. Philosophical tone."
-    )
-
-    try:
-        import httpx
-        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
-        if OPENAI_API_KEY:
-            resp = httpx.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": "Return exactly two lines. No bullets."},
-                        {"role": "user", "content": take_prompt},
-                    ],
-                    "max_tokens": 45,
-                    "temperature": 0.7
-                },
-                timeout=10
-            )
-
-            take_raw = resp.json()["choices"][0]["message"]["content"].strip()
-        else:
-            take_raw = "AI evolves quickly, but meaning evolves slowly.\nWhat we choose to build defines us more than the tech itself."
-
-    except:
-        take_raw = "AI evolves quickly, but meaning evolves slowly.\nWhat we choose to build defines us more than the tech itself."
-
-    # Ensure exactly **2 cleaned lines**
-    take_lines = [line.strip() for line in take_raw.split("\n") if line.strip()]
-    take_lines = take_lines[:2]
-    if len(take_lines) == 1:
-        take_lines.append("")  # fill second line if missing
-
-    take_final = "\n".join(take_lines)
+    take_final = take if take is not None else generate_take(topic)
 
     # ------------------------------------------
     # Final description (frontend parses this cleanly)
@@ -1,8 +1,9 @@
 # === app.py ===
 # Aether Backend Entry Point
 
-from flask import Flask, render_template, Response, send_from_directory
-import sys, os, traceback, threading, json
+from flask import Flask, render_template, Response, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+import sys, os, traceback, json
 from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor
 from collections import deque
@@ -20,7 +21,12 @@ from src.data_ingest.fetch_reddit import fetch_reddit_posts
 from src.summary.summarizer import summarize_results
 from src.core.moderation import is_disallowed
 from src.llm.response_engine import generate_llm_response
+from src.llm.response_cache import response_cache
+from src.llm.prompt_builder import usage_summary
 from src.core.intent import handle_intent
+from src.core import intent_model
+from src.core import cancellation
+from src.data_ingest.models import json_default
 
 # --- Safe Chat Blueprint Import ---
 try:
@@ -29,13 +35,35 @@ except Exception as e:
     chat_bp = None
     print(f"⚠️ chat_bp import failed: {e}")
 
+try:
+    from webapp.routes.topics import topics_bp
+except Exception as e:
+    topics_bp = None
+    print(f"⚠️ topics_bp import failed: {e}")
+
 # --- Flask Setup ---
 template_path = os.path.join(PROJECT_ROOT, "webapp", "templates")
 static_path = os.path.join(PROJECT_ROOT, "webapp", "static")
 
 app = Flask(__name__, template_folder=template_path, static_folder=static_path)
+
+
+class AetherJSONProvider(DefaultJSONProvider):
+    """jsonify() that understands the slotted item models (no key sorting)."""
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        try:
+            return json_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
+
+app.json = AetherJSONProvider(app)
 executor = ThreadPoolExecutor(max_workers=3)
-abort_flags = {}
+# fit the local intent model off the request path (~0.2s, once per worker)
+executor.submit(intent_model.get_model)
 
 # === Register Blueprint ===
 if chat_bp:
@@ -47,6 +75,13 @@ if chat_bp:
 else:
     print("⚠️ chat_bp not available. Using fallback routes only.")
 
+if topics_bp:
+    try:
+        app.register_blueprint(topics_bp)
+        print("✅ Registered topics blueprint successfully.")
+    except Exception as e:
+        print(f"⚠️ Failed to register topics blueprint: {e}")
+
 # --- Conversation Memory ---
 conversation_history = deque(maxlen=8)
 last_topic_map = {}
@@ -111,17 +146,34 @@ def index():
 
 @app.route("/abort", methods=["POST"])
 def abort():
-    """Stop current generation safely."""
-    tid = threading.get_ident()
-    abort_flags[tid] = True
-    print(f"🛑 Abort flag set for thread {tid}")
-    return Response(json.dumps({"status": "aborted"}), mimetype="application/json")
+    """Stop the generation identified by request_id."""
+    data = request.get_json(silent=True) or {}
+    request_id = data.get("request_id")
+    found = bool(request_id) and cancellation.cancel(request_id)
+    print(f"🛑 Abort requested for {request_id} (active={found})")
+    return Response(
+        json.dumps({"status": "aborted" if found else "not_found", "request_id": request_id}),
+        mimetype="application/json",
+    )
 
 @app.route("/debug_ping")
 def debug_ping():
     """Simple ping route to confirm server is running."""
     return {"status": "ok", "message": "Aether backend active."}
 
+
+@app.route("/debug/llm_cache")
+def debug_llm_cache():
+    """Reply-cache counters for this worker (exact / similar hits, misses, hit rate)."""
+    return response_cache.summary()
+
+
+@app.route("/debug/llm_usage")
+def debug_llm_usage():
+    """Token usage per intent for this worker (requests, prompt/completion totals)."""
+    return usage_summary()
+
+
 # --- Global Error Handler ---
 @app.errorhandler(Exception)
 def handle_all_exceptions(e):
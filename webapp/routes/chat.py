@@ -1,19 +1,53 @@
 # === chat.py ===
 # Main chat route for Aether (handles messages from frontend)
 
-from flask import Blueprint, request, jsonify
-from src.core.intent import handle_intent, classify_intent as detect_intent
-from src.core.session_state import get_mode
+import functools
+import json
+import re
+import uuid
+
+from flask import Blueprint, Response, request, jsonify, make_response, stream_with_context
+from src.core import cancellation
+from src.core.intent import handle_intent, is_plain_chat, classify_intent as detect_intent
+from src.core import session_state
+from src.core.session_state import get_mode, set_last_bot_message
+from src.core.session_store import SESSION_TTL
+from src.data_ingest.models import json_default
+from src.llm.response_engine import stream_llm_response
 
 chat_bp = Blueprint("chat", __name__)
 
+SESSION_COOKIE = "aether_sid"
+_VALID_SID = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def _session_id():
+    """Session from the body or cookie; a new one when missing or malformed."""
+    data = request.get_json(silent=True) or {}
+    sid = data.get("session_id") or request.cookies.get(SESSION_COOKIE) or ""
+    return sid if _VALID_SID.match(sid) else uuid.uuid4().hex
+
+
+def in_session(view):
+    """Run the view bound to the caller's session and (re)issue the session cookie."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        sid = _session_id()
+        with session_state.bind(sid):
+            response = make_response(view(*args, **kwargs))
+        response.set_cookie(SESSION_COOKIE, sid, max_age=SESSION_TTL, httponly=True, samesite="Lax")
+        return response
+    return wrapper
+
 
 @chat_bp.route("/chat", methods=["POST"])
+@in_session
 def chat():
     """Main message route — handles ALL messages from frontend including resume."""
     try:
         data = request.get_json() or {}
         user_message = (data.get("message") or "").strip()
+        request_id = data.get("request_id") or uuid.uuid4().hex
         resume = bool(data.get("resume", False))
         prefix = data.get("prefix") or ""
         remaining = data.get("remaining") or ""
@@ -92,7 +126,13 @@ def chat():
             }), 200
 
         # === NORMAL FIRST-TIME CALL ===
-        response_data = handle_intent(intent, tone, user_message)
+        try:
+            with cancellation.bind(request_id):
+                response_data = handle_intent(intent, tone, user_message)
+        except cancellation.RequestCancelled:
+            print(f"🛑 Request {request_id} cancelled — worker released")
+            return jsonify({"status": "cancelled", "request_id": request_id, "results": []}), 200
+
         print(f"🤖 Response generated: {response_data}")
         response_data["resume"] = False
         return jsonify(response_data), 200
@@ -110,6 +150,61 @@ def chat():
         }), 500
 
 
+# === Streaming chat (SSE) ===
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=json_default)}\n\n"
+
+
+@chat_bp.route("/chat/stream", methods=["POST"])
+@in_session
+def chat_stream():
+    """
+    Server-sent events variant of /chat.
+    Plain chat replies stream as `delta` events; other intents arrive as a
+    single `results` event. Cancel with POST /abort {"request_id": ...}.
+    """
+    data = request.get_json(silent=True) or {}
+    user_message = (data.get("message") or "").strip()
+    request_id = data.get("request_id") or uuid.uuid4().hex
+
+    if not user_message:
+        return jsonify({
+            "status": "error",
+            "results": [{"source_type": "aether_reply", "title": "Please enter a message."}]
+        }), 200
+
+    intent = detect_intent(user_message)
+    tone = get_mode()
+    sid = session_state.current_session_id()
+    print(f"🌊 [STREAM {request_id}] Intent: {intent} | Tone: {tone}")
+
+    def generate():
+        # the body is produced after the view returns → bind the session again here
+        with session_state.bind(sid), cancellation.bind(request_id) as token:
+            yield _sse("start", {"request_id": request_id, "intent": intent})
+            try:
+                if not is_plain_chat(intent, user_message):
+                    yield _sse("results", handle_intent(intent, tone, user_message))
+                else:
+                    chunks = []
+                    for delta in stream_llm_response(
+                        "chat", tone, user_message, should_stop=token.is_cancelled
+                    ):
+                        chunks.append(delta)
+                        yield _sse("delta", {"text": delta})
+                    set_last_bot_message("".join(chunks))
+            except cancellation.RequestCancelled:
+                print(f"🛑 Stream {request_id} cancelled")
+
+            yield _sse("done", {"request_id": request_id, "cancelled": token.is_cancelled()})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # === Log events from the frontend ===
 @chat_bp.route("/chat_event", methods=["POST"])
 def chat_event():
@@ -0,0 +1,37 @@
+# === topics.py ===
+# Read-only API over the incremental topic and trend engines
+
+from flask import Blueprint, jsonify, request
+from src.nlp import trend_engine
+from src.nlp.topic_engine import get_engine, known_topics, topic_tag
+
+topics_bp = Blueprint("topics", __name__)
+
+
+@topics_bp.route("/topics", methods=["GET"])
+def list_topics():
+    """Topics that have a persisted model."""
+    return jsonify({"status": "success", "topics": known_topics()})
+
+
+@topics_bp.route("/topics/<topic>/keywords", methods=["GET"])
+def topic_keywords(topic):
+    """Current clusters and their keywords for one topic (?n= keywords per cluster)."""
+    if topic_tag(topic) not in known_topics():
+        return jsonify({"status": "error", "message": f"No topic model for '{topic}' yet."}), 404
+
+    n = min(max(request.args.get("n", default=10, type=int), 1), 50)
+    engine = get_engine(topic)
+    return jsonify({"status": "success", **engine.summary(), "clusters": engine.keywords(n)})
+
+
+@topics_bp.route("/trending", methods=["GET"])
+def trending_terms():
+    """Bursting terms right now (?topic= defaults to everything, ?k= how many)."""
+    topic = request.args.get("topic") or "all"
+    if trend_engine.topic_tag(topic) not in trend_engine.known_topics():
+        return jsonify({"status": "error", "message": f"No trend data for '{topic}' yet."}), 404
+
+    k = min(max(request.args.get("k", default=10, type=int), 1), trend_engine.TOP_K)
+    engine = trend_engine.get_engine(topic)
+    return jsonify({"status": "success", **engine.summary(), "trending": engine.trending(k)})
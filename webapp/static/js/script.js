@@ -18,6 +18,7 @@ stroke-linecap="round" stroke-linejoin="round"><path d="M12 1v10"></path><rect x
 
   // === STATE ===
   let currentAbort = null;
+  let currentRequestId = null;
   let chatInProgress = false;
   let lastUserMessage = "";
   let paused = false;
@@ -67,6 +68,7 @@ function scrollToBottom(force = false) {
 
   try { currentAbort.abort(); } catch (e) {}
   currentAbort = null;
+  abortOnServer(currentRequestId);
 
   document.querySelectorAll(".typing-bubble, .typing-indicator, .bot-msg.typing").forEach(n => n.remove());
   userInput.disabled = true;
@@ -128,6 +130,21 @@ function handleResume() {
   }, 350);
 }
 
+  // === SERVER-SIDE ABORT (stops upstream LLM/API work for this request) ===
+  function newRequestId() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+  }
+
+  function abortOnServer(requestId) {
+    if (!requestId) return;
+    fetch("/abort", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ request_id: requestId }),
+    }).catch((e) => console.debug("abort POST failed:", e?.message || e));
+  }
+
   // === EVENT LOGGING ===
   function postEvent(eventType, payload = {}) {
     try {
@@ -269,7 +286,8 @@ autoScrollLocked = false;
       const controller = new AbortController();
       currentAbort = controller;
 
-      const payload = { message, resume: !!opts.resume };
+      currentRequestId = newRequestId();
+      const payload = { message, resume: !!opts.resume, request_id: currentRequestId };
 
       // attach prefix/remaining when resuming (Option B)
       if (opts.resume) {
@@ -315,6 +333,7 @@ const res = await fetch("/chat", {
     }
   } finally {
     currentAbort = null;
+    currentRequestId = null;
     chatInProgress = false;
   }
 }